@@ -3,6 +3,7 @@ __version__ = "0.12.0"
 from .cli.base import Migrate
 from .conf import settings
 from .conf.global_settings import EdgySettings
+from .core.cache import LRUCache, RedisCache
 from .core.connection.database import Database, DatabaseURL
 from .core.connection.registry import Registry
 from .core.db import fields
@@ -34,24 +35,43 @@ from .core.db.fields import (
 from .core.db.fields.foreign_keys import ForeignKey
 from .core.db.fields.many_to_many import ManyToMany, ManyToManyField
 from .core.db.fields.one_to_one_keys import OneToOne, OneToOneField
+from .core.db.instrumentation import QueryEvent, QueryTracker, track_queries
 from .core.db.models import Model, ModelRef, ReflectModel
 from .core.db.models.managers import Manager
-from .core.db.querysets import Prefetch, Q, QuerySet, and_, not_, or_
+from .core.db.n_plus_one import NPlusOneWarning, detect_n_plus_one
+from .core.db.querysets import (
+    Aggregate,
+    Avg,
+    Count,
+    Max,
+    Min,
+    Prefetch,
+    Q,
+    QuerySet,
+    Sum,
+    and_,
+    load_all,
+    not_,
+    or_,
+)
 from .core.extras import EdgyExtra
 from .core.signals import Signal
 from .core.utils.sync import run_sync
-from .exceptions import MultipleObjectsReturned, ObjectNotFound
+from .exceptions import MultipleObjectsReturned, NPlusOneError, ObjectNotFound
 
 __all__ = [
     "and_",
     "not_",
     "or_",
     "Q",
+    "Aggregate",
+    "Avg",
     "BigIntegerField",
     "BinaryField",
     "BooleanField",
     "CASCADE",
     "ConditionalRedirect",
+    "Count",
     "CharField",
     "ChoiceField",
     "CompositeField",
@@ -60,6 +80,7 @@ __all__ = [
     "DateField",
     "DateTimeField",
     "DecimalField",
+    "detect_n_plus_one",
     "EdgyExtra",
     "EdgySettings",
     "EmailField",
@@ -70,28 +91,39 @@ __all__ = [
     "Index",
     "IntegerField",
     "JSONField",
+    "load_all",
+    "LRUCache",
+    "RedisCache",
     "RefForeignKey",
     "Manager",
+    "Max",
+    "Min",
     "ManyToMany",
     "ManyToManyField",
     "Migrate",
     "Model",
     "ModelRef",
     "MultipleObjectsReturned",
+    "NPlusOneError",
+    "NPlusOneWarning",
     "ObjectNotFound",
     "OneToOne",
     "OneToOneField",
     "PasswordField",
     "Prefetch",
+    "QueryEvent",
     "QuerySet",
+    "QueryTracker",
     "ReflectModel",
     "RESTRICT",
     "Registry",
     "SET_NULL",
     "Signal",
     "SmallIntegerField",
+    "Sum",
     "TextField",
     "TimeField",
+    "track_queries",
     "URLField",
     "UUIDField",
     "UniqueConstraint",
@@ -2,6 +2,7 @@ import select
 import sys
 from typing import Any, Callable, Optional, Sequence
 
+import anyio
 import click
 import nest_asyncio
 
@@ -9,7 +10,6 @@ from edgy import Registry
 from edgy.cli.env import MigrationEnv
 from edgy.cli.operations.shell.enums import ShellOption
 from edgy.core.events import AyncLifespanContextManager
-from edgy.core.sync import execsync
 
 
 @click.option(
@@ -40,7 +40,8 @@ def shell(env: MigrationEnv, kernel: bool) -> None:
     on_shutdown = getattr(env.app, "on_shutdown", [])
     lifespan = getattr(env.app, "lifespan", None)
     lifespan = handle_lifespan_events(on_startup=on_startup, on_shutdown=on_shutdown, lifespan=lifespan)
-    execsync(run_shell)(env.app, lifespan, registry, kernel)
+    # the interactive shell needs the main thread, so it gets its own loop
+    anyio.run(run_shell, env.app, lifespan, registry, kernel)
     return None
 
 
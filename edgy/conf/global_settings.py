@@ -40,4 +40,15 @@ class EdgySettings(BaseSettings):
         "lte": "__le__",
     }
     many_to_many_relation: str = "relation_{key}"
+    # Maximum of bind parameters per statement, used for splitting bulk operations into batches
+    bind_parameter_limits: Dict[str, int] = {
+        "postgres": 32767,
+        "postgresql": 32767,
+        "mysql": 65535,
+        "sqlite": 999,
+        "mssql": 2100,
+    }
+    default_bind_parameter_limit: int = 999
+    # Dialects supporting INSERT ... RETURNING
+    returning_dialects: Set[str] = {"postgres", "postgresql", "sqlite", "mssql"}
     dialects: Dict[str, str] = {"postgres": "postgres", "postgresql": "postgresql"}
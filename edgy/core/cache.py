@@ -0,0 +1,506 @@
+import decimal
+import hashlib
+import pickle
+import time
+import uuid
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, BooleanClauseList
+from sqlalchemy.sql.util import find_tables
+
+from edgy.core.db.instrumentation import execute_query
+from edgy.exceptions import ImproperlyConfigured
+
+if TYPE_CHECKING:
+    import sqlalchemy
+    from sqlalchemy.engine import Row
+
+
+# the python types of columns, to which values of other types are converted
+_CONVERTIBLE_TYPES = (int, float, decimal.Decimal, uuid.UUID, str)
+
+
+def to_python_value(column: "sqlalchemy.Column", value: Any) -> Any:
+    """
+    Converts the value into the python type of the values of the column in result rows, e.g. the
+    str of a UUID into the UUID, for comparing it with the values of cached rows.
+
+    Raises ValueError when the value cannot be converted safely.
+    """
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        raise ValueError(f"The python type of the column {column.name} is unknown.") from None
+    if isinstance(value, python_type):
+        return value
+    if (
+        python_type not in _CONVERTIBLE_TYPES
+        or isinstance(value, bool)
+        or not isinstance(value, _CONVERTIBLE_TYPES)
+        # floats are not exact
+        or (python_type is decimal.Decimal and isinstance(value, float))
+    ):
+        raise ValueError(f"{value!r} cannot be converted into {python_type.__name__}.")
+    try:
+        return python_type(value)
+    except (TypeError, ValueError, ArithmeticError):
+        raise ValueError(f"{value!r} cannot be converted into {python_type.__name__}.") from None
+
+
+class CachedRow:
+    """
+    A picklable copy of a result row. Supports the accesses used for building the models:
+    by position, by column name and via `_mapping`.
+    """
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, keys: Tuple[str, ...], values: Tuple[Any, ...]) -> None:
+        self._keys = keys
+        self._values = values
+
+    @classmethod
+    def from_rows(cls, rows: Sequence["Row"]) -> List["CachedRow"]:
+        if not rows:
+            return []
+        keys = tuple(rows[0]._mapping.keys())
+        positions = range(len(keys))
+        return [cls(keys, tuple(row[position] for position in positions)) for row in rows]
+
+    @property
+    def _mapping(self) -> Dict[str, Any]:
+        return dict(zip(self._keys, self._values))
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, (int, slice)):
+            return self._values[key]
+        # columns are looked up by their name
+        return self._values[self._keys.index(getattr(key, "name", key))]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __reduce__(self) -> Any:
+        return (self.__class__, (self._keys, self._values))
+
+
+def get_database_key(database: Any) -> str:
+    """
+    Returns the identity of the database in the cache keys, its URL. The databases of a registry
+    (see `using_with_db`) share the caches, so the same query or primary key can be cached for each.
+    """
+    return str(database.url)
+
+
+def build_cache_key(expression: Any, schema: Optional[str] = None, database: Any = None) -> str:
+    """
+    Builds the key of a query from its compiled SQL, the parameters, the schema and the database.
+    """
+    compiled = expression.compile(compile_kwargs={"render_postcompile": True})
+    params = sorted(compiled.params.items())
+    database_key = None if database is None else get_database_key(database)
+    material = f"{compiled}\x00{params!r}\x00{schema}\x00{database_key}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def get_expression_tables(expression: Any) -> Set[str]:
+    """
+    Returns the names of the tables read by the expression, including joins and subqueries.
+    """
+    return {table.name for table in find_tables(expression)}
+
+
+class BaseCache:
+    """
+    Interface of the query result caches.
+
+    The entries are tagged with the names of the tables they were read from, writes to a table
+    invalidate all entries tagged with it.
+    """
+
+    async def get(self, key: str) -> Any:
+        """
+        Returns the value of the key or None when missing or expired.
+        """
+        raise NotImplementedError()
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, tables: Iterable[str] = ()) -> None:
+        """
+        Stores the value. Without ttl the entry only expires via invalidate.
+        """
+        raise NotImplementedError()
+
+    async def invalidate(self, tables: Iterable[str]) -> None:
+        """
+        Removes the entries tagged with any of the tables.
+        """
+        raise NotImplementedError()
+
+    async def clear(self) -> None:
+        raise NotImplementedError()
+
+
+class LRUCache(BaseCache):
+    """
+    In-process cache evicting the least recently used entries when max_size is exceeded.
+
+    The invalidation only affects the current process.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[str, Tuple[Optional[float], Any, Tuple[str, ...]]] = OrderedDict()
+        self._tables: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for table in entry[2]:
+            keys = self._tables.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tables[table]
+
+    async def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, tables: Iterable[str] = ()) -> None:
+        self._remove(key)
+        tables = tuple(tables)
+        expires = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (expires, value, tables)
+        for table in tables:
+            self._tables.setdefault(table, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    async def invalidate(self, tables: Iterable[str]) -> None:
+        for table in tables:
+            for key in list(self._tables.get(table, ())):
+                self._remove(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tables.clear()
+
+
+# deletes the entries of a table and its set atomically, so no entry is tagged in between and survives
+_INVALIDATE_SCRIPT = """
+local keys = redis.call('SMEMBERS', KEYS[1])
+for _, key in ipairs(keys) do
+    redis.call('DEL', ARGV[1] .. key)
+end
+redis.call('DEL', KEYS[1])
+return #keys
+"""
+
+
+class RedisCache(BaseCache):
+    """
+    Cache stored in Redis (or a server speaking its protocol), shared between processes.
+
+    The client must provide the asyncio API of redis-py (`redis.asyncio.Redis`). The values are
+    pickled, so only use a trusted server. The keys of a table are tracked in a set
+    `<prefix>table:<name>`, which expires with its longest living entry. The entries without
+    ttl expire after max_ttl seconds, so the sets don't outlive them. The invalidation runs as
+    a Lua script (`EVAL`), which the server must allow.
+    """
+
+    def __init__(self, client: Any, prefix: str = "edgy:cache:", max_ttl: float = 86400) -> None:
+        self.client = client
+        self.prefix = prefix
+        self.max_ttl = max_ttl
+
+    @classmethod
+    def from_url(
+        cls, url: str, prefix: str = "edgy:cache:", max_ttl: float = 86400, **kwargs: Any
+    ) -> "RedisCache":
+        try:
+            from redis.asyncio import Redis
+        except ImportError:
+            raise ImproperlyConfigured("The RedisCache requires the redis package: pip install redis") from None
+        return cls(Redis.from_url(url, **kwargs), prefix=prefix, max_ttl=max_ttl)
+
+    def _table_key(self, table: str) -> str:
+        return f"{self.prefix}table:{table}"
+
+    async def get(self, key: str) -> Any:
+        value = await self.client.get(f"{self.prefix}{key}")
+        if value is None:
+            return None
+        return pickle.loads(value)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, tables: Iterable[str] = ()) -> None:
+        px = max(int((self.max_ttl if ttl is None else min(ttl, self.max_ttl)) * 1000), 1)
+        await self.client.set(f"{self.prefix}{key}", pickle.dumps(value), px=px)
+        for table in tables:
+            table_key = self._table_key(table)
+            await self.client.sadd(table_key, key)
+            # -1 without expiry, -2 for a missing key
+            if await self.client.pttl(table_key) < px:
+                await self.client.pexpire(table_key, px)
+
+    async def invalidate(self, tables: Iterable[str]) -> None:
+        for table in tables:
+            await self.client.eval(_INVALIDATE_SCRIPT, 1, self._table_key(table), self.prefix)
+
+    async def clear(self) -> None:
+        names = [name async for name in self.client.scan_iter(match=f"{self.prefix}*")]
+        if names:
+            await self.client.delete(*names)
+
+
+# the database, the schema, the tablename and the primary key values
+_PKCacheKey = Tuple[str, Optional[str], str, Tuple[Hashable, ...]]
+
+
+class PKCache:
+    """
+    In-process identity cache of the rows of the models with `Meta.pk_cache`, keyed by the
+    database, the schema, the tablename and the primary key values.
+
+    The least recently used rows are evicted when max_size is exceeded. The hits and misses are
+    counted for the lookups.
+    """
+
+    def __init__(self, max_size: int = 4096) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[_PKCacheKey, CachedRow] = OrderedDict()
+        self._tables: Dict[str, Set[_PKCacheKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _make_key(database: Any, table: "sqlalchemy.Table", pk: Tuple[Any, ...]) -> Optional[_PKCacheKey]:
+        """
+        Returns the key of the primary key values converted into the python types of the columns,
+        so e.g. the str and the UUID of a primary key hit the same entry. None is returned for the
+        values which cannot be cached.
+        """
+        # the primary key columns of the models are sorted by key, see build_pkcolumns
+        columns = sorted(table.primary_key.columns, key=lambda column: column.key)
+        if len(columns) != len(pk):
+            return None
+        try:
+            key = (get_database_key(database), table.schema, table.name, tuple(map(to_python_value, columns, pk)))
+            hash(key)
+        except (TypeError, ValueError):
+            return None
+        return key
+
+    def get(self, database: Any, table: "sqlalchemy.Table", pk: Tuple[Any, ...]) -> Optional[CachedRow]:
+        key = self._make_key(database, table, pk)
+        row = None if key is None else self._entries.get(key)
+        if key is None or row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return row
+
+    def set(self, database: Any, table: "sqlalchemy.Table", pk: Tuple[Any, ...], row: CachedRow) -> None:
+        key = self._make_key(database, table, pk)
+        if key is None:
+            return
+        self._entries[key] = row
+        self._entries.move_to_end(key)
+        self._tables.setdefault(table.name, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: _PKCacheKey) -> None:
+        if self._entries.pop(key, None) is None:
+            return
+        keys = self._tables[key[2]]
+        keys.discard(key)
+        if not keys:
+            del self._tables[key[2]]
+
+    def discard(self, database: Any, table: "sqlalchemy.Table", pk: Tuple[Any, ...]) -> None:
+        key = self._make_key(database, table, pk)
+        if key is not None:
+            self._remove(key)
+
+    def invalidate(self, tablename: str) -> None:
+        """
+        Removes the rows of the table in all databases and schemas.
+        """
+        for key in list(self._tables.get(tablename, ())):
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tables.clear()
+
+
+class CachedTable:
+    """
+    The complete rows of a table and their index by primary key.
+    """
+
+    __slots__ = ("rows", "by_pk", "expires")
+
+    def __init__(
+        self, rows: List[CachedRow], by_pk: Dict[Tuple[Any, ...], CachedRow], expires: Optional[float]
+    ) -> None:
+        self.rows = rows
+        self.by_pk = by_pk
+        self.expires = expires
+
+
+class FullTableCache:
+    """
+    In-process store of the complete tables of the models with `Meta.cache_full_table`, per database,
+    schema and tablename.
+    """
+
+    def __init__(self) -> None:
+        self._tables: Dict[Tuple[str, Optional[str], str], CachedTable] = {}
+
+    def get(self, database: Any, table: "sqlalchemy.Table") -> Optional[CachedTable]:
+        key = (get_database_key(database), table.schema, table.name)
+        cached_table = self._tables.get(key)
+        if cached_table is None:
+            return None
+        if cached_table.expires is not None and cached_table.expires <= time.monotonic():
+            del self._tables[key]
+            return None
+        return cached_table
+
+    def set(
+        self,
+        database: Any,
+        table: "sqlalchemy.Table",
+        rows: List[CachedRow],
+        pkcolumns: Sequence[str],
+        ttl: Optional[float] = None,
+    ) -> CachedTable:
+        columns = list(table.columns)
+        positions = [columns.index(table.columns[pkcolumn]) for pkcolumn in pkcolumns]
+        by_pk = {tuple(row[position] for position in positions): row for row in rows}
+        cached_table = CachedTable(rows, by_pk, None if ttl is None else time.monotonic() + ttl)
+        self._tables[(get_database_key(database), table.schema, table.name)] = cached_table
+        return cached_table
+
+    async def load(self, model_class: Any, database: Any, table: "sqlalchemy.Table") -> CachedTable:
+        """
+        Returns the cached table of the model, fetching all its rows when not cached or expired.
+        """
+        cached_table = self.get(database, table)
+        if cached_table is None:
+            rows = CachedRow.from_rows(
+                await execute_query(database, "fetch_all", table.select(), model_class, "cache_full_table")
+            )
+            cache_full_table = model_class.meta.cache_full_table
+            ttl = None if cache_full_table is True else cache_full_table
+            cached_table = self.set(database, table, rows, model_class.pkcolumns, ttl=ttl)
+        return cached_table
+
+    def invalidate(self, tablename: str) -> None:
+        """
+        Removes the table in all databases and schemas.
+        """
+        for key in [key for key in self._tables if key[2] == tablename]:
+            del self._tables[key]
+
+    def clear(self) -> None:
+        self._tables.clear()
+
+
+def _build_row_predicate(clause: Any, table: "sqlalchemy.Table") -> Optional[Callable[[CachedRow], bool]]:
+    if isinstance(clause, BooleanClauseList) and clause.operator is operators.and_:
+        predicates = [_build_row_predicate(subclause, table) for subclause in clause.clauses]
+        if any(predicate is None for predicate in predicates):
+            return None
+        return lambda row: all(predicate(row) for predicate in predicates)  # type: ignore
+    if not isinstance(clause, BinaryExpression) or not isinstance(clause.right, BindParameter):
+        return None
+    column = clause.left
+    if getattr(getattr(column, "table", None), "name", None) != table.name or column.name not in table.columns:
+        return None
+    table_column = table.columns[column.name]
+    position = list(table.columns).index(table_column)
+    bind_value: Any = clause.right.value
+    # the values are compared like the database does, e.g. the str of a UUID with the UUIDs
+    try:
+        if clause.operator is operators.eq and bind_value is not None:
+            value = to_python_value(table_column, bind_value)
+            return lambda row: row[position] == value
+        if clause.operator is operators.in_op:
+            values = [to_python_value(table_column, item) for item in bind_value]
+            return lambda row: row[position] in values
+    except ValueError:
+        return None
+    return None
+
+
+def filter_cached_rows(
+    rows: Sequence[CachedRow], clauses: Sequence[Any], table: "sqlalchemy.Table"
+) -> Optional[List[CachedRow]]:
+    """
+    Evaluates the clauses on the rows of the table in Python.
+
+    Only the equality and `IN` comparisons of the columns with values, optionally combined
+    with `AND`, are supported. For other clauses None is returned.
+    """
+    predicates = []
+    for clause in clauses:
+        predicate = _build_row_predicate(clause, table)
+        if predicate is None:
+            return None
+        predicates.append(predicate)
+    return [row for row in rows if all(predicate(row) for predicate in predicates)]
+
+
+__all__ = [
+    "BaseCache",
+    "CachedRow",
+    "CachedTable",
+    "FullTableCache",
+    "LRUCache",
+    "PKCache",
+    "RedisCache",
+    "build_cache_key",
+    "filter_cached_rows",
+    "get_database_key",
+    "get_expression_tables",
+    "to_python_value",
+]
@@ -1,5 +1,6 @@
+from collections import OrderedDict
 from functools import cached_property
-from typing import Any, Dict, Mapping, Type
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Tuple, Type
 
 import sqlalchemy
 from sqlalchemy import Engine, create_engine
@@ -8,10 +9,15 @@ from sqlalchemy.ext.asyncio.engine import AsyncEngine
 from sqlalchemy.orm import declarative_base as sa_declarative_base
 
 from edgy.conf import settings
+from edgy.core.cache import BaseCache, FullTableCache, LRUCache, PKCache
 from edgy.core.connection.database import Database
 from edgy.core.connection.schemas import Schema
 from edgy.exceptions import ImproperlyConfigured
 
+if TYPE_CHECKING:
+    from edgy.core.db.instrumentation import QueryEvent
+    from edgy.core.db.models.base import EdgyBaseModel
+
 
 class Registry:
     """
@@ -24,6 +30,19 @@ class Registry:
         self.reflected: Dict[str, Any] = {}
         self.db_schema = kwargs.get("schema", None)
         self.extra: Mapping[str, Type["Database"]] = kwargs.pop("extra", {})
+        self.table_cache_size: int = kwargs.pop("table_cache_size", 1024)
+        self.trusted_rows: bool = kwargs.pop("trusted_rows", False)
+        cache: Optional[BaseCache] = kwargs.pop("cache", None)
+        # the backend of the query result cache, see QuerySet.cache
+        self.cache: BaseCache = LRUCache() if cache is None else cache
+        # the rows of the models with Meta.pk_cache by primary key
+        self.pk_cache: PKCache = PKCache(kwargs.pop("pk_cache_size", 4096))
+        # the complete tables of the models with Meta.cache_full_table
+        self.full_table_cache: FullTableCache = FullTableCache()
+        # called with a QueryEvent around the statements of the models, see before_execute
+        self.before_execute_hooks: List[Callable[["QueryEvent"], Any]] = []
+        self.after_execute_hooks: List[Callable[["QueryEvent"], Any]] = []
+        self._schema_tables: OrderedDict[Tuple[Type["EdgyBaseModel"], Optional[str]], sqlalchemy.Table] = OrderedDict()
 
         self.schema = Schema(registry=self)
 
@@ -41,6 +60,54 @@ class Registry:
     def metadata(self, value: sqlalchemy.MetaData) -> None:
         self._metadata = value
 
+    def _connect_signals(self, model_class: Type["EdgyBaseModel"]) -> None:
+        """
+        Connects the cache invalidation to the write signals of the model, which are the global
+        signals unless declared via `Meta.signals`.
+        """
+        signals = model_class.meta.signals
+        for signal in (signals.post_save, signals.post_update, signals.post_delete):
+            signal.connect(self._invalidate_cache)
+
+    async def _invalidate_cache(self, sender: Any, instance: Any = None, **kwargs: Any) -> None:
+        """
+        Removes the cached query results and rows of the table written by a model or a queryset.
+        """
+        table = getattr(instance, "table", None)
+        if instance is None or table is None:
+            return
+        self.full_table_cache.invalidate(table.name)
+        if hasattr(instance, "model_class"):
+            # querysets can write any row
+            self.pk_cache.invalidate(table.name)
+        else:
+            self.pk_cache.discard(instance.database, table, tuple(instance.__dict__.get(column) for column in instance.pkcolumns))
+        await self.cache.invalidate([table.name])
+
+    def before_execute(self, hook: Callable[["QueryEvent"], Any]) -> Callable[["QueryEvent"], Any]:
+        """
+        Registers a hook called with the QueryEvent before each statement of the models of the
+        registry. The hook can be sync or async and can be used as decorator.
+
+        **Example**
+
+        ```python
+        @models.before_execute
+        def log_query(event):
+            logger.debug("%s.%s: %s", event.model.__name__, event.operation, event.sql)
+        ```
+        """
+        self.before_execute_hooks.append(hook)
+        return hook
+
+    def after_execute(self, hook: Callable[["QueryEvent"], Any]) -> Callable[["QueryEvent"], Any]:
+        """
+        Registers a hook called with the QueryEvent after each successful statement of the models
+        of the registry, the duration and rows of the event are set.
+        """
+        self.after_execute_hooks.append(hook)
+        return hook
+
     def _get_database_url(self) -> str:
         url = self.database.url
         if not url.driver:
@@ -91,11 +158,34 @@ class Registry:
         for model_class in self.reflected.values():
             model_class.meta.full_init(init_column_mappers=init_column_mappers, init_class_attrs=init_class_attrs)
 
+    def get_table_for_schema(self, model_class: Type["EdgyBaseModel"], schema: Optional[str] = None) -> sqlalchemy.Table:
+        """
+        Returns the table of the model bound to the schema.
+
+        Building a table is expensive, so the tables are cached per model and schema.
+        The least recently used tables are evicted when `table_cache_size` is exceeded.
+        """
+        key = (model_class, schema)
+        table = self._schema_tables.get(key)
+        if table is not None and table.name == model_class.meta.tablename:
+            self._schema_tables.move_to_end(key)
+            return table
+        table = model_class.build(schema)
+        self._schema_tables[key] = table
+        while len(self._schema_tables) > self.table_cache_size:
+            self._schema_tables.popitem(last=False)
+        return table
+
+    def _invalidate_schema_tables(self, model_class: Type["EdgyBaseModel"]) -> None:
+        for key in [key for key in self._schema_tables if key[0] is model_class]:
+            del self._schema_tables[key]
+
     def invalidate_models(self, *, clear_class_attrs: bool=True) -> None:
         for model_class in self.models.values():
             model_class.meta.invalidate(clear_class_attrs=clear_class_attrs)
         for model_class in self.reflected.values():
             model_class.meta.invalidate(clear_class_attrs=clear_class_attrs)
+        self._schema_tables.clear()
 
     async def create_all(self) -> None:
         if self.db_schema:
@@ -106,6 +196,9 @@ class Registry:
         await self.engine.dispose()
 
     async def drop_all(self) -> None:
+        await self.cache.clear()
+        self.pk_cache.clear()
+        self.full_table_cache.clear()
         if self.db_schema:
             await self.schema.drop_schema(self.db_schema, True, True)
         async with self.database:
@@ -0,0 +1,202 @@
+import inspect
+import time
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple, Type, cast
+
+if TYPE_CHECKING:  # pragma: no cover
+    from edgy import Database, Model
+
+_TRACKERS: ContextVar[Tuple["QueryTracker", ...]] = ContextVar("edgy_query_trackers", default=())
+
+
+class QueryEvent:
+    """
+    A statement executed for a model, passed to the execute hooks of the registry and recorded
+    by track_queries.
+
+    The duration (in seconds) and rows are None before the execution. For the updates and
+    deletes of the querysets rows is the number of affected rows, otherwise it is None for the
+    statements without result rows (`execute`).
+    """
+
+    __slots__ = ("expression", "database", "model", "operation", "duration", "rows", "_compiled")
+
+    def __init__(self, expression: Any, database: "Database", model: Type["Model"], operation: str) -> None:
+        self.expression = expression
+        self.database = database
+        self.model = model
+        self.operation = operation
+        self.duration: Optional[float] = None
+        self.rows: Optional[int] = None
+        self._compiled: Any = None
+
+    def _compile(self) -> Any:
+        if self._compiled is None:
+            # compiled with the dialect of the database, so dialect specific constructs render
+            dialect = getattr(getattr(self.database, "_backend", None), "_dialect", None)
+            self._compiled = self.expression.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+        return self._compiled
+
+    @property
+    def sql(self) -> str:
+        if isinstance(self.expression, str):
+            return self.expression
+        return str(self._compile())
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        if isinstance(self.expression, str):
+            return {}
+        return dict(self._compile().params)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.model.__name__}.{self.operation}: {self.sql}>"
+
+
+class QueryTracker:
+    """
+    Records the statements executed in the current task (and the tasks started from it) while
+    active. Returned by track_queries.
+    """
+
+    def __init__(self) -> None:
+        self.queries: List[QueryEvent] = []
+        self._token: Optional[Token] = None
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def duration(self) -> float:
+        return sum(query.duration or 0.0 for query in self.queries)
+
+    def __enter__(self) -> "QueryTracker":
+        self._token = _TRACKERS.set((*_TRACKERS.get(), self))
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if self._token is not None:
+            _TRACKERS.reset(self._token)
+            self._token = None
+
+    async def __aenter__(self) -> "QueryTracker":
+        return self.__enter__()
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.__exit__()
+
+
+def track_queries() -> QueryTracker:
+    """
+    Records the statements executed by the models and querysets in the current task.
+
+    **Example**
+
+    ```python
+    async with edgy.track_queries() as tracker:
+        await User.query.all()
+
+    assert tracker.count == 1
+    print(tracker.queries[0].sql)
+    ```
+    """
+    return QueryTracker()
+
+
+async def _call_hooks(hooks: List[Any], event: QueryEvent) -> None:
+    for hook in hooks:
+        result = hook(event)
+        if inspect.isawaitable(result):
+            await result
+
+
+def _start_event(
+    database: "Database", expression: Any, model_class: Type["Model"], operation: str
+) -> Optional[Tuple[QueryEvent, Any, Tuple[QueryTracker, ...]]]:
+    """
+    Returns the event, the registry and the trackers or None when nobody observes the queries.
+    """
+    registry = model_class.meta.registry
+    assert registry is not None, "registry is not set"
+    trackers = _TRACKERS.get()
+    if not trackers and not registry.before_execute_hooks and not registry.after_execute_hooks:
+        return None
+    return QueryEvent(expression, database, model_class, operation), registry, trackers
+
+
+def _count_rows(method: str, result: Any, rowcount: bool) -> Optional[int]:
+    if rowcount:
+        return cast(int, result)
+    if method == "fetch_all":
+        return len(result)
+    if method == "fetch_one":
+        return 0 if result is None else 1
+    if method == "fetch_val":
+        return 1
+    return None
+
+
+async def execute_query(
+    database: "Database",
+    method: str,
+    expression: Any,
+    model_class: Type["Model"],
+    operation: str,
+    rowcount: bool = False,
+) -> Any:
+    """
+    Runs `database.<method>(expression)` calling the execute hooks of the registry of the model
+    and recording the statement in the active trackers.
+
+    With rowcount the result is the number of affected rows and recorded as the rows of the event.
+
+    The after_execute hooks are not called when the execution fails.
+    """
+    started = _start_event(database, expression, model_class, operation)
+    if started is None:
+        return await getattr(database, method)(expression)
+
+    event, registry, trackers = started
+    await _call_hooks(registry.before_execute_hooks, event)
+    start = time.perf_counter()
+    try:
+        result = await getattr(database, method)(expression)
+        event.rows = _count_rows(method, result, rowcount)
+    finally:
+        event.duration = time.perf_counter() - start
+        for tracker in trackers:
+            tracker.queries.append(event)
+    await _call_hooks(registry.after_execute_hooks, event)
+    return result
+
+
+async def iterate_query(
+    database: "Database", expression: Any, model_class: Type["Model"], operation: str
+) -> AsyncIterator[Any]:
+    """
+    Like execute_query for `database.iterate`, the duration and rows cover the whole iteration.
+    """
+    started = _start_event(database, expression, model_class, operation)
+    if started is None:
+        async for row in database.iterate(expression):
+            yield row
+        return
+
+    event, registry, trackers = started
+    await _call_hooks(registry.before_execute_hooks, event)
+    start = time.perf_counter()
+    rows = 0
+    try:
+        async for row in database.iterate(expression):
+            rows += 1
+            yield row
+    finally:
+        event.rows = rows
+        event.duration = time.perf_counter() - start
+        for tracker in trackers:
+            tracker.queries.append(event)
+    await _call_hooks(registry.after_execute_hooks, event)
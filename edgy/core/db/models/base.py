@@ -1,10 +1,12 @@
 import copy
+import sys
 from functools import cached_property
 from typing import (
     TYPE_CHECKING,
     Any,
     ClassVar,
     Dict,
+    FrozenSet,
     Iterable,
     List,
     Literal,
@@ -28,6 +30,7 @@ from edgy.core.db.models.managers import Manager, RedirectManager
 from edgy.core.db.models.metaclasses import BaseModelMeta, MetaInfo
 from edgy.core.db.models.model_proxy import ProxyModel
 from edgy.core.db.models.utils import build_pkcolumns, build_pknames
+from edgy.core.db.n_plus_one import record_lazy_load
 from edgy.core.utils.functional import edgy_setattr
 from edgy.core.utils.models import DateParser, ModelParser, generify_model_fields
 from edgy.core.utils.sync import run_sync
@@ -60,6 +63,10 @@ class EdgyBaseModel(BaseModel, DateParser, ModelParser, metaclass=BaseModelMeta)
     __raw_query__: ClassVar[Optional[str]] = None
     __using_schema__: ClassVar[Union[str, None]] = None
     __show_pk__: ClassVar[bool] = False
+    # None when the instance wasn't loaded from the database, see get_changed_fields
+    __changed_fields__: ClassVar[Optional[FrozenSet[str]]] = None
+    # copies of the values of the mutable fields (JSON...) in the database
+    __mutable_values__: ClassVar[Optional[Dict[str, Any]]] = None
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         __show_pk__ = kwargs.pop("__show_pk__", False)
@@ -68,6 +75,26 @@ class EdgyBaseModel(BaseModel, DateParser, ModelParser, metaclass=BaseModelMeta)
         self.__dict__ = self.setup_model_from_kwargs(kwargs)
         self.__show_pk__ = __show_pk__
 
+    @classmethod
+    def construct_trusted(cls, kwargs: Dict[str, Any]) -> Self:
+        """
+        Builds a model from trusted values, for example the rows returned by the database.
+
+        The to_model of the fields is still applied but the pydantic validation is skipped.
+        """
+        kwargs = cls.transform_input(kwargs, phase="load")
+        # like model_construct, but without collecting the defaults which are thrown away anyway
+        model = cls.__new__(cls)
+        values = model.setup_model_from_kwargs(kwargs)
+        edgy_setattr(model, "__dict__", values)
+        edgy_setattr(model, "__pydantic_fields_set__", set(values.keys()))
+        edgy_setattr(model, "__pydantic_extra__", {k: v for k, v in kwargs.items() if k not in values})
+        if cls.__pydantic_post_init__:
+            model.model_post_init(None)
+        else:
+            edgy_setattr(model, "__pydantic_private__", None)
+        return model
+
     @classmethod
     def transform_input(cls, kwargs: Any, phase: str) -> Any:
         """
@@ -374,6 +401,52 @@ class EdgyBaseModel(BaseModel, DateParser, ModelParser, metaclass=BaseModelMeta)
         columns = self.__class__.columns
         return {k: v for k, v in self.__dict__.items() if k in fields_mapping or k in columns or k in model_references}
 
+    def get_changed_fields(self) -> Set[str]:
+        """
+        Returns the names of the fields changed since the instance was loaded from or saved to the
+        database. Only these are written by `save()`.
+
+        Instances which weren't loaded from the database yet are saved completely, so all their
+        fields are returned. The values of mutable fields (JSON...) are compared with a copy, so
+        changes in place like `data["key"] = 1` are detected too.
+        """
+        changed_fields = self.__dict__.get("__changed_fields__")
+        if changed_fields is None:
+            return set(self.extract_db_fields().keys())
+        mutable_values = self.__dict__.get("__mutable_values__")
+        if mutable_values:
+            return set(changed_fields).union(
+                key for key, value in mutable_values.items() if self.__dict__.get(key) != value
+            )
+        return set(changed_fields)
+
+    def _clear_changed_fields(self, field_names: Optional[Iterable[str]] = None) -> None:
+        """
+        Marks the given fields or, when None, all fields as in sync with the database.
+        """
+        mutable_fields = self.meta.mutable_fields
+        if field_names is None:
+            edgy_setattr(self, "__changed_fields__", _empty)
+            if mutable_fields:
+                self._copy_mutable_values(mutable_fields, {})
+            return
+        field_names = set(field_names)
+        changed_fields = self.__dict__.get("__changed_fields__")
+        if changed_fields:
+            edgy_setattr(self, "__changed_fields__", changed_fields.difference(field_names))
+        if changed_fields is not None and mutable_fields:
+            self._copy_mutable_values(
+                mutable_fields.intersection(field_names), dict(self.__dict__.get("__mutable_values__") or {})
+            )
+
+    def _copy_mutable_values(self, field_names: Iterable[str], mutable_values: Dict[str, Any]) -> None:
+        for field_name in field_names:
+            if field_name in self.__dict__:
+                mutable_values[field_name] = copy.deepcopy(self.__dict__[field_name])
+            else:
+                mutable_values.pop(field_name, None)
+        edgy_setattr(self, "__mutable_values__", mutable_values)
+
     def get_instance_name(self) -> str:
         """
         Returns the name of the class in lowercase.
@@ -386,18 +459,27 @@ class EdgyBaseModel(BaseModel, DateParser, ModelParser, metaclass=BaseModelMeta)
     def __setattr__(self, key: str, value: Any) -> None:
         fields_mapping = self.meta.fields_mapping
         field = fields_mapping.get(key, None)
+        changed_keys: Iterable[str] = ()
         if field is not None:
             if hasattr(field, "__set__"):
                 # not recommended, better to use to_model instead
                 # used in related_fields to mask and not to implement to_model
                 field.__set__(self, value)
+                changed_keys = (key,)
             else:
-                for k, v in field.to_model(key, value, phase="set").items():
+                values = field.to_model(key, value, phase="set")
+                for k, v in values.items():
                     # bypass __settr__
                     edgy_setattr(self, k, v)
+                changed_keys = values.keys()
         else:
             # bypass __settr__
             edgy_setattr(self, key, value)
+            if key in self.meta.model_references:
+                changed_keys = (key,)
+        changed_fields = self.__dict__.get("__changed_fields__")
+        if changed_fields is not None and changed_keys:
+            edgy_setattr(self, "__changed_fields__", changed_fields.union(changed_keys))
 
     def __getattr__(self, name: str) -> Any:
         """
@@ -420,6 +502,7 @@ class EdgyBaseModel(BaseModel, DateParser, ModelParser, metaclass=BaseModelMeta)
             # no need to set an descriptor object
             return field.__get__(self, self.__class__)
         if name not in self.__dict__ and field is not None and name not in self.identifying_db_fields and self.can_load:
+            record_lazy_load(self.__class__, sys._getframe(1))
             run_sync(self.load())
             return self.__dict__[name]
         return super().__getattr__(name)
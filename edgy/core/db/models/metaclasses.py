@@ -114,8 +114,12 @@ _trigger_attributes_MetaInfo = {
     "columns_to_field",
     "special_getter_fields",
     "input_modifying_fields",
+    "mutable_fields",
     "excluded_fields",
+    "hydration_plans",
 }
+# the values of the columns can be changed in place, see EdgyBaseModel.get_changed_fields
+_mutable_column_types = (sqlalchemy.JSON, sqlalchemy.ARRAY, sqlalchemy.PickleType)
 
 class MetaInfo:
     __slots__ = (
@@ -126,6 +130,9 @@ class MetaInfo:
         "tablename",
         "unique_together",
         "indexes",
+        "cache",
+        "pk_cache",
+        "cache_full_table",
         "parents",
         "model",
         "managers",
@@ -133,18 +140,21 @@ class MetaInfo:
         "model_references",
         "signals",
         "input_modifying_fields",
+        "mutable_fields",
         "foreign_key_fields",
         "field_to_columns",
         "field_to_column_names",
         "columns_to_field",
         "special_getter_fields",
         "excluded_fields",
+        "hydration_plans",
         "_is_init"
     )
     _include_dump = (*filter(lambda x: x not in {
         "field_to_columns",
         "field_to_column_names",
         "columns_to_field",
+        "hydration_plans",
         "_is_init"
     }, __slots__), "pk", "is_multi")
 
@@ -161,6 +171,12 @@ class MetaInfo:
         self.tablename: Optional[str] = getattr(meta, "tablename", None)
         self.unique_together: Any = getattr(meta, "unique_together", None)
         self.indexes: Any = getattr(meta, "indexes", None)
+        # True or a ttl in seconds for caching the query results, see QuerySet.cache
+        self.cache: Union[bool, float, None] = getattr(meta, "cache", None)
+        # cache the rows by primary key in the registry, see PKCache
+        self.pk_cache: bool = getattr(meta, "pk_cache", False)
+        # True or a ttl in seconds for keeping the complete table in memory, see FullTableCache
+        self.cache_full_table: Union[bool, float] = getattr(meta, "cache_full_table", False)
         self.signals = signals_module.Broadcaster(getattr(meta, "signals", None) or {})
         self.signals.set_lifecycle_signals_from(signals_module, overwrite=False)
         self.parents: List[Any] = [*getattr(meta, "parents", _empty_set)]
@@ -205,6 +221,7 @@ class MetaInfo:
         special_getter_fields = set()
         excluded_fields = set()
         input_modifying_fields = set()
+        mutable_fields = set()
         foreign_key_fields: Dict[str, BaseField] = {}
         for key, field in self.fields_mapping.items():
             if hasattr(field, "__get__"):
@@ -213,15 +230,19 @@ class MetaInfo:
                 excluded_fields.add(key)
             if hasattr(field, "modify_input"):
                 input_modifying_fields.add(key)
+            if isinstance(getattr(field, "column_type", None), _mutable_column_types):
+                mutable_fields.add(key)
             if isinstance(field, BaseForeignKeyField):
                 foreign_key_fields[key] = field
         self.special_getter_fields: FrozenSet[str] = frozenset(special_getter_fields)
         self.excluded_fields: FrozenSet[str] = frozenset(excluded_fields)
         self.input_modifying_fields: FrozenSet[str] = frozenset(input_modifying_fields)
+        self.mutable_fields: FrozenSet[str] = frozenset(mutable_fields)
         self.foreign_key_fields: Dict[str, BaseField] = foreign_key_fields
         self.field_to_columns = FieldToColumns(self)
         self.field_to_column_names = FieldToColumnNames(self)
         self.columns_to_field = ColumnsToField(self)
+        self.hydration_plans: Dict[Any, Any] = {}
         self._is_init = True
 
     def invalidate(self, clear_class_attrs: bool=True) -> None:
@@ -230,6 +251,12 @@ class MetaInfo:
         self.field_to_columns = FieldToColumns(self)
         self.field_to_column_names = FieldToColumnNames(self)
         self.columns_to_field = ColumnsToField(self)
+        self.hydration_plans = {}
+        registry = getattr(self, "registry", None)
+        model = getattr(self, "model", None)
+        if registry and model is not None:
+            # the tables of the schemas were built from the old fields
+            registry._invalidate_schema_tables(model)
         if clear_class_attrs:
             for attr in ("_table", "_pknames", "_pkcolumns"):
                 try:
@@ -654,6 +681,8 @@ class BaseModelMeta(ModelMetaclass):
 
         new_class.__db_model__ = True
         meta.model = new_class
+        if not meta.abstract:
+            registry._connect_signals(new_class)
 
         # Sets the foreign key fields
         if not new_class.is_proxy_model and meta.foreign_key_fields:
@@ -749,15 +778,17 @@ class BaseModelMeta(ModelMetaclass):
         meta: MetaInfo = cls.meta
         return meta.signals
 
-    def table_schema(cls, schema: str) -> Any:
+    def table_schema(cls, schema: Optional[str]) -> Any:
         """
         Making sure the tables on inheritance state, creates the new
         one properly.
 
-        The use of context vars instead of using the lru_cache comes from
-        a warning from `ruff` where lru can lead to memory leaks.
+        The tables are cached per schema in the registry, see `Registry.get_table_for_schema`.
         """
-        return cls.build(schema=schema)
+        registry: Optional[Registry] = cls.meta.registry
+        if registry is None:
+            return cls.build(schema=schema)
+        return registry.get_table_for_schema(cls, schema)
 
     @property
     def proxy_model(cls) -> Any:
@@ -1,8 +1,14 @@
-from typing import Any, Dict, Set, Type, Union
+import sys
+from typing import Any, Dict, List, Set, Type, Union
 
+from edgy.conf import settings
+from edgy.core.cache import CachedRow
+from edgy.core.db.instrumentation import execute_query
 from edgy.core.db.models.base import EdgyBaseReflectModel
 from edgy.core.db.models.mixins import DeclarativeMixin
 from edgy.core.db.models.row import ModelRow
+from edgy.core.db.n_plus_one import record_load_call
+from edgy.core.utils.models import _has_auto_now, _has_auto_now_add
 from edgy.exceptions import ObjectNotFound, RelationshipNotFound
 from edgy.protocols.many_relationship import ManyRelationProtocol
 
@@ -47,66 +53,129 @@ class Model(ModelRow, DeclarativeMixin):
         """
         await self.signals.pre_update.send_async(self.__class__, instance=self)
 
+        row = None
         # empty updates shouldn't cause an error
         if kwargs:
             kwargs = self._update_auto_now_fields(kwargs, self.fields)
             expression = self.table.update().values(**kwargs).where(*self.identifying_clauses())
-            await self.database.execute(expression)
+            returning_columns = self._get_returning_columns(kwargs, is_update=True)
+            if returning_columns:
+                row = await execute_query(
+                    self.database, "fetch_one", expression.returning(*returning_columns), self.__class__, "update"
+                )
+            else:
+                await execute_query(self.database, "execute", expression, self.__class__, "update")
         await self.signals.post_update.send_async(self.__class__, instance=self)
 
         # Update the model instance.
         for key, value in kwargs.items():
             setattr(self, key, value)
+        if row is not None:
+            self.__dict__.update(self.transform_input(dict(row._mapping), phase="load"))
+        columns_to_field = self.meta.columns_to_field
+        self._clear_changed_fields(columns_to_field.get(key, key) for key in kwargs)
+
+        await self._save_related()
+        return self
 
+    async def _save_related(self) -> None:
+        """
+        Saves the pending children of the relations (many to many and related names).
+        """
         for field in self.meta.fields_mapping.keys():
             _val = self.__dict__.get(field)
             if isinstance(_val, ManyRelationProtocol):
                 _val.instance = self
                 await _val.save_related()
-        return self
 
     async def delete(self) -> None:
         """Delete operation from the database"""
         await self.signals.pre_delete.send_async(self.__class__, instance=self)
 
         expression = self.table.delete().where(*self.identifying_clauses())
-        await self.database.execute(expression)
+        await execute_query(self.database, "execute", expression, self.__class__, "delete")
 
         await self.signals.post_delete.send_async(self.__class__, instance=self)
 
     async def load(self) -> None:
-        # Build the select expression.
-
-        expression = self.table.select().where(*self.identifying_clauses())
+        record_load_call(self.__class__, sys._getframe(1))
+        table = self.table
+        row: Any = None
+        pk_cache = None
+        # the caches are only usable when the instance is identified by the primary key
+        if tuple(self.identifying_db_fields) == tuple(self.pkcolumns):
+            key = tuple(self.__dict__.get(pkcolumn) for pkcolumn in self.pkcolumns)
+            registry = self.meta.registry
+            assert registry is not None, "registry is not set"
+            if self.meta.cache_full_table:
+                cached_table = await registry.full_table_cache.load(self.__class__, self.database, table)
+                row = cached_table.by_pk.get(key)
+            elif self.meta.pk_cache:
+                pk_cache = registry.pk_cache
+                row = pk_cache.get(self.database, table, key)
 
-        # Perform the fetch.
-        row = await self.database.fetch_one(expression)
-        # check if is in system
         if row is None:
-            raise ObjectNotFound("row does not exist anymore")
+            # Build the select expression.
+            expression = table.select().where(*self.identifying_clauses())
+
+            # Perform the fetch.
+            row = await execute_query(self.database, "fetch_one", expression, self.__class__, "load")
+            # check if is in system
+            if row is None:
+                raise ObjectNotFound("row does not exist anymore")
+            if pk_cache is not None:
+                row = CachedRow.from_rows([row])[0]
+                pk_cache.set(self.database, table, key, row)
         # Update the instance.
         self.__dict__.update(self.transform_input(dict(row._mapping), phase="load"))
+        self._clear_changed_fields()
+
+    def _get_returning_columns(self, values: Dict[str, Any], is_update: bool = False) -> List[Any]:
+        """
+        Returns the columns to refresh via `RETURNING` after an insert or update: the primary key
+        columns (insert only), the auto_now columns and the columns with a server default which
+        were not written.
+
+        Empty when the dialect doesn't support `RETURNING`.
+        """
+        if self.database.url.dialect not in settings.returning_dialects:
+            return []
+        table = self.table
+        keys: List[str] = [] if is_update else list(self.pkcolumns)
+        for field_name, field in self.fields.items():
+            if _has_auto_now(field) or (not is_update and _has_auto_now_add(field)):
+                keys.extend(column.key for column in self.meta.field_to_columns[field_name])
+        keys.extend(
+            column.key for column in table.columns if column.server_default is not None and column.key not in values
+        )
+        return [table.columns[key] for key in dict.fromkeys(keys)]
 
     async def _save(self, **kwargs: Any) -> "Model":
         """
         Performs the save instruction.
         """
         expression = self.table.insert().values(**kwargs)
-        autoincrement_value = await self.database.execute(expression)
+        returning_columns = self._get_returning_columns(kwargs)
+        row = None
+        autoincrement_value = None
+        if returning_columns:
+            row = await execute_query(
+                self.database, "fetch_one", expression.returning(*returning_columns), self.__class__, "save"
+            )
+        else:
+            autoincrement_value = await execute_query(self.database, "execute", expression, self.__class__, "save")
         transformed_kwargs = self.transform_input(kwargs, phase="post_insert")
         for k, v in transformed_kwargs.items():
             setattr(self, k, v)
 
+        if row is not None:
+            self.__dict__.update(self.transform_input(dict(row._mapping), phase="load"))
         # sqlalchemy supports only one autoincrement column
-        if autoincrement_value:
+        elif autoincrement_value:
             column = self.table.autoincrement_column
             if column is not None:
                 setattr(self, column.key, autoincrement_value)
-        for field in self.meta.fields_mapping.keys():
-            _val = self.__dict__.get(field)
-            if isinstance(_val, ManyRelationProtocol):
-                _val.instance = self
-                await _val.save_related()
+        await self._save_related()
         return self
 
     async def save_model_references(self, model_references: Any, model_ref: Any = None) -> None:
@@ -167,7 +236,20 @@ class Model(ModelRow, DeclarativeMixin):
         Performs a save of a given model instance.
         When creating a user it will make sure it can update existing or
         create a new one.
+
+        Instances loaded from the database only update the fields changed since
+        (see `get_changed_fields()`), without changes no statement is executed and no signal is
+        sent, only the pending children of the relations are saved.
         """
+        if (
+            not force_save
+            and values is None
+            and self.__dict__.get("__changed_fields__") is not None
+            and not self.get_changed_fields()
+        ):
+            await self._save_related()
+            return self
+
         await self.signals.pre_save.send_async(self.__class__, instance=self)
 
         extracted_fields = self.extract_db_fields()
@@ -178,6 +260,8 @@ class Model(ModelRow, DeclarativeMixin):
                 extracted_fields.pop(pkcolumn, None)
                 force_save = True
 
+        # are all pending changes written?
+        writes_changes = force_save or values is None
         if force_save:
             if values:
                 extracted_fields.update(values)
@@ -189,6 +273,10 @@ class Model(ModelRow, DeclarativeMixin):
             kwargs, model_references = self.update_model_references(**kwargs)
             await self._save(**kwargs)
         else:
+            if values is None and self.__dict__.get("__changed_fields__") is not None:
+                # loaded from the database, only write the changed fields
+                changed_fields = self.get_changed_fields()
+                values = {k: v for k, v in extracted_fields.items() if k in changed_fields}
             # Broadcast the initial update details
             # Making sure it only updates the fields that should be updated
             # and excludes the fields aith `auto_now` as true
@@ -211,9 +299,15 @@ class Model(ModelRow, DeclarativeMixin):
             for model_ref, references in model_references.items():
                 await self.save_model_references(references or [], model_ref=model_ref)
 
-        # Refresh the results
-        if any(field.server_default is not None for name, field in self.fields.items() if name not in extracted_fields):
+        # Refresh the results, when the values of the server defaults were not returned
+        if any(
+            field.server_default is not None
+            for name, field in self.fields.items()
+            if name not in self.__dict__ and self.meta.field_to_columns[name]
+        ):
             await self.load()
+        if writes_changes:
+            self._clear_changed_fields()
 
         await self.signals.post_save.send_async(self.__class__, instance=self)
         return self
@@ -1,307 +1,356 @@
-import asyncio
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Type, Union, cast
+import warnings
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 from edgy.core.db.fields.base import RelationshipField
 from edgy.core.db.models.base import EdgyBaseModel
-from edgy.exceptions import QuerySetError
+from edgy.core.utils.sync import run_sync
 
 if TYPE_CHECKING:  # pragma: no cover
     from sqlalchemy.engine.result import Row
 
-    from edgy import Model, Prefetch, QuerySet
+    from edgy import Model
+    from edgy.core.db.fields.base import BaseForeignKey
+    from edgy.core.db.querysets.prefetch import Prefetch
 
 
-class ModelRow(EdgyBaseModel):
+def _apply_schema(model: Any, schema: Optional[str] = None) -> Any:
+    # Apply the schema to the model
+    if schema is not None:
+        model_class = model if isinstance(model, type) else model.__class__
+        model.table = model_class.table_schema(schema)
+        model.proxy_model.table = model.proxy_model.table_schema(schema)
+    return model
+
+
+class HydrationBinding:
     """
-    Builds a row for a specific model
+    A HydrationPlan bound to the columns of a result. The accessors are either positions in the row
+    or, when the columns of the result are unknown, the columns or their names.
     """
 
-    class Meta:
-        abstract = True
+    __slots__ = ("columns", "foreign_keys", "related")
 
-    @classmethod
-    def from_sqla_row(
-        cls,
-        row: "Row",
-        select_related: Optional[Sequence[Any]] = None,
-        prefetch_related: Optional[Sequence["Prefetch"]] = None,
-        is_only_fields: bool = False,
-        only_fields: Sequence[str] = None,
-        is_defer_fields: bool = False,
-        exclude_secrets: bool = False,
-        using_schema: Union[str, None] = None,
-    ) -> Optional[Type["Model"]]:
-        """
-        Class method to convert a SQLAlchemy Row result into a EdgyModel row type.
+    def __init__(
+        self,
+        columns: List[Tuple[str, Any]],
+        foreign_keys: List[Tuple[str, Type["Model"], List[Tuple[str, Any]]]],
+        related: List[Tuple[str, "HydrationPlan", "HydrationBinding"]],
+    ) -> None:
+        self.columns = columns
+        self.foreign_keys = foreign_keys
+        self.related = related
 
-        Looping through select_related fields if the query comes from a select_related operation.
-        Validates if exists the select_related and related_field inside the models.
 
-        When select_related and related_field exist for the same field being validated, the related
-        field is ignored as it won't override the value already collected from the select_related.
+class HydrationPlan:
+    """
+    Precompiled instructions for building the models of a model class out of the rows
+    of one query shape (select_related, only/defer, exclude_secrets).
 
-        If there is no select_related, then goes through the related field where it **should**
-        only return the instance of the the ForeignKey with the ID, making it lazy loaded.
+    Compiled once per shape and cached on the meta of the model.
+    """
 
-        :return: Model class.
-        """
-        item: Dict[str, Any] = {}
-        select_related = select_related or []
-        prefetch_related = prefetch_related or []
-        secret_fields = [name for name, field in cls.fields.items() if field.secret] if exclude_secrets else []
+    def __init__(
+        self,
+        model_class: Type["ModelRow"],
+        select_related: Sequence[str] = (),
+        only_fields: Optional[Sequence[str]] = None,
+        is_defer_fields: bool = False,
+        exclude_secrets: bool = False,
+    ) -> None:
+        self.model_class = model_class
+        self.is_only_fields = only_fields is not None
+        self.only_fields: FrozenSet[str] = frozenset(only_fields or ())
+        self.is_defer_fields = is_defer_fields
+        self.exclude_secrets = exclude_secrets
+        self.secret_fields: FrozenSet[str] = (
+            frozenset(name for name, field in model_class.fields.items() if field.secret)
+            if exclude_secrets
+            else frozenset()
+        )
+        self._bindings: Dict[Tuple[Tuple[str, str], ...], HydrationBinding] = {}
 
+        fields_mapping = model_class.meta.fields_mapping
+        related_remainders: Dict[str, Tuple[Type["ModelRow"], List[str]]] = {}
         for related in select_related:
             field_name = related.split("__", 1)[0]
-            field = cls.meta.fields_mapping[field_name]
+            field = fields_mapping[field_name]
             if isinstance(field, RelationshipField):
-                model_class, _, remainder = field.traverse_field(related)
+                related_class, _, remainder = field.traverse_field(related)
             else:
                 raise Exception("invalid field")
+            remainders = related_remainders.setdefault(field_name, (related_class, []))[1]
             if remainder:
-                item[field_name] = model_class.from_sqla_row(
-                    row,
-                    select_related=[remainder],
-                    prefetch_related=prefetch_related,
-                    exclude_secrets=exclude_secrets,
-                    using_schema=using_schema,
-                )
-            else:
-                item[field_name] = model_class.from_sqla_row(row, exclude_secrets=exclude_secrets, using_schema=using_schema)
+                remainders.append(remainder)
+        self.related: List[Tuple[str, HydrationPlan]] = [
+            (field_name, related_class.get_hydration_plan(select_related=remainders, exclude_secrets=exclude_secrets))
+            for field_name, (related_class, remainders) in related_remainders.items()
+        ]
+
         # Populate the related names
         # Making sure if the model being queried is not inside a select related
         # This way it is not overritten by any value
-        for related, foreign_key in cls.meta.foreign_key_fields.items():
-            ignore_related: bool = cls.__should_ignore_related_name(related, select_related)
-            if ignore_related or related in secret_fields:
+        self.foreign_keys: List[Tuple[str, "BaseForeignKey", List[Tuple[str, str]]]] = []
+        for related, foreign_key in model_class.meta.foreign_key_fields.items():
+            if any(related in related_path.split("__") for related_path in select_related):
                 continue
-
-            columns_to_check = foreign_key.get_column_names(related)
-            if secret_fields and not columns_to_check.isdisjoint(secret_fields):
+            if related in self.secret_fields:
+                continue
+            column_names = foreign_key.get_column_names(related)
+            if self.secret_fields and not column_names.isdisjoint(self.secret_fields):
                 continue
+            self.foreign_keys.append(
+                (
+                    related,
+                    cast("BaseForeignKey", foreign_key),
+                    [(foreign_key.from_fk_field_name(related, column_name), column_name) for column_name in column_names],
+                )
+            )
 
-            model_related = foreign_key.target
+        # Pull out the regular column values.
+        # Making sure when a table is reflected, maps the right fields of the ReflectModel
+        self.columns: List[str] = [
+            column.name
+            for column in model_class.table.columns
+            if column.name not in self.secret_fields and column.name in model_class.fields
+        ]
 
-            # Apply the schema to the model
-            model_related = cls.__apply_schema(model_related, using_schema)
+    def bind(self, selected_columns: Sequence[Any]) -> Optional[HydrationBinding]:
+        """
+        Binds the plan to the positions of the selected columns of a select expression.
 
-            child_item = {}
-            for column_name in columns_to_check:
-                if column_name not in row:
-                    continue
-                elif row[column_name] is not None:  # type: ignore
-                    child_item[foreign_key.from_fk_field_name(related, column_name)] = row[column_name]  # type: ignore
+        Returns None when the positions cannot be determined (for example text columns).
+        """
+        keys = []
+        for column in selected_columns:
+            table = getattr(column, "table", None)
+            if table is None or getattr(table, "name", None) is None:
+                return None
+            keys.append((table.name, column.name))
+        if not keys:
+            return None
+        key = tuple(keys)
+        binding = self._bindings.get(key)
+        if binding is None:
+            positions: Dict[Tuple[str, str], int] = {}
+            for position, column_key in enumerate(key):
+                # first one wins like the lookups by name
+                positions.setdefault(column_key, position)
+            binding = self._bindings[key] = self._build_binding(positions)
+        return binding
+
+    def _build_binding(self, positions: Optional[Dict[Tuple[str, str], int]], row: Any = None) -> HydrationBinding:
+        table = self.model_class.table
+        tablename = table.name
+        foreign_keys = []
+        for related, foreign_key, column_names in self.foreign_keys:
+            accessors = []
+            for child_key, column_name in column_names:
+                if positions is None:
+                    if row is not None and column_name in row:
+                        accessors.append((child_key, column_name))
+                elif (tablename, column_name) in positions:
+                    accessors.append((child_key, positions[(tablename, column_name)]))
+            foreign_keys.append((related, foreign_key.target, accessors))
+
+        columns = []
+        for column_name in self.columns:
+            column = table.columns[column_name]
+            if positions is None:
+                columns.append((column_name, column))
+            else:
+                columns.append((column_name, positions.get((tablename, column_name), column)))
+
+        return HydrationBinding(
+            columns=columns,
+            foreign_keys=foreign_keys,
+            related=[
+                (field_name, plan, plan._build_binding(positions, row)) for field_name, plan in self.related
+            ],
+        )
 
+    def apply_schema(self, schema: Optional[str]) -> None:
+        """
+        Applies the schema to the model classes of the foreign keys.
+        """
+        if schema is None:
+            return
+        for _, foreign_key, _ in self.foreign_keys:
+            _apply_schema(foreign_key.target, schema)
+        for _, plan in self.related:
+            plan.apply_schema(schema)
+
+    def hydrate_rows(
+        self,
+        rows: Sequence["Row"],
+        selected_columns: Optional[Sequence[Any]] = None,
+        using_schema: Union[str, None] = None,
+        trusted: bool = False,
+    ) -> List["Model"]:
+        """
+        Builds the models of the rows. When the selected_columns of the select expression are passed,
+        the values are extracted by their positions.
+        """
+        binding = self.bind(selected_columns) if selected_columns is not None else None
+        self.apply_schema(using_schema)
+        return [
+            self.hydrate(
+                row,
+                binding if binding is not None else self._build_binding(None, row),
+                using_schema=using_schema,
+                trusted=trusted,
+            )
+            for row in rows
+        ]
+
+    def hydrate(
+        self,
+        row: "Row",
+        binding: HydrationBinding,
+        using_schema: Union[str, None] = None,
+        trusted: bool = False,
+    ) -> "Model":
+        item: Dict[str, Any] = {}
+        for field_name, plan, related_binding in binding.related:
+            item[field_name] = plan.hydrate(row, related_binding, using_schema=using_schema, trusted=trusted)
+
+        for related, target, accessors in binding.foreign_keys:
+            child_item = {}
+            for child_key, accessor in accessors:
+                value = row[accessor]
+                if value is not None:
+                    child_item[child_key] = value
             # Make sure we generate a temporary reduced model
             # For the related fields. We simply chnage the structure of the model
             # and rebuild it with the new fields.
-            item[related] = model_related.proxy_model(**child_item)
-
-        # Check for the only_fields
-        if is_only_fields or is_defer_fields:
-            mapping_fields = (
-                [str(field) for field in only_fields] if is_only_fields else list(row.keys())  # type: ignore
-            )
+            if trusted:
+                item[related] = target.proxy_model.construct_trusted(child_item)
+            else:
+                item[related] = target.proxy_model(**child_item)
+            item[related]._clear_changed_fields()
 
+        model_class: Any = self.model_class
+        if self.is_only_fields or self.is_defer_fields:
+            secret_fields = self.secret_fields
+            only_fields = self.only_fields
             for column, value in row._mapping.items():
                 if column in secret_fields:
                     continue
                 # Making sure when a table is reflected, maps the right fields of the ReflectModel
-                if column not in mapping_fields:
+                if self.is_only_fields and column not in only_fields:
                     continue
-
                 if column not in item:
                     item[column] = value
-
             # We need to generify the model fields to make sure we can populate the
             # model without mandatory fields
-            model = cast("Type[Model]", cls.proxy_model(**item))
-
-            # Apply the schema to the model
-            model = cls.__apply_schema(model, using_schema)
-
-            model = cls.__handle_prefetch_related(row=row, model=model, prefetch_related=prefetch_related)
-            return model
+            model_class = model_class.proxy_model
         else:
-            # Pull out the regular column values.
-            for column in cls.table.columns:
-                # Making sure when a table is reflected, maps the right fields of the ReflectModel
-                if column.name in secret_fields:
-                    continue
-                if column.name not in cls.fields.keys():
-                    continue
-                elif column.name not in item:
-                    item[column.name] = row[column]
-
-        model = (
-            cast("Type[Model]", cls(**item)) if not exclude_secrets else cast("Type[Model]", cls.proxy_model(**item))
-        )
-
+            for column_name, accessor in binding.columns:
+                if column_name not in item:
+                    item[column_name] = row[accessor]
+            if self.exclude_secrets:
+                model_class = model_class.proxy_model
+
+        if trusted:
+            model = model_class.construct_trusted(item)
+        else:
+            model = model_class(**item)
+        model._clear_changed_fields()
         # Apply the schema to the model
-        model = cls.__apply_schema(model, using_schema)
+        return cast("Model", _apply_schema(model, using_schema))
 
-        # Handle prefetch related fields.
-        model = cls.__handle_prefetch_related(row=row, model=model, prefetch_related=prefetch_related)
-        return model
 
-    @classmethod
-    def __apply_schema(cls, model: Type["Model"], schema: Optional[str] = None) -> Type["Model"]:
-        # Apply the schema to the model
-        if schema is not None:
-            model.table = model.build(schema)  # type: ignore
-            model.proxy_model.table = model.proxy_model.build(schema)  # type: ignore
-        return model
+class ModelRow(EdgyBaseModel):
+    """
+    Builds a row for a specific model
+    """
 
-    @classmethod
-    def __should_ignore_related_name(cls, related_name: str, select_related: Sequence[str]) -> bool:
-        """
-        Validates if it should populate the related field if select related is not considered.
-        """
-        for related_field in select_related:
-            fields = related_field.split("__")
-            if related_name in fields:
-                return True
-        return False
+    class Meta:
+        abstract = True
 
     @classmethod
-    def __handle_prefetch_related(
+    def get_hydration_plan(
         cls,
-        row: "Row",
-        model: Type["Model"],
-        # for advancing
-        prefetch_related: Sequence["Prefetch"],
-        parent_cls: Optional[Type["Model"]] = None,
-        # for going back
-        reverse_path: str = "",
-        is_nested: bool = False,
-    ) -> Type["Model"]:
+        select_related: Optional[Sequence[str]] = None,
+        only_fields: Optional[Sequence[Any]] = None,
+        is_defer_fields: bool = False,
+        exclude_secrets: bool = False,
+    ) -> HydrationPlan:
         """
-        Handles any prefetch related scenario from the model.
-        Loads in advance all the models needed for a specific record
-
-        Recursively checks for the related field and validates if there is any conflicting
-        attribute. If there is, a `QuerySetError` is raised.
+        Returns the cached HydrationPlan of the model for the shape of a query.
         """
-        if not parent_cls:
-            parent_cls = model
-
-        for related in prefetch_related:
-            if not is_nested:
-                # Check for conflicting names
-                # If to_attr has the same name of any
-                if hasattr(parent_cls, related.to_attr):
-                    raise QuerySetError(
-                        f"Conflicting attribute to_attr='{related.related_name}' with '{related.to_attr}' in {parent_cls.__class__.__name__}"
-                    )
-
-            if not is_nested:
-                reverse_path = ""
-
-            if "__" in related.related_name:
-                first_part, remainder = related.related_name.split("__", 1)
-
-                field = cls.meta.fields_mapping[first_part]
-                if isinstance(field, RelationshipField):
-                    model_class, reverse_part, remainder = field.traverse_field(related.related_name)
-                    if not reverse_part:
-                        raise Exception("No reverse relation possible (missing related_name)")
-                else:
-                    raise Exception("invalid field")
-
-                # Build the new nested Prefetch object
-                remainder_prefetch = related.__class__(
-                    related_name=remainder, to_attr=related.to_attr, queryset=related.queryset
-                )
-                if reverse_path:
-                    reverse_path = f"{reverse_part}__{reverse_path}"
-                else:
-                    reverse_path = reverse_part
-
-                # Recursively continue the process of handling the
-                # new prefetch
-                model_class.__handle_prefetch_related(
-                    row,
-                    model,
-                    prefetch_related=[remainder_prefetch],
-                    reverse_path=reverse_path,
-                    parent_cls=model,
-                    is_nested=True,
-                )
-
-            # Check for individual not nested querysets
-            elif related.queryset is not None and not is_nested:
-                extra = {}
-                for pkcol in cls.pkcolumns:
-                    filter_by_pk = row[pkcol]
-                    extra[f"{related.related_name}__{pkcol}"] = filter_by_pk
-                related.queryset.extra = extra
-
-                # Execute the queryset
-                records = asyncio.get_event_loop().run_until_complete(cls.run_query(queryset=related.queryset))
-                setattr(model, related.to_attr, records)
-            else:
-                records = cls.process_nested_prefetch_related(
-                    row,
-                    prefetch_related=related,
-                    reverse_path=reverse_path,
-                    parent_cls=model,
-                    queryset=related.queryset,
-                )
-
-                setattr(model, related.to_attr, records)
-        return model
+        only_names = tuple(str(field) for field in only_fields) if only_fields is not None else None
+        key = (tuple(select_related or ()), only_names, is_defer_fields, exclude_secrets)
+        plans = cls.meta.hydration_plans
+        plan = plans.get(key)
+        if plan is None:
+            plan = plans[key] = HydrationPlan(
+                cls,
+                select_related=key[0],
+                only_fields=only_names,
+                is_defer_fields=is_defer_fields,
+                exclude_secrets=exclude_secrets,
+            )
+        return cast(HydrationPlan, plan)
 
     @classmethod
-    def process_nested_prefetch_related(
+    def from_sqla_row(
         cls,
         row: "Row",
-        prefetch_related: "Prefetch",
-        parent_cls: Type["Model"],
-        reverse_path: str,
-        queryset: "QuerySet",
-    ) -> List[Type["Model"]]:
-        """
-        Processes the nested prefetch related names.
+        select_related: Optional[Sequence[Any]] = None,
+        prefetch_related: Optional[Sequence["Prefetch"]] = None,
+        is_only_fields: bool = False,
+        only_fields: Sequence[str] = None,
+        is_defer_fields: bool = False,
+        exclude_secrets: bool = False,
+        using_schema: Union[str, None] = None,
+        trusted: bool = False,
+        selected_columns: Optional[Sequence[Any]] = None,
+    ) -> Optional[Type["Model"]]:
         """
-        # Get the related field
-        field = cls.meta.fields_mapping[prefetch_related.related_name]
-        if isinstance(field, RelationshipField):
-            model_class, reverse_part, remainder = field.traverse_field(prefetch_related.related_name)
-            if not reverse_part:
-                raise Exception("No backward relation possible (missing related_name)")
-        else:
-            raise Exception("invalid field")
-
-        if reverse_path:
-            reverse_path = f"{reverse_part}__{reverse_path}"
-        else:
-            reverse_path = reverse_part
+        Class method to convert a SQLAlchemy Row result into a EdgyModel row type.
 
-        # TODO: related_field.clean would be better
-        # fix this later when allowing selecting fields for fireign keys
-        # Extract foreign key value
-        extra = {}
-        for pkcol in parent_cls.pkcolumns:
-            filter_by_pk = row[pkcol]
-            extra[f"{reverse_path}__{pkcol}"] = filter_by_pk
+        Looping through select_related fields if the query comes from a select_related operation.
+        Validates if exists the select_related and related_field inside the models.
 
-        records = asyncio.get_event_loop().run_until_complete(cls.run_query(model_class, extra, queryset))
-        return records
+        When select_related and related_field exist for the same field being validated, the related
+        field is ignored as it won't override the value already collected from the select_related.
 
-    @classmethod
-    async def run_query(
-        cls,
-        model: Optional[Type["Model"]] = None,
-        extra: Optional[Dict[str, Any]] = None,
-        queryset: Optional["QuerySet"] = None,
-    ) -> Union[List[Type["Model"]], Any]:
-        """
-        Runs a specific query against a given model with filters.
-        """
+        If there is no select_related, then goes through the related field where it **should**
+        only return the instance of the the ForeignKey with the ID, making it lazy loaded.
 
-        if not queryset:
-            return await model.query.filter(**extra)  # type: ignore
+        When trusted is set, the values of the row are not validated by pydantic.
+        The selected_columns of the select expression allow extracting the values by position.
 
-        if extra:
-            queryset.extra = extra
+        The prefetch_related is deprecated, the querysets prefetch the related models of all the
+        results after the main query (see `QuerySet.prefetch_related`).
 
-        return await queryset
+        :return: Model class.
+        """
+        plan = cls.get_hydration_plan(
+            select_related=select_related,
+            only_fields=(only_fields or []) if is_only_fields else None,
+            is_defer_fields=is_defer_fields,
+            exclude_secrets=exclude_secrets,
+        )
+        model = plan.hydrate_rows([row], selected_columns=selected_columns, using_schema=using_schema, trusted=trusted)[0]
+        if prefetch_related:
+            warnings.warn(
+                "The prefetch_related of from_sqla_row is deprecated, use QuerySet.prefetch_related instead.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            queryset = cls.query.using(using_schema) if using_schema is not None else cls.query.all()
+            run_sync(queryset.prefetch_related(*prefetch_related)._prefetch_related_objects([model]))
+        return cast("Type[Model]", model)
@@ -0,0 +1,201 @@
+import os
+import warnings
+from contextvars import ContextVar, Token
+from types import FrameType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Set, Tuple, Type
+
+from edgy.exceptions import NPlusOneError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from edgy import Model
+
+_DETECTOR: ContextVar[Optional["NPlusOneDetector"]] = ContextVar("edgy_n_plus_one_detector", default=None)
+# the directory of the edgy package, its frames are skipped for finding the call site
+_EDGY_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+
+
+class NPlusOneWarning(UserWarning):
+    """
+    Warns about repeated lazy loads of a relationship from the same place.
+    """
+
+
+def _is_edgy_frame(frame: FrameType) -> bool:
+    return frame.f_code.co_filename.startswith(_EDGY_PATH)
+
+
+def get_call_site(frame: Optional[FrameType]) -> str:
+    """
+    Returns `<filename>:<lineno>` of the first frame outside of edgy, starting with frame.
+    """
+    while frame is not None and _is_edgy_frame(frame):
+        frame = frame.f_back
+    if frame is None:
+        return "<unknown>"
+    return f"{frame.f_code.co_filename}:{frame.f_lineno}"
+
+
+def _get_model(model_class: Type["Model"]) -> Type["Model"]:
+    # the stubs of foreign keys are proxy models without the reverse relations
+    if model_class.is_proxy_model:
+        return model_class.meta.registry.models.get(model_class.__name__, model_class)  # type: ignore
+    return model_class
+
+
+def describe_foreign_key(model_class: Type["Model"]) -> Tuple[str, str]:
+    """
+    Returns the description of the foreign keys pointing to the model and the suggestion for
+    loading them eagerly.
+    """
+    from edgy.core.db.relationships.related_field import RelatedField
+
+    model_class = _get_model(model_class)
+    foreign_keys = [
+        (field.related_from.__name__, field.foreign_key_name)
+        for field in model_class.meta.fields_mapping.values()
+        if isinstance(field, RelatedField)
+    ]
+    if len(foreign_keys) == 1:
+        owner, name = foreign_keys[0]
+        return (
+            f"{model_class.__name__} via {owner}.{name}",
+            f"Use select_related({name!r}) or load_related({name!r}) on the queryset of {owner}.",
+        )
+    return (
+        model_class.__name__,
+        "Use select_related() or load_related() with the foreign key on the queryset.",
+    )
+
+
+class NPlusOneDetector:
+    """
+    Counts the lazy loads of the models and relationships per call site while active and warns
+    (or raises NPlusOneError) when the same load happened `threshold` times. Returned by
+    detect_n_plus_one.
+    """
+
+    def __init__(self, threshold: int = 3, raise_error: bool = False) -> None:
+        self.threshold = threshold
+        self.raise_error = raise_error
+        # (loaded, call site) -> count
+        self.loads: Dict[Tuple[str, str], int] = {}
+        self.reported: Set[Tuple[str, str]] = set()
+        self._token: Optional[Token] = None
+
+    def record(self, loaded: str, call_site: str, describe: Callable[[], Tuple[str, str]]) -> None:
+        """
+        Counts the load, describe returns the description of the loaded relationship and the
+        suggestion for the report.
+        """
+        key = (loaded, call_site)
+        count = self.loads.get(key, 0) + 1
+        self.loads[key] = count
+        if count < self.threshold or key in self.reported:
+            return
+        self.reported.add(key)
+        description, suggestion = describe()
+        message = (
+            f"Possible N+1 queries: {description} was loaded lazily {count} times from {call_site}. "
+            f"{suggestion}"
+        )
+        if self.raise_error:
+            raise NPlusOneError(detail=message)
+        warnings.warn(message, NPlusOneWarning, stacklevel=2)
+
+    def __enter__(self) -> "NPlusOneDetector":
+        self._token = _DETECTOR.set(self)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if self._token is not None:
+            _DETECTOR.reset(self._token)
+            self._token = None
+
+    async def __aenter__(self) -> "NPlusOneDetector":
+        return self.__enter__()
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.__exit__()
+
+
+def detect_n_plus_one(threshold: int = 3, raise_error: bool = False) -> NPlusOneDetector:
+    """
+    Detects the repeated lazy loads in the current task (and the tasks started from it): the
+    lazy loading of foreign keys, `load()` calls and the queries of relation managers like
+    `user.posts.all()`.
+
+    **Example**
+
+    ```python
+    async with edgy.detect_n_plus_one(raise_error=True):
+        for post in await Post.query.all():
+            await post.user.load()  # raises NPlusOneError on the third post
+    ```
+    """
+    return NPlusOneDetector(threshold=threshold, raise_error=raise_error)
+
+
+def get_n_plus_one_detector() -> Optional[NPlusOneDetector]:
+    return _DETECTOR.get()
+
+
+def record_lazy_load(model_class: Type["Model"], frame: Optional[FrameType]) -> None:
+    """
+    Records the lazy load of an instance of the model, usually the stub of a foreign key,
+    triggered by the code of the frame.
+    """
+    detector = _DETECTOR.get()
+    if detector is None:
+        return
+    detector.record(
+        _get_model(model_class).__name__, get_call_site(frame), lambda: describe_foreign_key(model_class)
+    )
+
+
+def record_load_call(model_class: Type["Model"], frame: Optional[FrameType]) -> None:
+    """
+    Records a `load()` call from the frame, the loads done by edgy itself are skipped.
+    """
+    if _DETECTOR.get() is None or frame is None or _is_edgy_frame(frame):
+        return
+    record_lazy_load(model_class, frame)
+
+
+# the methods of the relation managers which don't load the related objects
+_RELATION_WRITE_METHODS = frozenset(
+    ("create", "get_or_create", "update_or_create", "bulk_create", "bulk_update", "bulk_upsert", "update", "delete")
+)
+
+
+def record_relation_query(
+    model_class: Type["Model"], get_name: Callable[[], str], method: str, frame: Optional[FrameType]
+) -> None:
+    """
+    Records the call of method of a relation manager of an instance of the model. get_name
+    returns the name of the relation.
+    """
+    detector = _DETECTOR.get()
+    if detector is None or method in _RELATION_WRITE_METHODS:
+        return
+    name = get_name()
+    model_name = _get_model(model_class).__name__
+    detector.record(
+        f"{model_name}.{name}",
+        get_call_site(frame),
+        lambda: (
+            f"{model_name}.{name}",
+            f"Use prefetch_related(Prefetch({name!r}, to_attr=...)) on the queryset of {model_name}.",
+        ),
+    )
+
+
+__all__ = [
+    "NPlusOneDetector",
+    "NPlusOneWarning",
+    "detect_n_plus_one",
+    "get_call_site",
+    "get_n_plus_one_detector",
+    "record_lazy_load",
+    "record_load_call",
+    "record_relation_query",
+]
@@ -1,5 +1,22 @@
+from .aggregates import Aggregate, Avg, Count, Max, Min, Sum
 from .base import QuerySet
 from .clauses import Q, and_, not_, or_
-from .prefetch import Prefetch
+from .prefetch import Prefetch, load_all
+from .sync import SyncQuerySet
 
-__all__ = ["QuerySet", "Prefetch", "Q", "and_", "not_", "or_"]
+__all__ = [
+    "Aggregate",
+    "Avg",
+    "Count",
+    "Max",
+    "Min",
+    "Prefetch",
+    "Q",
+    "QuerySet",
+    "Sum",
+    "SyncQuerySet",
+    "and_",
+    "load_all",
+    "not_",
+    "or_",
+]
@@ -0,0 +1,49 @@
+from typing import Any, ClassVar
+
+import sqlalchemy
+
+
+class Aggregate:
+    """
+    Aggregate function computed in the database over a field.
+
+    The field can be a path traversing relationships like `tracks__duration`.
+    When the path ends on a relationship, the primary key of the related model is used.
+    """
+
+    function: ClassVar[str]
+
+    def __init__(self, field: str, distinct: bool = False) -> None:
+        self.field = field
+        self.distinct = distinct
+
+    def as_sql(self, column: Any) -> Any:
+        """
+        Returns the SQL expression of the aggregate over the column.
+        """
+        if self.distinct:
+            column = column.distinct()
+        return getattr(sqlalchemy.func, self.function)(column)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.field!r}, distinct={self.distinct!r})"
+
+
+class Count(Aggregate):
+    function = "count"
+
+
+class Sum(Aggregate):
+    function = "sum"
+
+
+class Avg(Aggregate):
+    function = "avg"
+
+
+class Min(Aggregate):
+    function = "min"
+
+
+class Max(Aggregate):
+    function = "max"
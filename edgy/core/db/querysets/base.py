@@ -3,6 +3,7 @@ from typing import (
     TYPE_CHECKING,
     Any,
     AsyncIterator,
+    Collection,
     Dict,
     Generator,
     List,
@@ -18,14 +19,32 @@ from typing import (
 )
 
 import sqlalchemy
+from pydantic import ValidationError
 
 from edgy.conf import settings
+from edgy.core.cache import (
+    CachedRow,
+    build_cache_key,
+    filter_cached_rows,
+    get_expression_tables,
+)
 from edgy.core.db.context_vars import get_schema
 from edgy.core.db.fields import CharField, TextField
 from edgy.core.db.fields.base import BaseForeignKey, RelationshipField
+from edgy.core.db.instrumentation import execute_query, iterate_query
+from edgy.core.db.querysets.aggregates import Aggregate, Count
+from edgy.core.db.querysets.keyset import build_keyset_clause, decode_cursor, encode_cursor
 from edgy.core.db.querysets.mixins import EdgyModel, QuerySetPropsMixin, TenancyMixin
-from edgy.core.db.querysets.prefetch import PrefetchMixin
+from edgy.core.db.querysets.prefetch import PrefetchMixin, load_all
 from edgy.core.db.querysets.protocols import AwaitableQuery
+from edgy.core.db.querysets.sync import SyncQuerySet
+from edgy.core.db.querysets.upsert import (
+    build_created_flag,
+    build_upsert,
+    supports_created_flag,
+    supports_on_conflict,
+    supports_upsert,
+)
 from edgy.core.utils.models import DateParser, ModelParser
 from edgy.exceptions import MultipleObjectsReturned, ObjectNotFound, QuerySetError
 from edgy.protocols.queryset import QuerySetProtocol
@@ -120,6 +139,9 @@ class BaseQuerySet(
     AwaitableQuery[EdgyModel],
 ):
     ESCAPE_CHARACTERS = ["%", "_"]
+    # the attempts of update_or_create without a created flag (see supports_created_flag) when the
+    # record is deleted between the insert and the update
+    UPSERT_ATTEMPTS = 3
 
     def __init__(
         self,
@@ -129,6 +151,7 @@ class BaseQuerySet(
         or_clauses: Any = None,
         select_related: Any = None,
         prefetch_related: Any = None,
+        load_related: Any = None,
         limit_count: Any = None,
         limit_offset: Any = None,
         order_by: Any = None,
@@ -140,6 +163,9 @@ class BaseQuerySet(
         using_schema: Any = None,
         table: Any = None,
         exclude_secrets: Any = False,
+        trusted_rows: Optional[bool] = None,
+        annotations: Optional[Dict[str, Aggregate]] = None,
+        cache: Union[bool, float, None] = None,
     ) -> None:
         super().__init__(model_class=model_class)
         self.model_class = cast("Type[Model]", model_class)
@@ -148,6 +174,7 @@ class BaseQuerySet(
         self.limit_count = limit_count
         self._select_related = [] if select_related is None else select_related
         self._prefetch_related = [] if prefetch_related is None else prefetch_related
+        self._load_related = [] if load_related is None else load_related
         self._offset = limit_offset
         self._order_by = [] if order_by is None else order_by
         self._group_by = [] if group_by is None else group_by
@@ -155,10 +182,13 @@ class BaseQuerySet(
         self._only = [] if only_fields is None else only_fields
         self._defer = [] if defer_fields is None else defer_fields
         self._expression = None
-        self._cache = None
+        # None: defaults to Meta.cache, False: disabled, True: without expiry, else the ttl
+        self._cache = cache
         self.embed_parent = embed_parent
         self.using_schema = using_schema
         self._exclude_secrets = exclude_secrets or False
+        self._trusted_rows = trusted_rows
+        self._annotations: Dict[str, Aggregate] = {} if annotations is None else annotations
         self.extra: Dict[str, Any] = {}
 
         # Making sure the queryset always starts without any schema associated unless specified
@@ -206,24 +236,29 @@ class BaseQuerySet(
         else:
             return expression.distinct()
 
-    def _build_tables_select_from_relationship(self) -> Any:
+    def _build_tables_select_from_relationship(self, outer_paths: Collection[str] = ()) -> Any:
         """
         Builds the tables relationships and joins.
         When a table contains more than one foreign key pointing to the same
         destination table, a lookup for the related field is made to understand
         from which foreign key the table is looked up from.
+
+        The joins of all the paths are chained, a relationship shared by several paths is joined
+        once. The paths in outer_paths are left outer joined (unless already joined by another
+        path), so rows without related objects are kept.
         """
         queryset: "QuerySet" = self._clone()
 
         select_from = queryset.table
         tables = {select_from.name: select_from}
+        joined: Dict[str, Any] = {}
 
         # Select related
-        for select_path in queryset._select_related:
+        for full_path in queryset._select_related:
             # For m2m relationships
             model_class = queryset.model_class
-            select_from = queryset.table
-            former_table = None
+            select_path = full_path
+            former_table = queryset.table
             while select_path:
                 field_name = select_path.split("__", 1)[0]
                 field = model_class.fields[field_name]
@@ -231,6 +266,10 @@ class BaseQuerySet(
                     model_class, reverse_part, select_path = field.traverse_field(select_path)
                 else:
                     raise ValueError(f"{field_name}: invalid field type: {field!r}")
+                joined_path = full_path[: len(full_path) - len(select_path)].rstrip("_")
+                if joined_path in joined:
+                    former_table = joined[joined_path]
+                    continue
                 if isinstance(field, BaseForeignKey):
                     foreign_key = field
                     reverse = False
@@ -243,9 +282,12 @@ class BaseQuerySet(
                 select_from = sqlalchemy.sql.join(  # type: ignore
                     select_from,
                     table,
-                    *self._select_from_relationship_clause_generator(select_from, foreign_key, table, reverse, former_table)
+                    sqlalchemy.and_(
+                        *self._select_from_relationship_clause_generator(select_from, foreign_key, table, reverse, former_table)
+                    ),
+                    isouter=full_path in outer_paths,
                 )
-                former_table = table
+                former_table = joined[joined_path] = table
                 tables[table.name] = table
 
         return tables.values(), select_from
@@ -291,14 +333,14 @@ class BaseQuerySet(
         columns = list(set(columns))
         return columns
 
-    def _build_select(self) -> Any:
+    def _build_select(self, outer_paths: Collection[str] = ()) -> Any:
         """
         Builds the query select based on the given parameters and filters.
         """
         queryset: "QuerySet" = self._clone()
 
         queryset._validate_only_and_defer()
-        tables, select_from = queryset._build_tables_select_from_relationship()
+        tables, select_from = queryset._build_tables_select_from_relationship(outer_paths=outer_paths)
         expression = sqlalchemy.sql.select(*tables)
         expression = expression.select_from(select_from)
 
@@ -314,6 +356,11 @@ class BaseQuerySet(
             columns = [column for column in select_from.columns if column.name in model_columns]
             expression = expression.with_only_columns(*columns)
 
+        if queryset._annotations:
+            expression = expression.add_columns(
+                *(queryset._build_annotation(name, aggregate) for name, aggregate in queryset._annotations.items())
+            )
+
         if queryset.filter_clauses:
             expression = queryset._build_filter_clauses_expression(queryset.filter_clauses, expression=expression)
 
@@ -403,6 +450,7 @@ class BaseQuerySet(
                 or_clauses=or_clauses,
                 select_related=select_related,
                 prefetch_related=prefetch_related,
+                load_related=list(self._load_related),
                 limit_count=self.limit_count,
                 limit_offset=self._offset,
                 order_by=self._order_by,
@@ -412,6 +460,9 @@ class BaseQuerySet(
                 table=self.table,
                 exclude_secrets=self._exclude_secrets,
                 using_schema=self.using_schema,
+                trusted_rows=self._trusted_rows,
+                annotations=dict(self._annotations),
+                cache=self._cache,
             ),
         )
 
@@ -421,9 +472,57 @@ class BaseQuerySet(
     def _prepare_order_by(self, order_by: str) -> Any:
         reverse = order_by.startswith("-")
         order_by = order_by.lstrip("-")
-        order_col = self.table.columns[order_by]
+        order_col: Any
+        if order_by in self._annotations:
+            order_col = sqlalchemy.column(order_by)
+        else:
+            order_col = self.table.columns[order_by]
         return order_col.desc() if reverse else order_col
 
+    def _resolve_aggregate_field(self, aggregate: Aggregate, path: Optional[str] = None) -> Tuple[str, Any]:
+        """
+        Resolves the field path of an aggregate into the forward path to join and the column.
+        """
+        path = aggregate.field if path is None else path
+        try:
+            model_class, field_name, _, forward_path, _ = crawl_relationship(self.model_class, path)
+        except ValueError:
+            raise QuerySetError(detail=f"Invalid field '{path}' for aggregate {aggregate!r}.") from None
+        field = model_class.meta.fields_mapping.get(field_name)
+        if field is None:
+            raise QuerySetError(detail=f"Invalid field '{path}' for aggregate {aggregate!r}.")
+        columns = model_class.meta.field_to_columns[field_name]
+        if not columns and isinstance(field, RelationshipField):
+            # aggregate over the primary key of the related model
+            target = field.traverse_field(field_name)[0]
+            return self._resolve_aggregate_field(aggregate, f"{path}__{target.pknames[0]}")
+        if not columns or (len(columns) > 1 and not isinstance(aggregate, Count)):
+            raise QuerySetError(detail=f"The field '{path}' of aggregate {aggregate!r} must map to one column.")
+        table = model_class.table if forward_path else self.table
+        return forward_path, table.columns[columns[0].key]
+
+    def _build_annotation(self, name: str, aggregate: Aggregate) -> Any:
+        """
+        Builds the annotation as a correlated subquery, so the rows of the model are not multiplied
+        by the joins of the aggregate.
+        """
+        queryset: "QuerySet" = self._clone()
+        # the alias is joined like the table of the model
+        queryset.table = cast("sqlalchemy.Table", self.table.alias())
+        forward_path, column = queryset._resolve_aggregate_field(aggregate)
+        queryset._select_related = [forward_path] if forward_path else []
+        tables, select_from = queryset._build_tables_select_from_relationship()
+        if any(table.name == self.table.name for table in tables):
+            raise QuerySetError(detail=f"The annotation '{name}' cannot join back the table of {self.model_class.__name__}.")
+        correlation = [queryset.table.columns[pkcol] == self.table.columns[pkcol] for pkcol in self.model_class.pkcolumns]
+        return (
+            sqlalchemy.select(aggregate.as_sql(column))
+            .select_from(select_from)
+            .where(*correlation)
+            .scalar_subquery()
+            .label(name)
+        )
+
     def _prepare_group_by(self, group_by: str) -> Any:
         group_by = group_by.lstrip("-")
         group_col = self.table.columns[group_by]
@@ -446,13 +545,14 @@ class BaseQuerySet(
             schema = get_schema()
             if self.using_schema is None and schema is not None:
                 self.using_schema = schema
-            queryset.model_class.table = self.model_class.build(self.using_schema)
+            queryset.model_class.table = self.model_class.table_schema(self.using_schema)
 
         queryset.filter_clauses = copy.copy(self.filter_clauses)
         queryset.or_clauses = copy.copy(self.or_clauses)
         queryset.limit_count = copy.copy(self.limit_count)
         queryset._select_related = copy.copy(self._select_related)
         queryset._prefetch_related = copy.copy(self._prefetch_related)
+        queryset._load_related = copy.copy(self._load_related)
         queryset._offset = copy.copy(self._offset)
         queryset._order_by = copy.copy(self._order_by)
         queryset._group_by = copy.copy(self._group_by)
@@ -465,6 +565,9 @@ class BaseQuerySet(
         queryset.table = self.table
         queryset.extra = self.extra
         queryset._exclude_secrets = self._exclude_secrets
+        queryset._trusted_rows = self._trusted_rows
+        queryset._annotations = copy.copy(self._annotations)
+        queryset._cache = self._cache
         queryset.using_schema = self.using_schema
 
         return queryset
@@ -486,7 +589,16 @@ class QuerySet(BaseQuerySet, QuerySetProtocol):
     def sql(self, value: Any) -> None:
         self._expression = value
 
+    @property
+    def sync(self) -> SyncQuerySet:
+        """
+        Blocking facade of the queryset, e.g. `User.query.sync.filter(name="edgy").all()`.
+        """
+        return SyncQuerySet(self)
+
     async def __aiter__(self) -> AsyncIterator[EdgyModel]:
+        # the results are fetched at once, so queries inside of the loop are possible.
+        # iterate() streams them but keeps the connection busy
         for value in await self:
             yield value
 
@@ -678,6 +790,186 @@ class QuerySet(BaseQuerySet, QuerySetProtocol):
         queryset._defer = fields
         return queryset
 
+    def trusted_rows(self, trusted: bool = True) -> "QuerySet":
+        """
+        Builds the models from the database rows without the pydantic validation.
+
+        Defaults to the `trusted_rows` of the registry.
+        """
+        queryset: "QuerySet" = self._clone()
+        queryset._trusted_rows = trusted
+        return queryset
+
+    def annotate(self, **annotations: Aggregate) -> "QuerySet":
+        """
+        Adds the given aggregates as extra attributes to the resulting models.
+
+        The aggregates are computed in the database per model, for example the number of tracks
+        of every album with `annotate(n_tracks=Count("tracks"))`.
+        """
+        queryset: "QuerySet" = self._clone()
+        for name, aggregate in annotations.items():
+            if not isinstance(aggregate, Aggregate):
+                raise QuerySetError(detail=f"The annotation '{name}' must be an Aggregate, got {aggregate!r}.")
+            if name in queryset.model_class.meta.fields_mapping:
+                raise QuerySetError(detail=f"The annotation '{name}' conflicts with a field of {queryset.model_class.__name__}.")
+            # validates the field path early
+            queryset._build_annotation(name, aggregate)
+        queryset._annotations = {**queryset._annotations, **annotations}
+        return queryset
+
+    def cache(self, ttl: Optional[float] = None) -> "QuerySet":
+        """
+        Caches the results of the queryset for ttl seconds in the cache of the registry.
+
+        Without ttl the results are cached until a model or queryset writes to one of the tables
+        of the query.
+        """
+        queryset: "QuerySet" = self._clone()
+        queryset._cache = True if ttl is None else ttl
+        return queryset
+
+    def no_cache(self) -> "QuerySet":
+        """
+        Disables the caching of the results, also the caching enabled via `Meta.cache`.
+        """
+        queryset: "QuerySet" = self._clone()
+        queryset._cache = False
+        return queryset
+
+    def _get_cache_ttl(self) -> Union[bool, float]:
+        """
+        Returns False when the results are not cached, True when cached without expiry or else
+        the ttl.
+        """
+        cache = self._cache if self._cache is not None else self.model_class.meta.cache
+        return cache or False
+
+    async def _execute_query(self, method: str, expression: Any, operation: str, rowcount: bool = False) -> Any:
+        """
+        Runs `database.<method>(expression)` for the operation, observed by the execute hooks
+        of the registry and track_queries.
+        """
+        return await execute_query(
+            self.database, method, expression, self.model_class, operation, rowcount=rowcount
+        )
+
+    async def _fetch_all(self, expression: Any, operation: str) -> Sequence[Any]:
+        """
+        Fetches the rows of the expression, via the query cache when enabled.
+        """
+        cache_ttl = self._get_cache_ttl()
+        if cache_ttl is False:
+            return cast(Sequence[Any], await self._execute_query("fetch_all", expression, operation))
+        backend = self.model_class.meta.registry.cache
+        key = build_cache_key(expression, self.using_schema, self.database)
+        rows = await backend.get(key)
+        if rows is None:
+            rows = CachedRow.from_rows(await self._execute_query("fetch_all", expression, operation))
+            await backend.set(
+                key, rows, ttl=None if cache_ttl is True else cache_ttl, tables=get_expression_tables(expression)
+            )
+        return cast(Sequence[Any], rows)
+
+    async def _invalidate_cache(self) -> None:
+        """
+        Removes the cached results and rows of the table, used by the writes not sending signals.
+        """
+        registry = self.model_class.meta.registry
+        registry.pk_cache.invalidate(self.table.name)
+        registry.full_table_cache.invalidate(self.table.name)
+        await registry.cache.invalidate([self.table.name])
+
+    def _get_pk_cache_key(self, kwargs: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+        """
+        Returns the primary key values of the lookup when it can be answered by the pk cache:
+        the model uses `Meta.pk_cache`, the kwargs are exactly the primary key and the queryset
+        is otherwise plain.
+        """
+        if not self.model_class.meta.pk_cache:
+            return None
+        if (
+            self.filter_clauses
+            or self.or_clauses
+            or self.extra
+            or self._select_related
+            or self._prefetch_related
+            or self._load_related
+            or self._only
+            or self._defer
+            or self._exclude_secrets
+            or self._annotations
+            or self.embed_parent
+        ):
+            return None
+        kwargs = clean_query_kwargs(self.model_class, kwargs)
+        pkcolumns = self.pkcolumns
+        if set(kwargs.keys()) != set(pkcolumns):
+            return None
+        key = tuple(kwargs[pkcolumn] for pkcolumn in pkcolumns)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    async def _get_by_pk(self, key: Tuple[Any, ...]) -> EdgyModel:
+        """
+        Returns the model with the primary key values from the pk cache or else from the database.
+        """
+        pk_cache = self.model_class.meta.registry.pk_cache
+        table = self.table
+        row = pk_cache.get(self.database, table, key)
+        if row is None:
+            expression = table.select().where(
+                *(table.columns[pkcolumn] == value for pkcolumn, value in zip(self.pkcolumns, key))
+            )
+            self._set_query_expression(expression)
+            rows = await self._execute_query("fetch_all", expression, "get")
+            if not rows:
+                raise ObjectNotFound()
+            row = CachedRow.from_rows(rows)[0]
+            pk_cache.set(self.database, table, key, row)
+        return self._hydrate_returning([row])[0]
+
+    async def _get_cached_table_rows(self) -> Optional[List[CachedRow]]:
+        """
+        Returns the rows matching the filters from the complete table kept in memory, when the
+        model uses `Meta.cache_full_table` and the queryset only filters by the equality or `IN`
+        of columns. Otherwise None is returned and the database is queried.
+        """
+        if not self.model_class.meta.cache_full_table or self._cache is False:
+            return None
+        if (
+            self.or_clauses
+            or self.extra
+            or self.limit_count
+            or self._offset
+            or self._order_by
+            or self._group_by
+            or self.distinct_on is not None
+            or self._select_related
+            or self._only
+            or self._defer
+            or self._exclude_secrets
+            or self._annotations
+            or self.embed_parent
+        ):
+            return None
+        table = self.table
+        # filters on other tables or unsupported operators are answered by the database
+        if filter_cached_rows([], self.filter_clauses, table) is None:
+            return None
+        cached_table = await self.model_class.meta.registry.full_table_cache.load(
+            self.model_class, self.database, table
+        )
+        return filter_cached_rows(cached_table.rows, self.filter_clauses, table)
+
+    def _is_trusted_rows(self) -> bool:
+        if self._trusted_rows is not None:
+            return self._trusted_rows
+        return bool(self.model_class.meta.registry.trusted_rows)
+
     def select_related(self, related: Any) -> "QuerySet":
         """
         Returns a QuerySet that will “follow” foreign-key relationships, selecting additional
@@ -695,6 +987,79 @@ class QuerySet(BaseQuerySet, QuerySetProtocol):
         queryset._select_related = related
         return queryset
 
+    def _build_values_select(self, fields: Sequence[str]) -> Any:
+        """
+        Builds a select of only the columns of the given fields, used by values() and values_list().
+
+        The related paths like `author__name` missing in select_related() are outer joined, the
+        joins of select_related() keep their join type. When a field does not map onto exactly
+        one column (relationships, composite fields...), None is returned and the values are
+        extracted from the models instead.
+        """
+        if self._only or self._defer or self.embed_parent or self._prefetch_related:
+            return None
+
+        queryset: "QuerySet" = self._clone()
+        select_related = list(queryset._select_related)
+        outer_paths: Set[str] = set()
+        columns = []
+        for field_path in fields:
+            if field_path in queryset._annotations:
+                columns.append(queryset._build_annotation(field_path, queryset._annotations[field_path]))
+                continue
+            try:
+                model_class, field_name, _, forward_path, _ = crawl_relationship(queryset.model_class, field_path)
+            except ValueError:
+                return None
+            if (f"{forward_path}__{field_name}" if forward_path else field_name) != field_path:
+                return None
+
+            field = model_class.meta.fields_mapping.get(field_name)
+            if field is None or isinstance(field, RelationshipField):
+                return None
+            if queryset._exclude_secrets and field.secret:
+                return None
+            field_columns = field.get_columns(field_name)
+            if len(field_columns) != 1:
+                return None
+
+            if forward_path and forward_path not in select_related:
+                select_related.append(forward_path)
+                outer_paths.add(forward_path)
+            table = model_class.table if forward_path else queryset.table
+            columns.append(table.columns[field_columns[0].key].label(field_path))
+
+        queryset._select_related = select_related
+        # the added paths are outer joined, the rows with empty foreign keys have None values
+        return queryset._build_select(outer_paths=outer_paths).with_only_columns(*columns)
+
+    @staticmethod
+    def _extract_values(
+        records: Sequence[Any],
+        selected: Sequence[str],
+        fields: Sequence[str],
+        exclude_none: bool = False,
+        as_tuple: bool = False,
+        flatten: bool = False,
+    ) -> List[Any]:
+        """
+        Extracts the values of the records returned by a select of _build_values_select.
+        """
+        positions = range(len(selected))
+        if flatten:
+            if fields[0] not in selected:
+                raise QuerySetError(detail=f"{fields[0]} does not exist in the results.")
+            return [record[0] for record in records]
+        if as_tuple:
+            if exclude_none:
+                return [tuple(record[i] for i in positions if record[i] is not None) for record in records]
+            return [tuple(record[i] for i in positions) for record in records]
+        if exclude_none:
+            return [
+                {selected[i]: record[i] for i in positions if record[i] is not None} for record in records
+            ]
+        return [{selected[i]: record[i] for i in positions} for record in records]
+
     async def values(
         self,
         fields: Union[Sequence[str], str, None] = None,
@@ -708,18 +1073,29 @@ class QuerySet(BaseQuerySet, QuerySetProtocol):
         """
         fields = fields or []
         queryset: "QuerySet" = self._clone()
-        rows: List["Model"] = await queryset.all()
 
         if not isinstance(fields, list):
             raise QuerySetError(detail="Fields must be an iterable.")
 
+        as_tuple = kwargs.pop("__as_tuple__", False)
+
+        if fields:
+            selected = [field for field in fields if not exclude or field not in exclude]
+            expression = queryset._build_values_select(selected) if selected else None
+            if expression is not None:
+                queryset._set_query_expression(expression)
+                records = await queryset._fetch_all(expression, "values")
+                return queryset._extract_values(
+                    records, selected, fields, exclude_none=exclude_none, as_tuple=as_tuple, flatten=flatten
+                )
+
+        rows: List["Model"] = await queryset.all()
+
         if not fields:
             rows = [row.model_dump(exclude=exclude, exclude_none=exclude_none) for row in rows]
         else:
             rows = [row.model_dump(exclude=exclude, exclude_none=exclude_none, include=fields) for row in rows]
 
-        as_tuple = kwargs.pop("__as_tuple__", False)
-
         if not as_tuple:
             return rows
 
@@ -771,39 +1147,229 @@ class QuerySet(BaseQuerySet, QuerySetProtocol):
         expression = queryset._build_select()
         expression = sqlalchemy.exists(expression).select()
         queryset._set_query_expression(expression)
-        _exists = await queryset.database.fetch_val(expression)
+        _exists = await queryset._execute_query("fetch_val", expression, "exists")
         return cast("bool", _exists)
 
     async def count(self, **kwargs: Any) -> int:
         """
         Returns an indicating the total records.
+
+        Only querysets with distinct, limit, offset or group_by are counted via a subquery,
+        otherwise a plain `SELECT count(*)` over the joined tables is used.
         """
         queryset: "QuerySet" = self._clone()
-        expression = queryset._build_select().alias("subquery_for_count")
-        expression = sqlalchemy.func.count().select().select_from(expression)
+        if kwargs:
+            queryset = queryset.filter(**kwargs)
+        if queryset.extra:
+            queryset = queryset.filter(**queryset.extra)
+
+        if (
+            queryset.distinct_on is not None
+            or queryset.limit_count
+            or queryset._offset
+            or queryset._group_by
+        ):
+            expression = queryset._build_select().alias("subquery_for_count")
+            expression = sqlalchemy.func.count().select().select_from(expression)
+        else:
+            _, select_from = queryset._build_tables_select_from_relationship()
+            expression = sqlalchemy.func.count().select().select_from(select_from)
+            if queryset.filter_clauses:
+                expression = queryset._build_filter_clauses_expression(
+                    queryset.filter_clauses, expression=expression
+                )
+            if queryset.or_clauses:
+                expression = queryset._build_or_clauses_expression(queryset.or_clauses, expression=expression)
         queryset._set_query_expression(expression)
-        _count = await queryset.database.fetch_val(expression)
+        _count = await queryset._execute_query("fetch_val", expression, "count")
         return cast("int", _count)
 
+    async def estimated_count(self) -> int:
+        """
+        Returns an estimation of the total records of the table read from the statistics of the
+        database (`pg_class.reltuples` on Postgres, `information_schema.tables` on MySQL).
+
+        The statistics are only usable for the whole table, filtered querysets, dialects without
+        statistics and tables which were never analyzed are counted exactly via count().
+        """
+        queryset: "QuerySet" = self._clone()
+        if (
+            queryset.filter_clauses
+            or queryset.or_clauses
+            or queryset.extra
+            or queryset.limit_count
+            or queryset._offset
+            or queryset.distinct_on is not None
+            or queryset._group_by
+        ):
+            return await queryset.count()
+
+        table = queryset.table
+        dialect = queryset.database.url.dialect
+        expression: Any = None
+        if dialect in settings.postgres_dialects:
+            expression = sqlalchemy.text(
+                "SELECT c.reltuples FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace"
+                " WHERE n.nspname = COALESCE(:schema, current_schema()) AND c.relname = :name"
+            ).bindparams(schema=table.schema, name=table.name)
+        elif dialect in settings.mysql_dialects:
+            expression = sqlalchemy.text(
+                "SELECT table_rows FROM information_schema.tables"
+                " WHERE table_schema = COALESCE(:schema, DATABASE()) AND table_name = :name"
+            ).bindparams(schema=table.schema, name=table.name)
+
+        if expression is not None:
+            queryset._set_query_expression(expression)
+            estimate = await queryset._execute_query("fetch_val", expression, "estimated_count")
+            # never analyzed tables have no (Postgres < 14: zero, else -1) estimation
+            if estimate is not None and estimate > 0:
+                return int(estimate)
+        return await queryset.count()
+
+    async def aggregate(self, **aggregates: Aggregate) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Computes the given aggregates over the records of the queryset in the database.
+
+        Returns a dictionary with the results. When the queryset is grouped via `group_by()`,
+        a dictionary with the values of the group_by fields and the results is returned per group.
+        """
+        if not aggregates:
+            raise QuerySetError(detail="aggregate() requires at least one aggregate.")
+
+        queryset: "QuerySet" = self._clone()
+        if queryset.extra:
+            queryset = queryset.filter(**queryset.extra)
+
+        columns = {}
+        for name, aggregate in aggregates.items():
+            if not isinstance(aggregate, Aggregate):
+                raise QuerySetError(detail=f"The aggregate '{name}' must be an Aggregate, got {aggregate!r}.")
+            forward_path, column = queryset._resolve_aggregate_field(aggregate)
+            if forward_path and forward_path not in queryset._select_related:
+                queryset._select_related = [*queryset._select_related, forward_path]
+            columns[name] = column
+
+        expression = queryset._build_select()
+        group_columns = [queryset._prepare_group_by(group_by).label(group_by.lstrip("-")) for group_by in queryset._group_by]
+        if not group_columns and (queryset.limit_count or queryset._offset or queryset.distinct_on is not None):
+            # aggregate over the limited or distinct records
+            subquery = expression.with_only_columns(
+                *(column.label(f"_{name}") for name, column in columns.items())
+            ).subquery("subquery_for_aggregate")
+            expression = sqlalchemy.select(
+                *(aggregates[name].as_sql(subquery.columns[f"_{name}"]).label(name) for name in columns)
+            )
+        else:
+            if not group_columns:
+                expression = expression.order_by(None)
+            expression = expression.with_only_columns(
+                *group_columns,
+                *(aggregates[name].as_sql(column).label(name) for name, column in columns.items()),
+            )
+        queryset._set_query_expression(expression)
+        rows = await queryset._execute_query("fetch_all", expression, "aggregate")
+
+        if group_columns:
+            return [dict(row._mapping) for row in rows]
+        return dict(rows[0]._mapping)
+
+    async def paginate_after(
+        self,
+        cursor: Optional[str] = None,
+        order_by: Union[Sequence[str], str, None] = None,
+        page_size: int = 100,
+    ) -> Tuple[List[EdgyModel], Optional[str]]:
+        """
+        Returns a page of records after the cursor and the cursor of the next page (keyset pagination).
+
+        Instead of skipping rows with an offset, the rows after the sort keys of the last row of
+        the previous page are selected, so every page is fetched in constant time.
+        The primary key columns are appended to the order for making it unique.
+        The next cursor is None when there are no more records.
+        """
+        if page_size < 1:
+            raise QuerySetError(detail="page_size must be a positive integer.")
+
+        queryset: "QuerySet" = self._clone()
+        if queryset.extra:
+            queryset = queryset.filter(**queryset.extra)
+        if queryset.limit_count or queryset._offset:
+            raise QuerySetError(detail="paginate_after cannot be combined with limit or offset.")
+        if queryset.embed_parent:
+            # activates distinct, not distinct on
+            queryset.distinct_on = []
+
+        if isinstance(order_by, str):
+            order_by = [order_by]
+        order_keys = list(order_by or queryset._order_by or queryset.model_class.pkcolumns)
+        descending = order_keys[0].startswith("-")
+        sorted_columns = {key.lstrip("-") for key in order_keys}
+        for pkcolumn in queryset.model_class.pkcolumns:
+            if pkcolumn not in sorted_columns:
+                order_keys.append(f"-{pkcolumn}" if descending else pkcolumn)
+
+        order = []
+        for key in order_keys:
+            column = queryset.table.columns.get(key.lstrip("-"))
+            if column is None:
+                raise QuerySetError(detail=f"Invalid column '{key}' for paginate_after.")
+            order.append((column, key.startswith("-")))
+
+        if cursor is not None:
+            values = decode_cursor(cursor, order_keys, [column for column, _ in order])
+            queryset = queryset.filter(build_keyset_clause(order, values))
+        queryset._order_by = order_keys
+        queryset.limit_count = page_size + 1
+
+        expression = queryset._build_select()
+        queryset._set_query_expression(expression)
+        rows = await queryset._execute_query("fetch_all", expression, "paginate_after")
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            selected_columns = list(expression.selected_columns)
+            positions = []
+            for column, _ in order:
+                position = next((index for index, selected in enumerate(selected_columns) if selected is column), None)
+                if position is None:
+                    raise QuerySetError(detail=f"The column '{column.name}' of the order must be selected.")
+                positions.append(position)
+            next_cursor = encode_cursor(order_keys, [rows[-1][position] for position in positions])
+
+        results = queryset._hydrate_rows(rows, expression)
+        if queryset._prefetch_related:
+            await queryset._prefetch_related_objects(results)
+        if queryset._load_related:
+            await load_all(results, *queryset._load_related)
+        return [queryset.embed_parent_in_result(result) for result in results], next_cursor
+
     async def get_or_none(self, **kwargs: Any) -> Union[EdgyModel, None]:
         """
         Fetch one object matching the parameters or returns None.
         """
+        key = self._get_pk_cache_key(kwargs) if kwargs else None
+        if key is not None:
+            try:
+                return await self._clone()._get_by_pk(key)
+            except ObjectNotFound:
+                return None
         queryset: "QuerySet" = self.filter(**kwargs)
+        cached_rows = await queryset._get_cached_table_rows()
+        if cached_rows is not None:
+            if len(cached_rows) > 1:
+                raise MultipleObjectsReturned()
+            return queryset._hydrate_returning(cached_rows)[0] if cached_rows else None
+
         expression = queryset._build_select().limit(2)
         queryset._set_query_expression(expression)
-        rows = await queryset.database.fetch_all(expression)
+        rows = await queryset._fetch_all(expression, "get_or_none")
 
         if not rows:
             return None
         if len(rows) > 1:
             raise MultipleObjectsReturned()
-        return queryset.model_class.from_sqla_row(
-            rows[0],
-            select_related=queryset._select_related,
-            exclude_secrets=queryset._exclude_secrets,
-            using_schema=queryset.using_schema,
-        )
+        return queryset._hydrate_rows(rows, expression)[0]
 
     def embed_parent_in_result(self, result: Any) -> Any:
         if not self.embed_parent:
@@ -813,6 +1379,73 @@ class QuerySet(BaseQuerySet, QuerySetProtocol):
             setattr(new_result, self.embed_parent[1], result)
         return new_result
 
+    def _hydrate_rows(self, rows: Sequence[Any], expression: Any = None) -> List[EdgyModel]:
+        """
+        Converts the raw database rows into models using the cached hydration plan of the
+        query shape. Passing the expression of the rows allows extracting the values by position.
+
+        The prefetch_related and embed_parent are not applied yet.
+        """
+        plan = self.model_class.get_hydration_plan(
+            select_related=self._select_related,
+            only_fields=self._only if self._only else None,
+            is_defer_fields=True if self._defer else False,
+            exclude_secrets=self._exclude_secrets,
+        )
+        selected_columns = expression.selected_columns if expression is not None else None
+        if selected_columns is not None and self._annotations:
+            # the annotations are the last columns
+            selected_columns = list(selected_columns)[: -len(self._annotations)]
+        results = plan.hydrate_rows(
+            rows,
+            selected_columns=selected_columns,
+            using_schema=self.using_schema,
+            trusted=self._is_trusted_rows(),
+        )
+        if self._annotations:
+            for row, result in zip(rows, results):
+                mapping = row._mapping
+                for name in self._annotations:
+                    setattr(result, name, mapping[name])
+        return cast(List[EdgyModel], results)
+
+    async def iterate(self, chunk_size: int = 100) -> AsyncIterator[EdgyModel]:
+        """
+        Streams the records of the queryset using a server side cursor.
+
+        The rows are fetched and hydrated in chunks of `chunk_size`, so the memory usage
+        stays flat no matter how big the result is.
+
+        The connection is busy while iterating. Do not issue further queries on the same
+        connection inside of the loop.
+        """
+        if chunk_size < 1:
+            raise QuerySetError(detail="chunk_size must be a positive integer.")
+
+        queryset: "QuerySet" = self._clone()
+        if queryset._prefetch_related:
+            raise QuerySetError(detail="prefetch_related is not supported when iterating. Use all() instead.")
+        if queryset._load_related:
+            raise QuerySetError(detail="load_related is not supported when iterating. Use all() instead.")
+        if queryset.extra:
+            queryset = queryset.filter(**queryset.extra)
+        if queryset.embed_parent:
+            # activates distinct, not distinct on
+            queryset.distinct_on = []
+
+        expression = queryset._build_select()
+        queryset._set_query_expression(expression)
+
+        chunk: List[Any] = []
+        async for row in iterate_query(queryset.database, expression, queryset.model_class, "iterate"):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                for result in queryset._hydrate_rows(chunk, expression):
+                    yield queryset.embed_parent_in_result(result)
+                chunk = []
+        for result in queryset._hydrate_rows(chunk, expression):
+            yield queryset.embed_parent_in_result(result)
+
     async def _all(self, **kwargs: Any) -> List[EdgyModel]:
         """
         Executes the query.
@@ -825,33 +1458,24 @@ class QuerySet(BaseQuerySet, QuerySetProtocol):
         if kwargs:
             return await queryset.filter(**kwargs).all()
 
-        expression = queryset._build_select()
-        queryset._set_query_expression(expression)
-
-        rows = await queryset.database.fetch_all(expression)
+        cached_rows = await queryset._get_cached_table_rows()
+        if cached_rows is not None:
+            results = queryset._hydrate_returning(cached_rows)
+        else:
+            expression = queryset._build_select()
+            queryset._set_query_expression(expression)
 
-        # Attach the raw query to the object
-        queryset.model_class.raw_query = queryset.sql
+            rows = await queryset._fetch_all(expression, "all")
 
-        is_only_fields = True if queryset._only else False
-        is_defer_fields = True if queryset._defer else False
+            # Attach the raw query to the object
+            queryset.model_class.raw_query = queryset.sql
 
-        results = [
-            queryset.model_class.from_sqla_row(
-                row,
-                select_related=queryset._select_related,
-                prefetch_related=queryset._prefetch_related,
-                is_only_fields=is_only_fields,
-                only_fields=queryset._only,
-                is_defer_fields=is_defer_fields,
-                exclude_secrets=queryset._exclude_secrets,
-                using_schema=queryset.using_schema,
-            )
-            for row in rows
-        ]
-
-        all_results = [self.embed_parent_in_result(result) for result in results]
-        return all_results
+            results = queryset._hydrate_rows(rows, expression)
+        if queryset._prefetch_related:
+            await queryset._prefetch_related_objects(results)
+        if queryset._load_related:
+            await load_all(results, *queryset._load_related)
+        return [queryset.embed_parent_in_result(result) for result in results]
 
     def all(self, **kwargs: Any) -> "QuerySet":
         """
@@ -868,56 +1492,85 @@ class QuerySet(BaseQuerySet, QuerySetProtocol):
         queryset: "QuerySet" = self._clone()
 
         if kwargs:
+            key = queryset._get_pk_cache_key(kwargs)
+            if key is not None:
+                return await queryset._get_by_pk(key)
             return await queryset.filter(**kwargs).get()
 
-        expression = queryset._build_select().limit(2)
-        rows = await queryset.database.fetch_all(expression)
-        queryset._set_query_expression(expression)
-
-        is_only_fields = True if queryset._only else False
-        is_defer_fields = True if queryset._defer else False
+        cached_rows = await queryset._get_cached_table_rows()
+        if cached_rows is not None:
+            if not cached_rows:
+                raise ObjectNotFound()
+            if len(cached_rows) > 1:
+                raise MultipleObjectsReturned()
+            result = queryset._hydrate_returning(cached_rows)[0]
+        else:
+            expression = queryset._build_select().limit(2)
+            rows = await queryset._fetch_all(expression, "get")
+            queryset._set_query_expression(expression)
 
-        if not rows:
-            raise ObjectNotFound()
-        if len(rows) > 1:
-            raise MultipleObjectsReturned()
+            if not rows:
+                raise ObjectNotFound()
+            if len(rows) > 1:
+                raise MultipleObjectsReturned()
 
-        return self.embed_parent_in_result(queryset.model_class.from_sqla_row(
-            rows[0],
-            select_related=queryset._select_related,
-            is_only_fields=is_only_fields,
-            only_fields=queryset._only,
-            is_defer_fields=is_defer_fields,
-            prefetch_related=queryset._prefetch_related,
-            exclude_secrets=queryset._exclude_secrets,
-            using_schema=queryset.using_schema,
-        ))
+            result = queryset._hydrate_rows(rows, expression)[0]
+        if queryset._prefetch_related:
+            await queryset._prefetch_related_objects([result])
+        if queryset._load_related:
+            await load_all([result], *queryset._load_related)
+        return self.embed_parent_in_result(result)
 
-    async def first(self, **kwargs: Any) -> Union[EdgyModel, None]:
+    async def _first_or_last(self, last: bool, **kwargs: Any) -> Union[EdgyModel, None]:
         """
-        Returns the first record of a given queryset.
+        Fetches a single record with `LIMIT 1` ordered by the order of the queryset or else
+        by the primary key. For the last record the order is reversed.
+
+        The limit and offset of the queryset are kept, the record is taken from their window.
+
+        With lookups the record is fetched like `get()` does, raising `ObjectNotFound` or
+        `MultipleObjectsReturned` when not exactly one record matches.
         """
         queryset: "QuerySet" = self._clone()
         if kwargs:
-            return await queryset.filter(**kwargs).order_by("id").get()
+            return await queryset.get(**kwargs)
+        if queryset.extra:
+            queryset = queryset.filter(**queryset.extra)
+
+        queryset._order_by = queryset._order_by or tuple(queryset.pkcolumns)
+        if last and queryset.limit_count:
+            # the last record of the window
+            rows = await queryset._all()
+            return rows[-1] if rows else None
+        if last and queryset._offset:
+            # the last record is in the window when the window isn't empty
+            window: "QuerySet" = queryset._clone()
+            window.limit_count = 1
+            if not await window._all():
+                return None
+            queryset._offset = None
+        if last:
+            queryset._order_by = tuple(
+                value[1:] if value.startswith("-") else f"-{value}" for value in queryset._order_by
+            )
+        queryset.limit_count = 1
 
-        rows = await queryset.limit(1).order_by("id").all()
+        rows = await queryset._all()
         if rows:
-            return self.embed_parent_in_result(rows[0])
+            return rows[0]
         return None
 
+    async def first(self, **kwargs: Any) -> Union[EdgyModel, None]:
+        """
+        Returns the first record of a given queryset.
+        """
+        return await self._first_or_last(False, **kwargs)
+
     async def last(self, **kwargs: Any) -> Union[EdgyModel, None]:
         """
         Returns the last record of a given queryset.
         """
-        queryset: "QuerySet" = self._clone()
-        if kwargs:
-            return await queryset.filter(**kwargs).order_by("-id").get()
-
-        rows = await queryset.order_by("-id").all()
-        if rows:
-            return self.embed_parent_in_result(rows[0])
-        return None
+        return await self._first_or_last(True, **kwargs)
 
     async def create(self, **kwargs: Any) -> EdgyModel:
         """
@@ -929,68 +1582,345 @@ class QuerySet(BaseQuerySet, QuerySetProtocol):
         instance = await instance.save(force_save=True)
         return self.embed_parent_in_result(instance)
 
-    async def bulk_create(self, objs: List[Dict]) -> None:
+    def _get_batch_size(self, parameters_per_row: int, batch_size: Optional[int] = None) -> int:
+        """
+        Returns the maximum of rows per statement fitting into the bind parameter limit of the dialect.
+        """
+        limit = settings.bind_parameter_limits.get(self.database.url.dialect, settings.default_bind_parameter_limit)
+        max_batch_size: int = max(int(limit) // max(parameters_per_row, 1), 1)
+        if batch_size is None:
+            return max_batch_size
+        if batch_size < 1:
+            raise QuerySetError(detail="batch_size must be a positive integer.")
+        return min(batch_size, max_batch_size)
+
+    async def bulk_create(
+        self, objs: List[Dict], batch_size: Optional[int] = None, returning: bool = True
+    ) -> Union[List[EdgyModel], None]:
         """
-        Bulk creates records in a table
+        Bulk creates records in a table.
+
+        The records are inserted in batches fitting into the bind parameter limit of the dialect.
+        When returning is set, the created models are returned. They are built from the
+        rows returned by `INSERT ... RETURNING` where supported, so they contain the generated
+        primary keys.
         """
         queryset: "QuerySet" = self._clone()
         new_objs = [queryset._validate_kwargs(**obj) for obj in objs]
+        if not new_objs:
+            return [] if returning else None
+
+        table = queryset.table
+        batch_size = queryset._get_batch_size(len(table.columns), batch_size)
+        use_returning = returning and queryset.database.url.dialect in settings.returning_dialects
+        rows: List[Any] = []
+        async with queryset.database.transaction():
+            for index in range(0, len(new_objs), batch_size):
+                expression = table.insert().values(new_objs[index : index + batch_size])
+                if use_returning:
+                    expression = expression.returning(*table.columns)
+                queryset._set_query_expression(expression)
+                if use_returning:
+                    rows.extend(await queryset._execute_query("fetch_all", expression, "bulk_create"))
+                else:
+                    await queryset._execute_query("execute", expression, "bulk_create")
+        await queryset._invalidate_cache()
 
-        expression = queryset.table.insert().values(new_objs)
-        queryset._set_query_expression(expression)
-        await queryset.database.execute(expression)
+        if not returning:
+            return None
+        if not use_returning:
+            # without RETURNING the models are built from the inserted values, the generated
+            # primary keys are unknown
+            rows = [tuple(obj.get(column.key) for column in table.columns) for obj in new_objs]
+        return queryset._hydrate_returning(rows)
 
-    async def bulk_update(self, objs: List[EdgyModel], fields: List[str]) -> None:
+    def _hydrate_returning(self, rows: Sequence[Any]) -> List[EdgyModel]:
         """
-        Bulk updates records in a table.
+        Builds the models of rows with all the columns of the table, like the ones returned by
+        `RETURNING`.
+        """
+        plan = self.model_class.get_hydration_plan()
+        return cast(
+            List[EdgyModel],
+            plan.hydrate_rows(
+                rows,
+                selected_columns=list(self.table.columns),
+                using_schema=self.using_schema,
+                trusted=self._is_trusted_rows(),
+            ),
+        )
+
+    def _fields_to_columns(self, fields: Sequence[str]) -> List[str]:
+        """
+        Returns the keys of the columns of the given fields.
+        """
+        meta = self.model_class.meta
+        columns: List[str] = []
+        for field_name in fields:
+            field_columns = meta.field_to_columns[field_name] if field_name in meta.fields_mapping else ()
+            if not field_columns:
+                raise QuerySetError(detail=f"{field_name} is not a field with columns of {self.model_class.__name__}.")
+            columns.extend(column.key for column in field_columns if column.key not in columns)
+        return columns
 
-        A similar solution was suggested here: https://github.com/encode/orm/pull/148
+    async def bulk_upsert(
+        self,
+        objs: List[Dict],
+        conflict_fields: Optional[Sequence[str]] = None,
+        update_fields: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None,
+        returning: bool = True,
+    ) -> Union[List[EdgyModel], None]:
+        """
+        Inserts the records or updates the existing records conflicting on the conflict_fields
+        with one statement per batch (`ON CONFLICT ... DO UPDATE` or `ON DUPLICATE KEY UPDATE`).
 
-        It is thought to be a clean approach to a simple problem so it was added here and
-        refactored to be compatible with Edgy.
+        The conflict_fields default to the primary key and must match a unique constraint.
+        The update_fields default to the given fields which are not conflict fields.
+        When returning is set, the inserted and updated models are returned.
         """
         queryset: "QuerySet" = self._clone()
+        dialect = queryset.database.url.dialect
+        if not supports_upsert(dialect):
+            raise QuerySetError(detail=f"bulk_upsert is not supported by {dialect}.")
+
+        conflict_columns = queryset._fields_to_columns(conflict_fields or queryset.model_class.pknames)
+        if update_fields is None:
+            given_fields = {field_name for obj in objs for field_name in obj}
+            update_fields = [
+                field_name for field_name in queryset.model_class.meta.fields_mapping if field_name in given_fields
+            ]
+            update_columns = [
+                column for column in queryset._fields_to_columns(update_fields) if column not in conflict_columns
+            ]
+        else:
+            update_columns = queryset._fields_to_columns(update_fields)
 
-        new_objs = []
-        for obj in objs:
-            new_obj = {}
-            for key, value in obj.__dict__.items():
-                if key in fields:
-                    new_obj[key] = self._resolve_value(value)
-            new_objs.append(new_obj)
+        new_objs = [queryset._validate_kwargs(**obj) for obj in objs]
+        if not new_objs:
+            return [] if returning else None
+
+        table = queryset.table
+        batch_size = queryset._get_batch_size(len(table.columns), batch_size)
+        use_returning = returning and supports_on_conflict(dialect)
+        rows: List[Any] = []
+        async with queryset.database.transaction():
+            for index in range(0, len(new_objs), batch_size):
+                expression = build_upsert(
+                    dialect, table, new_objs[index : index + batch_size], conflict_columns, update_columns
+                )
+                if use_returning:
+                    expression = expression.returning(*table.columns)
+                queryset._set_query_expression(expression)
+                if use_returning:
+                    rows.extend(await queryset._execute_query("fetch_all", expression, "bulk_upsert"))
+                else:
+                    await queryset._execute_query("execute", expression, "bulk_upsert")
+        await queryset._invalidate_cache()
 
-        new_objs = [queryset._extract_values_from_field(obj, queryset.model_class) for obj in new_objs]
+        if not returning:
+            return None
+        if not use_returning:
+            # fetch the records by their conflict keys
+            keys = [tuple(obj[column] for column in conflict_columns) for obj in new_objs]
+            columns = [table.columns[column] for column in conflict_columns]
+            positions = [list(table.columns).index(column) for column in columns]
+            fetched: Dict[Tuple[Any, ...], Any] = {}
+            for index in range(0, len(keys), batch_size):
+                chunk = keys[index : index + batch_size]
+                if len(columns) == 1:
+                    clause = columns[0].in_([key[0] for key in chunk])
+                else:
+                    clause = sqlalchemy.tuple_(*columns).in_(chunk)
+                for row in await queryset._execute_query(
+                    "fetch_all", table.select().where(clause), "bulk_upsert"
+                ):
+                    fetched[tuple(row[position] for position in positions)] = row
+            rows = [fetched[key] for key in keys if key in fetched]
+        return queryset._hydrate_returning(rows)
 
-        pks1 = (getattr(queryset.table.c, pkcol) == sqlalchemy.bindparam(pkcol) for pkcol in queryset.pkcolumns)
-        expression = queryset.table.update().where(*pks1)
-        kwargs: Dict[Any, Any] = {field: sqlalchemy.bindparam(field) for obj in new_objs for field in obj.keys()}
-        pks2 = [{pkcol: getattr(obj, pkcol) for pkcol in queryset.pkcolumns} for obj in objs]
+    async def bulk_update(self, objs: List[EdgyModel], fields: List[str], batch_size: Optional[int] = None) -> int:
+        """
+        Bulk updates records in a table.
 
-        query_list = []
-        for pk, value in zip(pks2, new_objs):  # noqa
-            query_list.append({**pk, **value})
+        The values of the fields are cleaned like for a save and sent with one statement per batch:
+        an `UPDATE ... FROM (VALUES ...)` on Postgres, an `UPDATE ... SET field = CASE ...` elsewhere.
+        The `auto_now` fields are updated too.
 
-        expression = expression.values(kwargs)
-        queryset._set_query_expression(expression)
-        await queryset.database.execute_many(str(expression), query_list)
+        Returns the number of updated rows.
+        """
+        queryset: "QuerySet" = self._clone()
+        if not objs:
+            return 0
+
+        model_class = queryset.model_class
+        rows = []
+        for obj in objs:
+            values = queryset._extract_values_from_field(
+                {field_name: getattr(obj, field_name) for field_name in fields},
+                model_class=model_class,
+                is_update=True,
+                is_partial=True,
+            )
+            values = queryset._update_auto_now_fields(values, model_class.fields)
+            for pkcolumn in queryset.pkcolumns:
+                values[pkcolumn] = getattr(obj, pkcolumn)
+            rows.append(values)
+
+        pkcolumns = list(queryset.pkcolumns)
+        # the rows are updated together with the rows having the same columns
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for values in rows:
+            update_columns = tuple(key for key in values if key not in pkcolumns)
+            if update_columns:
+                groups.setdefault(update_columns, []).append(values)
+
+        dialect = queryset.database.url.dialect
+        use_values = dialect in settings.postgres_dialects
+        count = 0
+        async with queryset.database.transaction():
+            for update_columns, group in groups.items():
+                if use_values:
+                    parameters_per_row = len(pkcolumns) + len(update_columns)
+                else:
+                    parameters_per_row = (len(update_columns) + 1) * len(pkcolumns) + len(update_columns)
+                group_batch_size = queryset._get_batch_size(parameters_per_row, batch_size)
+                for index in range(0, len(group), group_batch_size):
+                    chunk = group[index : index + group_batch_size]
+                    if use_values:
+                        expression = queryset._build_bulk_update_values(chunk, pkcolumns, update_columns)
+                    else:
+                        expression = queryset._build_bulk_update_case(chunk, pkcolumns, update_columns)
+                    count += await queryset._execute_modification(expression, "bulk_update")
+        await queryset._invalidate_cache()
+        return count
+
+    def _build_bulk_update_values(
+        self, rows: Sequence[Dict[str, Any]], pkcolumns: Sequence[str], update_columns: Sequence[str]
+    ) -> Any:
+        """
+        Builds an `UPDATE ... FROM (VALUES ...)` statement of the rows.
+        """
+        table = self.table
+        keys = [*pkcolumns, *update_columns]
+        types = {key: table.columns[key].type for key in keys}
+        # the types of the parameters of VALUES are unknown to the database, so they are casted
+        values = sqlalchemy.values(
+            *(sqlalchemy.column(key, types[key]) for key in keys), name="bulk_update_values"
+        ).data(
+            [
+                tuple(sqlalchemy.cast(sqlalchemy.literal(row[key], types[key]), types[key]) for key in keys)
+                for row in rows
+            ]
+        )
+        return (
+            table.update()
+            .values({key: values.columns[key] for key in update_columns})
+            .where(*(table.columns[pkcolumn] == values.columns[pkcolumn] for pkcolumn in pkcolumns))
+        )
 
-    async def delete(self) -> None:
+    def _build_bulk_update_case(
+        self, rows: Sequence[Dict[str, Any]], pkcolumns: Sequence[str], update_columns: Sequence[str]
+    ) -> Any:
+        """
+        Builds an `UPDATE ... SET column = CASE WHEN pk = ... THEN ... END` statement of the rows.
+        """
+        table = self.table
+        conditions = [
+            sqlalchemy.and_(*(table.columns[pkcolumn] == row[pkcolumn] for pkcolumn in pkcolumns)) for row in rows
+        ]
+        values = {
+            key: sqlalchemy.case(
+                *(
+                    (condition, sqlalchemy.literal(row[key], table.columns[key].type))
+                    for condition, row in zip(conditions, rows)
+                ),
+                else_=table.columns[key],
+            )
+            for key in update_columns
+        }
+        if len(pkcolumns) == 1:
+            where = table.columns[pkcolumns[0]].in_([row[pkcolumns[0]] for row in rows])
+        else:
+            where = sqlalchemy.tuple_(*(table.columns[pkcolumn] for pkcolumn in pkcolumns)).in_(
+                [tuple(row[pkcolumn] for pkcolumn in pkcolumns) for row in rows]
+            )
+        return table.update().values(values).where(where)
+
+    def _build_modification_where(self) -> List[Any]:
+        """
+        Builds the where clauses of update() and delete().
+
+        Filters over related fields, limit and offset cannot be expressed in the where clause of
+        the table, the primary keys of the rows are selected in a subquery instead
+        (`WHERE pk IN (SELECT pk FROM ... JOIN ...)`).
+        """
+        queryset: "QuerySet" = self._clone()
+        if queryset.extra:
+            queryset = queryset.filter(**queryset.extra)
+
+        if not (queryset._select_related or queryset.limit_count or queryset._offset):
+            clauses = list(queryset.filter_clauses)
+            if queryset.or_clauses:
+                clauses.append(
+                    queryset.or_clauses[0] if len(queryset.or_clauses) == 1 else clauses_mod.or_(*queryset.or_clauses)
+                )
+            return clauses
+
+        table = queryset.table
+        pk_columns = [table.columns[pkcolumn] for pkcolumn in queryset.pkcolumns]
+        # the joins are only required for filtering, prefetching and annotations are not
+        queryset._annotations = {}
+        subquery = queryset._build_select().with_only_columns(*pk_columns).correlate(None)
+        if not queryset.limit_count and not queryset._offset:
+            subquery = subquery.order_by(None)
+        if queryset.database.url.dialect in settings.mysql_dialects:
+            # MySQL cannot select from the table being modified in a subquery, except via a derived table
+            derived = subquery.subquery("modification_pks")
+            subquery = sqlalchemy.select(*(derived.columns[column.key] for column in pk_columns))
+
+        if len(pk_columns) == 1:
+            return [pk_columns[0].in_(subquery)]
+        return [sqlalchemy.tuple_(*pk_columns).in_(subquery)]
+
+    async def _execute_modification(self, expression: Any, operation: str) -> int:
+        """
+        Executes an update or delete expression and returns the number of affected rows.
+        """
+        dialect = self.database.url.dialect
+        self._set_query_expression(expression)
+        if dialect in settings.postgres_dialects:
+            # count the rows in the database instead of transferring them
+            modified = expression.returning(sqlalchemy.literal_column("1")).cte("modified_rows")
+            count_expression = sqlalchemy.select(sqlalchemy.func.count()).select_from(modified)
+            return cast("int", await self._execute_query("fetch_val", count_expression, operation, rowcount=True))
+        if dialect in settings.returning_dialects:
+            pk_columns = [self.table.columns[pkcolumn] for pkcolumn in self.pkcolumns]
+            return len(await self._execute_query("fetch_all", expression.returning(*pk_columns), operation))
+        return cast("int", await self._execute_query("execute", expression, operation, rowcount=True))
+
+    async def delete(self) -> int:
+        """
+        Deletes the records of the queryset and returns the number of deleted rows.
+
+        Filters over related fields are supported.
+        """
         queryset: "QuerySet" = self._clone()
 
         await self.model_class.signals.pre_delete.send_async(self.__class__, instance=self)
 
-        expression = queryset.table.delete()
-        for filter_clause in queryset.filter_clauses:
-            expression = expression.where(filter_clause)
-
-        queryset._set_query_expression(expression)
-        await queryset.database.execute(expression)
+        expression = queryset.table.delete().where(*queryset._build_modification_where())
+        count = await queryset._execute_modification(expression, "delete")
 
         await self.model_class.signals.post_delete.send_async(self.__class__, instance=self)
+        return count
 
-    async def update(self, **kwargs: Any) -> None:
+    async def update(self, **kwargs: Any) -> int:
         """
-        Updates a record in a specific table with the given kwargs.
+        Updates the records of the queryset with the given kwargs and returns the number of
+        updated rows.
+
+        Filters over related fields are supported.
         """
         queryset: "QuerySet" = self._clone()
 
@@ -1000,23 +1930,125 @@ class QuerySet(BaseQuerySet, QuerySetProtocol):
         # Broadcast the initial update details
         await self.model_class.signals.pre_update.send_async(self.__class__, instance=self, kwargs=kwargs)
 
-        expression = queryset.table.update().values(**kwargs)
-
-        for filter_clause in queryset.filter_clauses:
-            expression = expression.where(filter_clause)
-
-        queryset._set_query_expression(expression)
-        await queryset.database.execute(expression)
+        expression = queryset.table.update().values(**kwargs).where(*queryset._build_modification_where())
+        count = await queryset._execute_modification(expression, "update")
 
         # Broadcast the update executed
         await self.model_class.signals.post_update.send_async(self.__class__, instance=self)
+        return count
+
+    def _get_upsert_conflict_columns(self, kwargs: Dict[str, Any], defaults: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Returns the columns of the unique constraint matching exactly the fields of the kwargs.
+
+        None is returned when get_or_create and update_or_create cannot be executed as an upsert.
+        """
+        if not supports_on_conflict(self.database.url.dialect):
+            return None
+        if self.filter_clauses or self.or_clauses or self.extra or self.embed_parent:
+            return None
+        meta = self.model_class.meta
+        for field_name in (*kwargs, *defaults):
+            # excludes related paths, ModelRefs and many to many fields
+            if field_name not in meta.fields_mapping or not meta.field_to_columns[field_name]:
+                return None
+        columns = set(self._fields_to_columns(list(kwargs)))
+        if not columns or not columns.isdisjoint(self._fields_to_columns(list(defaults))):
+            return None
+
+        table = self.table
+        candidates = [[column.key for column in table.primary_key.columns]]
+        candidates.extend([column.key] for column in table.columns if column.unique)
+        candidates.extend(
+            [column.key for column in constraint.columns]
+            for constraint in table.constraints
+            if isinstance(constraint, sqlalchemy.UniqueConstraint)
+        )
+        candidates.extend([column.key for column in index.columns] for index in table.indexes if index.unique)
+        for candidate in candidates:
+            if set(candidate) == columns:
+                return candidate
+        return None
+
+    def _get_upsert_values(self, values: Dict[str, Any]) -> Optional[Tuple[EdgyModel, Dict[str, Any]]]:
+        """
+        Returns the model built from the values and the values of its columns for inserting a
+        record or None when they are incomplete.
+
+        The values are taken from the model, so the defaults (e.g. uuid4 or now) are computed once.
+        """
+        try:
+            instance = self.model_class(**values)
+        except ValidationError:
+            return None
+        extracted_fields = instance.extract_db_fields()
+        for pkcolumn in self.pkcolumns:
+            if extracted_fields.get(pkcolumn) is None and self.table.columns[pkcolumn].autoincrement:
+                extracted_fields.pop(pkcolumn, None)
+        validated = self._extract_values_from_field(extracted_fields, model_class=self.model_class)
+        return cast(EdgyModel, instance), cast(Dict[str, Any], validated)
+
+    async def _insert_on_conflict_do_nothing(
+        self, instance: EdgyModel, values: Dict[str, Any], conflict_columns: List[str], operation: str
+    ) -> Any:
+        """
+        Inserts the record if there is no conflicting record and returns it.
+
+        Like save(), pre_save is sent with the unsaved instance and post_save with the inserted one.
+        """
+        await self.model_class.signals.pre_save.send_async(self.model_class, instance=instance)
+        table = self.table
+        expression = build_upsert(self.database.url.dialect, table, [values], conflict_columns).returning(
+            *table.columns
+        )
+        self._set_query_expression(expression)
+        row = await self._execute_query("fetch_one", expression, operation)
+        if row is None:
+            return None
+        instance = self._hydrate_returning([row])[0]
+        await self.model_class.signals.post_save.send_async(self.model_class, instance=instance)
+        return instance
+
+    async def _upsert_returning_created(
+        self, instance: EdgyModel, values: Dict[str, Any], conflict_columns: List[str], update_columns: List[str]
+    ) -> Tuple[EdgyModel, bool]:
+        """
+        Inserts the record or updates the update_columns of the conflicting record with one
+        statement and returns it and whether it was created.
+
+        pre_save is sent with the unsaved instance, then post_save for a created record or
+        post_update for an updated one.
+        """
+        await self.model_class.signals.pre_save.send_async(self.model_class, instance=instance)
+        table = self.table
+        expression = build_upsert(
+            self.database.url.dialect, table, [values], conflict_columns, update_columns
+        ).returning(*table.columns, build_created_flag())
+        self._set_query_expression(expression)
+        row = await self._execute_query("fetch_one", expression, "update_or_create")
+        instance = self._hydrate_returning([row])[0]
+        created = bool(row[len(table.columns)])
+        signal = self.model_class.signals.post_save if created else self.model_class.signals.post_update
+        await signal.send_async(self.model_class, instance=instance)
+        return instance, created
 
     async def get_or_create(self, defaults: Dict[str, Any], **kwargs: Any) -> Tuple[EdgyModel, bool]:
         """
         Creates a record in a specific table or updates if already exists.
+
+        When the kwargs match a unique constraint, the record is created with a single
+        `INSERT ... ON CONFLICT DO NOTHING` statement, so concurrent calls don't race.
         """
         queryset: "QuerySet" = self._clone()
 
+        conflict_columns = queryset._get_upsert_conflict_columns(kwargs, defaults)
+        upsert = queryset._get_upsert_values({**kwargs, **defaults}) if conflict_columns is not None else None
+        if conflict_columns is not None and upsert is not None:
+            instance = await queryset._insert_on_conflict_do_nothing(*upsert, conflict_columns, "get_or_create")
+            if instance is not None:
+                return instance, True
+            return await queryset.get(**kwargs), False
+
         try:
             instance = await queryset.get(**kwargs)
             return instance, False
@@ -1028,8 +2060,52 @@ class QuerySet(BaseQuerySet, QuerySetProtocol):
     async def update_or_create(self, defaults: Dict[str, Any], **kwargs: Any) -> Tuple[EdgyModel, bool]:
         """
         Updates a record in a specific table or creates a new one.
+
+        When the kwargs match a unique constraint, the record is created or updated with a single
+        `INSERT ... ON CONFLICT DO UPDATE ... RETURNING` statement on Postgres. The other databases
+        supporting `ON CONFLICT` can't return whether the record was inserted, they create it with
+        `INSERT ... ON CONFLICT DO NOTHING` or else update it with `UPDATE ... RETURNING`. This way
+        concurrent calls don't race.
         """
         queryset: "QuerySet" = self._clone()
+
+        conflict_columns = queryset._get_upsert_conflict_columns(kwargs, defaults)
+        upsert = queryset._get_upsert_values({**kwargs, **defaults}) if conflict_columns is not None else None
+        if conflict_columns is not None and upsert is not None:
+            table = queryset.table
+            key_values = queryset._extract_values_from_field(kwargs, model_class=queryset.model_class, is_partial=True)
+            update_values = queryset._extract_values_from_field(
+                defaults, model_class=queryset.model_class, is_update=True, is_partial=True
+            )
+            update_values = queryset._update_auto_now_fields(update_values, queryset.model_class.fields)
+            if supports_created_flag(queryset.database.url.dialect):
+                return await queryset._upsert_returning_created(*upsert, conflict_columns, list(update_values))
+            for _ in range(self.UPSERT_ATTEMPTS):
+                instance = await queryset._insert_on_conflict_do_nothing(
+                    *upsert, conflict_columns, "update_or_create"
+                )
+                if instance is not None:
+                    return instance, True
+                if not update_values:
+                    return await queryset.get(**kwargs), False
+                await queryset.model_class.signals.pre_update.send_async(
+                    queryset.model_class, instance=upsert[0], kwargs=update_values
+                )
+                expression = (
+                    table.update()
+                    .values(**update_values)
+                    .where(*(table.columns[column] == key_values[column] for column in conflict_columns))
+                    .returning(*table.columns)
+                )
+                queryset._set_query_expression(expression)
+                row = await queryset._execute_query("fetch_one", expression, "update_or_create")
+                # else the record was deleted in between, try again
+                if row is not None:
+                    instance = queryset._hydrate_returning([row])[0]
+                    await queryset.model_class.signals.post_update.send_async(queryset.model_class, instance=instance)
+                    return instance, False
+            # the record keeps disappearing, fall back to get and create
+
         try:
             instance = await queryset.get(**kwargs)
             await instance.update(**defaults)
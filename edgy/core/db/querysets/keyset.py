@@ -0,0 +1,91 @@
+import base64
+import binascii
+import datetime
+import decimal
+import enum
+import json
+import uuid
+from typing import Any, List, Sequence, Tuple
+
+import sqlalchemy
+
+from edgy.exceptions import QuerySetError
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, (datetime.date, datetime.time)):
+        # datetime is a subclass of date
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+def _decode_value(value: Any, column: sqlalchemy.Column) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if issubclass(python_type, enum.Enum):
+        return python_type[value]
+    if python_type in (datetime.datetime, datetime.date, datetime.time):
+        return python_type.fromisoformat(value)
+    if python_type in (decimal.Decimal, uuid.UUID):
+        return python_type(value)
+    return value
+
+
+def encode_cursor(order_by: Sequence[str], values: Sequence[Any]) -> str:
+    """
+    Encodes the sort keys of the last row of a page into an opaque cursor.
+    """
+    payload = json.dumps({"o": list(order_by), "v": [_encode_value(value) for value in values]})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, order_by: Sequence[str], columns: Sequence[sqlalchemy.Column]) -> List[Any]:
+    """
+    Decodes a cursor of encode_cursor into the sort keys. The cursor must be generated with
+    the same order.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        cursor_order, values = payload["o"], payload["v"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise QuerySetError(detail="Invalid cursor.") from None
+    if cursor_order != list(order_by) or len(values) != len(columns):
+        raise QuerySetError(detail="The cursor does not match the order of the queryset.")
+    try:
+        return [_decode_value(value, column) for value, column in zip(values, columns)]
+    except (ValueError, KeyError, TypeError):
+        raise QuerySetError(detail="Invalid cursor.") from None
+
+
+def build_keyset_clause(order: Sequence[Tuple[sqlalchemy.Column, bool]], values: Sequence[Any]) -> Any:
+    """
+    Builds the clause selecting the rows after the given sort keys.
+
+    When all columns are sorted in the same direction a row-value comparison `(a, b) > (:a, :b)`
+    is used, otherwise it is expanded into `a > :a OR (a = :a AND b < :b)`.
+    """
+    columns = [column for column, _ in order]
+    bound = [sqlalchemy.literal(value, column.type) for column, value in zip(columns, values)]
+    descendings = {descending for _, descending in order}
+    if len(descendings) == 1:
+        descending = descendings.pop()
+        if len(columns) == 1:
+            return columns[0] < bound[0] if descending else columns[0] > bound[0]
+        left = sqlalchemy.tuple_(*columns)
+        right = sqlalchemy.tuple_(*bound)
+        return left < right if descending else left > right
+
+    clauses = []
+    for index, (column, descending) in enumerate(order):
+        equals = [columns[position] == bound[position] for position in range(index)]
+        after = column < bound[index] if descending else column > bound[index]
+        clauses.append(sqlalchemy.and_(*equals, after))
+    return sqlalchemy.or_(*clauses)
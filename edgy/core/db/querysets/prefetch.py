@@ -1,9 +1,15 @@
-from typing import TYPE_CHECKING, List, Optional, cast
+import functools
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Type, Union, cast
 
+import sqlalchemy
+
+from edgy.core.cache import CachedRow
+from edgy.core.db.fields.base import RelationshipField
+from edgy.core.db.instrumentation import execute_query
 from edgy.exceptions import QuerySetError
 
 if TYPE_CHECKING:
-    from edgy import QuerySet
+    from edgy import Model, QuerySet
 
 
 class Prefetch:
@@ -23,12 +29,118 @@ class Prefetch:
         self.queryset = queryset
 
 
+# Maximum of keys per IN query of load_all
+LOAD_ALL_CHUNK_SIZE = 1000
+
+
+def _is_loaded(instance: Any) -> bool:
+    fields_dict = instance.__dict__
+    for field_name, columns in instance.meta.field_to_columns.items():
+        if columns and field_name not in fields_dict:
+            return False
+    return True
+
+
+async def load_all(instances: Sequence[Any], *fields: str) -> None:
+    """
+    Loads the foreign keys of all the instances at once.
+
+    Collects the foreign key stubs of the given fields across the instances and fetches
+    the targets with one IN query per target table (chunked for large key sets).
+    The stubs are filled in place, like `load()` does for a single instance.
+
+    Nested foreign keys can be loaded with the `__` notation, like `author__publisher`.
+    """
+    remainders: Dict[str, List[str]] = {}
+    for field_path in fields:
+        field_name, _, remainder = field_path.partition("__")
+        field_remainders = remainders.setdefault(field_name, [])
+        if remainder:
+            field_remainders.append(remainder)
+
+    # (table, related columns) -> key -> stubs
+    stubs: Dict[Tuple[Any, Tuple[str, ...]], Dict[Tuple[Any, ...], List[Any]]] = {}
+    loaded: Dict[str, List[Any]] = {field_name: [] for field_name in remainders}
+    for instance in instances:
+        foreign_key_fields = instance.meta.foreign_key_fields
+        for field_name in remainders:
+            foreign_key = foreign_key_fields.get(field_name)
+            if foreign_key is None:
+                raise QuerySetError(
+                    detail=f"{field_name}: is not a foreign key of {instance.__class__.__name__}."
+                )
+            stub = instance.__dict__.get(field_name)
+            if stub is None:
+                continue
+            loaded[field_name].append(stub)
+            if _is_loaded(stub):
+                continue
+            related_columns = tuple(foreign_key.related_columns.keys())
+            key = tuple(stub.__dict__.get(column) for column in related_columns)
+            if any(value is None for value in key):
+                continue
+            stubs.setdefault((stub.table, related_columns), {}).setdefault(key, []).append(stub)
+
+    for (table, related_columns), keyed_stubs in stubs.items():
+        first_stub = next(iter(keyed_stubs.values()))[0]
+        database = first_stub.database
+        columns = [table.columns[column] for column in related_columns]
+        key_list = list(keyed_stubs.keys())
+        pk_cache = None
+        cached_row_getter: Any = None
+        if related_columns == tuple(first_stub.pkcolumns):
+            if first_stub.meta.cache_full_table:
+                cached_table = await first_stub.meta.registry.full_table_cache.load(
+                    first_stub.__class__, database, table
+                )
+                cached_row_getter = cached_table.by_pk.get
+            elif first_stub.meta.pk_cache:
+                pk_cache = first_stub.meta.registry.pk_cache
+                cached_row_getter = functools.partial(pk_cache.get, database, table)
+        if cached_row_getter is not None:
+            missing = []
+            for key in key_list:
+                cached_row = cached_row_getter(key)
+                if cached_row is None:
+                    missing.append(key)
+                    continue
+                mapping = cached_row._mapping
+                for stub in keyed_stubs[key]:
+                    stub.__dict__.update(stub.transform_input(mapping, phase="load"))
+            key_list = missing
+        for index in range(0, len(key_list), LOAD_ALL_CHUNK_SIZE):
+            chunk = key_list[index : index + LOAD_ALL_CHUNK_SIZE]
+            if len(columns) == 1:
+                clause = columns[0].in_([key[0] for key in chunk])
+            else:
+                clause = sqlalchemy.tuple_(*columns).in_(chunk)
+            rows = await execute_query(
+                database, "fetch_all", table.select().where(clause), first_stub.__class__, "load_all"
+            )
+            if pk_cache is not None:
+                rows = CachedRow.from_rows(rows)
+            for row in rows:
+                mapping = dict(row._mapping)
+                key = tuple(mapping[column] for column in related_columns)
+                if pk_cache is not None:
+                    pk_cache.set(database, table, key, row)
+                for stub in keyed_stubs.get(key, ()):
+                    stub.__dict__.update(stub.transform_input(mapping, phase="load"))
+
+    for field_name, field_remainders in remainders.items():
+        if field_remainders and loaded[field_name]:
+            await load_all(loaded[field_name], *field_remainders)
+
+
 class PrefetchMixin:
     """
     Query used to perform a prefetch_related into the models and
     subsequent queries.
     """
 
+    # Maximum of parent keys per IN query
+    PREFETCH_CHUNK_SIZE = 1000
+
     def prefetch_related(self, *prefetch: Prefetch) -> "QuerySet":
         """
         Performs a reverse lookup for the foreignkeys. This is different
@@ -49,3 +161,113 @@ class PrefetchMixin:
         prefetch = list(self._prefetch_related) + prefetch  # type: ignore
         queryset._prefetch_related = prefetch
         return queryset
+
+    def load_related(self, *fields: Union[str, Sequence[str]]) -> "QuerySet":
+        """
+        Loads the given foreign keys of the results after the main query with one query
+        per target model instead of one query per instance.
+        """
+        queryset: "QuerySet" = self._clone()
+        load_related = list(self._load_related)
+        for field in fields:
+            if isinstance(field, str):
+                load_related.append(field)
+            else:
+                load_related.extend(field)
+        queryset._load_related = load_related
+        return queryset
+
+    def _get_prefetch_target(self, prefetch: Prefetch) -> Tuple[Type["Model"], str]:
+        """
+        Returns the model class the prefetch is loading and the path from this model class
+        back to the model of the queryset.
+        """
+        model_class = self.model_class
+        if prefetch.related_name.split("__", 1)[0] not in model_class.meta.fields_mapping:
+            if prefetch.queryset is None:
+                raise QuerySetError(
+                    f"Invalid related_name='{prefetch.related_name}' for {model_class.__name__}."
+                )
+            # The related_name is the path from the model of the queryset back to the parent.
+            return prefetch.queryset.model_class, prefetch.related_name
+
+        reverse_path = ""
+        path = prefetch.related_name
+        while path:
+            field_name = path.split("__", 1)[0]
+            field = model_class.meta.fields_mapping.get(field_name)
+            if not isinstance(field, RelationshipField):
+                raise QuerySetError(f"{field_name}: invalid field type for prefetching: {field!r}")
+            model_class, reverse_part, path = field.traverse_field(path)
+            if not reverse_part:
+                raise QuerySetError("No backward relation possible (missing related_name)")
+            reverse_path = f"{reverse_part}__{reverse_path}" if reverse_path else reverse_part
+        return model_class, reverse_path
+
+    async def _prefetch_related_objects(self, results: Sequence[Any]) -> None:
+        """
+        Loads the prefetch_related of the given results after the main query.
+
+        Runs one query per Prefetch (chunked for large key sets) filtering the related
+        models by the keys of all the results at once and assigns the related models
+        to the `to_attr` of the results in memory.
+        """
+        from edgy.core.db.querysets.base import crawl_relationship
+
+        model_class = self.model_class
+        for prefetch in self._prefetch_related:
+            # Check for conflicting names
+            if prefetch.to_attr in model_class.meta.fields_mapping or hasattr(model_class, prefetch.to_attr):
+                raise QuerySetError(
+                    f"Conflicting attribute to_attr='{prefetch.related_name}' with '{prefetch.to_attr}' in {model_class.__name__}"
+                )
+
+        if not results:
+            return
+
+        pkcolumns = model_class.pkcolumns
+        keys: Dict[Tuple[Any, ...], List[Any]] = {}
+        for result in results:
+            keys.setdefault(tuple(getattr(result, pkcol) for pkcol in pkcolumns), []).append(result)
+        key_list = list(keys.keys())
+
+        for prefetch in self._prefetch_related:
+            target, reverse_path = self._get_prefetch_target(prefetch)
+            queryset: "QuerySet" = (
+                prefetch.queryset._clone() if prefetch.queryset is not None else target.query.all()
+            )
+            if queryset.extra:
+                queryset = queryset.filter(**queryset.extra)
+
+            # The columns of the parent keys, reachable by joining back the reverse path.
+            columns = []
+            for pkcol in pkcolumns:
+                parent_class, _, _, forward_path, _ = crawl_relationship(
+                    queryset.model_class, f"{reverse_path}__{pkcol}"
+                )
+                columns.append(parent_class.table.columns[pkcol])
+            if forward_path not in queryset._select_related:
+                queryset._select_related = [*queryset._select_related, forward_path]
+            base_expression = queryset._build_select()
+
+            related: Dict[Tuple[Any, ...], List[Any]] = {key: [] for key in key_list}
+            for index in range(0, len(key_list), self.PREFETCH_CHUNK_SIZE):
+                chunk = key_list[index : index + self.PREFETCH_CHUNK_SIZE]
+                if len(columns) == 1:
+                    clause = columns[0].in_([key[0] for key in chunk])
+                else:
+                    clause = sqlalchemy.tuple_(*columns).in_(chunk)
+                expression = base_expression.where(clause)
+                queryset._set_query_expression(expression)
+                rows = await queryset._execute_query("fetch_all", expression, "prefetch_related")
+                records = queryset._hydrate_rows(rows, expression)
+                if queryset._prefetch_related:
+                    await queryset._prefetch_related_objects(records)
+                for row, record in zip(rows, records):
+                    related.setdefault(tuple(row[column] for column in columns), []).append(
+                        queryset.embed_parent_in_result(record)
+                    )
+
+            for key, parents in keys.items():
+                for parent in parents:
+                    setattr(parent, prefetch.to_attr, list(related.get(key, [])))
@@ -0,0 +1,65 @@
+import functools
+import inspect
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterator
+
+from edgy.core.utils.sync import run_sync
+
+if TYPE_CHECKING:  # pragma: no cover
+    from edgy.core.db.querysets.base import QuerySet
+
+
+def _iterate_sync(iterator: AsyncIterator) -> Iterator:
+    while True:
+        try:
+            yield run_sync(iterator.__anext__())
+        except StopAsyncIteration:
+            return
+
+
+class SyncQuerySet:
+    """
+    Blocking facade of a QuerySet, the queries are executed via run_sync.
+
+    Methods returning a QuerySet return a SyncQuerySet for chaining, except `all()` which executes
+    the query like iterating over the SyncQuerySet.
+
+    **Example**
+
+    ```python
+    users = User.query.sync.filter(is_active=True).order_by("name").all()
+    user = User.query.sync.get(pk=1)
+    ```
+    """
+
+    def __init__(self, queryset: "QuerySet") -> None:
+        self.queryset = queryset
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        from edgy.core.db.querysets.base import QuerySet
+
+        attribute = getattr(self.queryset, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = attribute(*args, **kwargs)
+            if isinstance(result, QuerySet):
+                if name == "all":
+                    return run_sync(result)
+                return SyncQuerySet(result)
+            if inspect.isasyncgen(result):
+                return _iterate_sync(result)
+            if inspect.isawaitable(result):
+                return run_sync(result)
+            return result
+
+        return wrapper
+
+    def __iter__(self) -> Iterator:
+        return iter(run_sync(self.queryset))
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} of {self.queryset.model_class.__name__}>"
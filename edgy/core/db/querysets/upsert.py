@@ -0,0 +1,84 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+import sqlalchemy
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from edgy.conf import settings
+
+
+def supports_on_conflict(dialect: str) -> bool:
+    """
+    Returns True when the dialect supports `INSERT ... ON CONFLICT` with `RETURNING`.
+    """
+    return dialect in settings.postgres_dialects or dialect in settings.sqlite_dialects
+
+
+def supports_upsert(dialect: str) -> bool:
+    return supports_on_conflict(dialect) or dialect in settings.mysql_dialects
+
+
+def supports_created_flag(dialect: str) -> bool:
+    """
+    Returns True when `INSERT ... ON CONFLICT DO UPDATE ... RETURNING` can return whether the
+    record was inserted, see build_created_flag.
+    """
+    return dialect in settings.postgres_dialects
+
+
+def build_created_flag() -> Any:
+    """
+    Builds the expression returning True for the inserted records of an upsert, on Postgres the
+    inserted row versions have no deleting transaction (`xmax = 0`).
+    """
+    return (sqlalchemy.literal_column("xmax") == 0).label("edgy_created")
+
+
+def build_upsert(
+    dialect: str,
+    table: sqlalchemy.Table,
+    rows: List[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+) -> Any:
+    """
+    Builds an insert of the rows updating the update_columns of the rows conflicting on the
+    conflict_columns (`ON CONFLICT ... DO UPDATE` or `ON DUPLICATE KEY UPDATE`).
+
+    When update_columns is None, the conflicting rows are skipped (`DO NOTHING`).
+    An empty update_columns touches the conflicting rows without changing them, so `RETURNING`
+    returns them too.
+    """
+    if dialect in settings.mysql_dialects:
+        mysql_expression = mysql.insert(table).values(rows)
+        # MySQL has no DO NOTHING, assigning a column to itself is a no-op
+        columns = update_columns or conflict_columns
+        return mysql_expression.on_duplicate_key_update(
+            {column: mysql_expression.inserted[column] for column in columns}
+        )
+
+    insert = postgresql.insert if dialect in settings.postgres_dialects else sqlite.insert
+    expression = insert(table).values(rows)
+    if update_columns is None:
+        return expression.on_conflict_do_nothing(index_elements=list(conflict_columns))
+    columns = update_columns or conflict_columns
+    return expression.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={column: expression.excluded[column] for column in columns},
+    )
+
+
+def build_insert_ignore(dialect: str, table: sqlalchemy.Table, rows: List[Dict[str, Any]]) -> Any:
+    """
+    Builds an insert of the rows skipping the rows which violate any unique constraint
+    (`ON CONFLICT DO NOTHING` or on MySQL `ON DUPLICATE KEY UPDATE` assigning the primary key
+    to itself).
+
+    Unlike `INSERT IGNORE`, the other errors (e.g. of foreign keys) are still raised on MySQL.
+    """
+    if dialect in settings.mysql_dialects:
+        # the existing row keeps its values, assigning a column to itself is a no-op
+        return mysql.insert(table).values(rows).on_duplicate_key_update(
+            {column.key: column for column in table.primary_key.columns}
+        )
+    insert = postgresql.insert if dialect in settings.postgres_dialects else sqlite.insert
+    return insert(table).values(rows).on_conflict_do_nothing()
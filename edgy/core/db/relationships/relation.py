@@ -1,10 +1,14 @@
 import functools
-from typing import TYPE_CHECKING, Any, Literal, Optional, Sequence, Tuple, Type, Union, cast
+import sys
+from typing import TYPE_CHECKING, Any, List, Literal, Optional, Sequence, Tuple, Type, Union, cast
 
 import sqlalchemy
 from pydantic import BaseModel, ConfigDict
 
+from edgy.conf import settings
 from edgy.core.db.fields.base import RelationshipField
+from edgy.core.db.n_plus_one import record_relation_query
+from edgy.core.db.querysets.upsert import build_insert_ignore, supports_upsert
 from edgy.exceptions import ObjectNotFound, RelationshipIncompatible, RelationshipNotFound
 from edgy.protocols.many_relationship import ManyRelationProtocol
 
@@ -68,13 +72,21 @@ class ManyRelation(ManyRelationProtocol):
         queryset.embed_parent = (self.to_foreign_key, self.embed_through)
         return queryset
 
+    def _get_relation_name(self) -> str:
+        # the name of the many to many field or its reverse name on the model of the instance
+        owner: Any = self.to if self.reverse else self.instance.__class__
+        for name, field in owner.meta.fields_mapping.items():
+            if getattr(field, "through", None) is self.through:
+                return cast(str, getattr(field, "reverse_name", name)) if self.reverse else cast(str, name)
+        return self.from_foreign_key
+
     async def save_related(self) -> None:
-        # TODO: improve performance
         fk = self.through.meta.fields_mapping[self.from_foreign_key]
-        while self.refs:
-            ref = self.refs.pop()
+        refs = list(self.refs)
+        self.refs = []
+        for ref in refs:
             ref.__dict__.update(fk.clean(fk.name, self.instance))
-            await self.add(ref)
+        await self._add_through_instances(refs)
 
     def __getattr__(self, item: Any) -> Any:
         """
@@ -85,6 +97,9 @@ class ManyRelation(ManyRelationProtocol):
             attr = getattr(self.get_queryset(), item)
         except AttributeError:
             attr = getattr(self.through, item)
+        else:
+            if self.instance is not None:
+                record_relation_query(self.instance.__class__, self._get_relation_name, item, sys._getframe(1))
 
         func = self.wrap_args(attr)
         return func
@@ -142,6 +157,127 @@ class ManyRelation(ManyRelationProtocol):
             pass
         return None
 
+    def _check_child(self, child: Any) -> None:
+        if not isinstance(child, (self.to, self.to.proxy_model, self.through, self.through.proxy_model)):
+            raise RelationshipIncompatible(f"The child is not from the types '{self.to.__name__}', '{self.through.__name__}'.")
+
+    def _get_through_queryset(self) -> "QuerySet":
+        return self.through.meta.managers["query_related"].get_queryset()
+
+    def _get_to_key(self, through_instance: Any) -> Tuple[Any, ...]:
+        """
+        Returns the values of the columns of the to_foreign_key of a through model.
+        """
+        fk = self.through.meta.fields_mapping[self.to_foreign_key]
+        values = fk.clean(fk.name, getattr(through_instance, self.to_foreign_key))
+        return tuple(values[column_name] for column_name in fk.get_column_names(fk.name))
+
+    async def _add_through_instances(self, through_instances: Sequence[Any]) -> None:
+        """
+        Inserts the through models with one `INSERT ... ON CONFLICT DO NOTHING` per batch.
+        Relations which exist already are skipped.
+        """
+        if not through_instances:
+            return
+        queryset = self._get_through_queryset()
+        dialect = queryset.database.url.dialect
+        if not supports_upsert(dialect):
+            for through_instance in through_instances:
+                await self.add(through_instance)
+            return
+
+        table = queryset.table
+        rows = []
+        for through_instance in through_instances:
+            values = queryset._validate_kwargs(**through_instance.extract_db_fields())
+            values = queryset._update_auto_now_fields(values, self.through.fields)
+            for pkcolumn in self.through.pkcolumns:
+                if values.get(pkcolumn) is None and table.columns[pkcolumn].autoincrement is True:
+                    values.pop(pkcolumn, None)
+            rows.append(values)
+
+        batch_size = queryset._get_batch_size(len(table.columns))
+        async with queryset.database.transaction():
+            for index in range(0, len(rows), batch_size):
+                expression = build_insert_ignore(dialect, table, rows[index : index + batch_size])
+                queryset._set_query_expression(expression)
+                await queryset._execute_query("execute", expression, "add")
+        await queryset._invalidate_cache()
+
+    async def _remove_to_keys(self, to_keys: Sequence[Tuple[Any, ...]]) -> int:
+        """
+        Deletes the through models of the instance pointing to the given keys with one
+        `DELETE ... WHERE (from, to) IN (...)` per batch.
+        """
+        if not to_keys:
+            return 0
+        queryset = self._get_through_queryset()
+        from_fk = self.through.meta.fields_mapping[self.from_foreign_key]
+        to_fk = self.through.meta.fields_mapping[self.to_foreign_key]
+        table = queryset.table
+        from_clauses = [
+            table.columns[column_name] == value for column_name, value in from_fk.clean(from_fk.name, self.instance).items()
+        ]
+        to_columns = [table.columns[column_name] for column_name in to_fk.get_column_names(to_fk.name)]
+        batch_size = queryset._get_batch_size(len(to_columns))
+        count = 0
+        for index in range(0, len(to_keys), batch_size):
+            chunk = to_keys[index : index + batch_size]
+            if len(to_columns) == 1:
+                clause = to_columns[0].in_([key[0] for key in chunk])
+            else:
+                clause = sqlalchemy.tuple_(*to_columns).in_(chunk)
+            count += await queryset.filter(sqlalchemy.and_(*from_clauses, clause)).delete()
+        return count
+
+    async def add_many(self, children: Sequence["Model"]) -> None:
+        """
+        Adds many children with one insert per batch. Children which are related already are skipped.
+
+        Unlike add(), no save signals are sent for the through models.
+        """
+        for child in children:
+            self._check_child(child)
+        await self._add_through_instances([self.expand_relationship(child) for child in children])
+
+    async def remove_many(self, children: Sequence["Model"]) -> int:
+        """
+        Removes many children with one delete per batch and returns the number of removed relations.
+        Children which are not related are ignored.
+        """
+        for child in children:
+            self._check_child(child)
+        to_keys = list(dict.fromkeys(self._get_to_key(self.expand_relationship(child)) for child in children))
+        return await self._remove_to_keys(to_keys)
+
+    async def set(self, children: Sequence["Model"]) -> None:
+        """
+        Replaces the children of the relation with the given ones. Only the difference to the
+        current children is inserted and deleted.
+        """
+        for child in children:
+            self._check_child(child)
+        through_instances = {}
+        for child in children:
+            through_instance = self.expand_relationship(child)
+            through_instances[self._get_to_key(through_instance)] = through_instance
+
+        queryset = self._get_through_queryset()
+        from_fk = self.through.meta.fields_mapping[self.from_foreign_key]
+        to_fk = self.through.meta.fields_mapping[self.to_foreign_key]
+        table = queryset.table
+        to_columns = [table.columns[column_name] for column_name in to_fk.get_column_names(to_fk.name)]
+        expression = sqlalchemy.select(*to_columns).where(
+            *(table.columns[column_name] == value for column_name, value in from_fk.clean(from_fk.name, self.instance).items())
+        )
+        async with queryset.database.transaction():
+            rows = await queryset._execute_query("fetch_all", expression, "set")
+            current = {tuple(row[index] for index in range(len(to_columns))) for row in rows}
+            await self._remove_to_keys([key for key in current if key not in through_instances])
+            await self._add_through_instances(
+                [through_instance for key, through_instance in through_instances.items() if key not in current]
+            )
+
     async def remove(self, child: Optional["Model"]=None) -> None:
         """Removes a child from the list of many to many.
 
@@ -214,6 +350,9 @@ class SingleRelation(ManyRelationProtocol):
         queryset.embed_parent = self.embed_parent
         return queryset
 
+    def _get_relation_name(self) -> str:
+        return cast(str, self.to.meta.fields_mapping[self.to_foreign_key].reverse_name)
+
     def expand_relationship(self, value: Any) -> Any:
         target = self.to
 
@@ -246,6 +385,9 @@ class SingleRelation(ManyRelationProtocol):
             attr = getattr(self.get_queryset(), item)
         except AttributeError:
             attr = getattr(self.to, item)
+        else:
+            if self.instance is not None:
+                record_relation_query(self.instance.__class__, self._get_relation_name, item, sys._getframe(1))
 
         func = self.wrap_args(attr)
         return func
@@ -275,8 +417,83 @@ class SingleRelation(ManyRelationProtocol):
         return wrapped
 
     async def save_related(self) -> None:
-        while self.refs:
-            await self.add(self.refs.pop())
+        refs = [ref for ref in self.refs if ref is not None]
+        self.refs = []
+        await self.add_many(refs)
+
+    async def add_many(self, children: Sequence["Model"]) -> None:
+        """
+        Adds many children with one `UPDATE ... WHERE pk IN (...)` per batch for the existing
+        children and a bulk_create for the new ones.
+
+        The pre_save and post_save signals are sent per child, the update signals once per batch.
+        Children with relations or model references to save are added one by one.
+        """
+        for child in children:
+            if not isinstance(child, (self.to, self.to.proxy_model)):
+                raise RelationshipIncompatible(f"The child is not from the type '{self.to.__name__}'.")
+        if not children:
+            return
+
+        queryset = self.to.meta.managers["query_related"].get_queryset()
+        pkcolumns: Sequence[str] = queryset.pkcolumns
+        existing: List[Any] = []
+        new: List[Any] = []
+        single: List[Any] = []
+        for child in children:
+            if any(
+                isinstance(child.__dict__.get(field_name), ManyRelationProtocol)
+                for field_name in self.to.meta.fields_mapping
+            ) or any(child.__dict__.get(field_name) for field_name in self.to.meta.model_references):
+                single.append(child)
+            elif all(child.__dict__.get(pkcolumn) is not None for pkcolumn in pkcolumns):
+                existing.append(child)
+            elif queryset.database.url.dialect in settings.returning_dialects:
+                new.append(child)
+            else:
+                # the generated primary keys are only known via RETURNING
+                single.append(child)
+
+        for child in (*existing, *new):
+            await child.signals.pre_save.send_async(child.__class__, instance=child)
+
+        table = queryset.table
+        batch_size = queryset._get_batch_size(len(pkcolumns))
+        for index in range(0, len(existing), batch_size):
+            chunk = existing[index : index + batch_size]
+            if len(pkcolumns) == 1:
+                clause = table.columns[pkcolumns[0]].in_([child.__dict__[pkcolumns[0]] for child in chunk])
+            else:
+                clause = sqlalchemy.tuple_(*(table.columns[pkcolumn] for pkcolumn in pkcolumns)).in_(
+                    [tuple(child.__dict__[pkcolumn] for pkcolumn in pkcolumns) for child in chunk]
+                )
+            await queryset.filter(clause).update(**{self.to_foreign_key: self.instance})
+
+        if new:
+            rows = []
+            for child in new:
+                values = child.extract_db_fields()
+                for pkcolumn in pkcolumns:
+                    if values.get(pkcolumn) is None:
+                        values.pop(pkcolumn, None)
+                values[self.to_foreign_key] = self.instance
+                rows.append(values)
+            created = await queryset.bulk_create(rows)
+            for child, created_child in zip(new, cast(List[Any], created)):
+                child.__dict__.update(created_child.extract_db_fields())
+
+        for child in existing:
+            setattr(child, self.to_foreign_key, self.instance)
+            # the update only wrote the foreign key
+            child._clear_changed_fields([self.to_foreign_key])
+        for child in new:
+            setattr(child, self.to_foreign_key, self.instance)
+            child._clear_changed_fields()
+        for child in (*existing, *new):
+            await child.signals.post_save.send_async(child.__class__, instance=child)
+
+        for child in single:
+            await self.add(child)
 
     async def add(self, child: "Model") -> Optional["Model"]:
         """
@@ -4,10 +4,15 @@ from typing import Any
 import anyio
 from anyio._core._eventloop import threadlocals
 
+from edgy.core.utils.sync import run_sync
+
 
 def execsync(async_function: Any, raise_error: bool = True) -> Any:
     """
     Runs any async function inside a blocking function (sync).
+
+    Inside a worker thread of anyio the function runs on the loop of anyio, otherwise on the
+    background loop of run_sync.
     """
 
     @functools.wraps(async_function)
@@ -16,6 +21,6 @@ def execsync(async_function: Any, raise_error: bool = True) -> Any:
         partial_func = functools.partial(async_function, *args, **kwargs)
         if current_async_module is not None and raise_error is True:
             return anyio.from_thread.run(partial_func)
-        return anyio.run(partial_func)
+        return run_sync(partial_func())
 
     return wrapper
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Dict, Type, Union
+from typing import TYPE_CHECKING, Dict, Type, Union, cast
 
 import sqlalchemy
 from loguru import logger
@@ -16,11 +16,8 @@ def table_schema(model_class: Type["Model"], schema: str) -> sqlalchemy.Table:
     """
     Making sure the tables on inheritance state, creates the new
     one properly.
-
-    The use of context vars instead of using the lru_cache comes from
-    a warning from `ruff` where lru can lead to memory leaks.
     """
-    return model_class.build(schema)
+    return cast(sqlalchemy.Table, model_class.table_schema(schema))
 
 
 async def create_tables(registry: "Registry", models: Dict[str, Type["Model"]], schema: str) -> None:
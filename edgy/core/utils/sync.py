@@ -1,16 +1,86 @@
 import asyncio
+import atexit
+import contextvars
+import os
+import threading
 from concurrent import futures
 from concurrent.futures import Future
-from typing import Any, Awaitable
+from typing import Any, Awaitable, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_pid: Optional[int] = None
+_loop_lock = threading.Lock()
+
+
+async def _await(awaitable: Awaitable) -> Any:
+    return await awaitable
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the long-lived event loop used by run_sync, starting its thread if required.
+
+    All blocking calls share this loop, so only databases connected via run_sync have their
+    connections bound to it. The loop doesn't follow the database: a database connected on
+    another loop is still driven from this one.
+    """
+    global _loop, _loop_thread, _loop_pid
+
+    with _loop_lock:
+        # threads don't survive a fork
+        if _loop is None or _loop_pid != os.getpid() or _loop_thread is None or not _loop_thread.is_alive():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="edgy-background-loop", daemon=True)
+            thread.start()
+            _loop, _loop_thread, _loop_pid = loop, thread, os.getpid()
+        return _loop
+
+
+def shutdown_background_loop() -> None:
+    """
+    Stops the loop of run_sync. A later run_sync starts a new one.
+    """
+    global _loop, _loop_thread, _loop_pid
+
+    with _loop_lock:
+        loop, thread = _loop, _loop_thread
+        _loop = _loop_thread = _loop_pid = None
+    if loop is None or thread is None or not thread.is_alive():
+        return
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+atexit.register(shutdown_background_loop)
 
 
 def run_sync(async_function: Awaitable) -> Any:
     """
     Runs the queries in sync mode
+
+    The awaitable is executed on the background loop (see get_background_loop) and the calling
+    thread blocks until it finished. The context variables of the caller are passed on.
+
+    When the loop running in the calling thread allows nesting (nest_asyncio), the awaitable is
+    executed on it instead, so the connections bound to this loop stay usable. Otherwise the
+    databases must be connected via run_sync too, the connections of a database connected on the
+    loop of the caller cannot be used from the background loop.
     """
     try:
-        return asyncio.run(async_function)
+        running_loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
     except RuntimeError:
+        running_loop = None
+    if running_loop is not None and getattr(running_loop, "_nest_patched", False):
+        return running_loop.run_until_complete(_await(async_function))
+
+    loop = get_background_loop()
+    if running_loop is loop:
+        # called from a coroutine running on the background loop, which cannot wait for itself
         with futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future: Future = executor.submit(asyncio.run, async_function)
+            future: Future = executor.submit(
+                contextvars.copy_context().run, asyncio.run, _await(async_function)
+            )
             return future.result()
+    return asyncio.run_coroutine_threadsafe(_await(async_function), loop).result()
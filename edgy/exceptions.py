@@ -49,6 +49,9 @@ class RelationshipNotFound(EdgyException): ...
 class QuerySetError(EdgyException): ...
 
 
+class NPlusOneError(EdgyException): ...
+
+
 class ModelReferenceError(EdgyException): ...
 
 
@@ -1,6 +1,7 @@
 from typing import (
     TYPE_CHECKING,
     Any,
+    AsyncIterator,
     Dict,
     List,
     Optional,
@@ -49,29 +50,65 @@ class QuerySetProtocol(Protocol):
 
     def defer(self, *fields: Sequence[str]) -> "QuerySet": ...
 
+    def trusted_rows(self, trusted: bool = True) -> "QuerySet": ...
+
+    def load_related(self, *fields: Union[str, Sequence[str]]) -> "QuerySet": ...
+
+    def annotate(self, **annotations: Any) -> "QuerySet": ...
+
+    def cache(self, ttl: Optional[float] = None) -> "QuerySet": ...
+
+    def no_cache(self) -> "QuerySet": ...
+
     async def exists(self) -> bool: ...
 
     async def count(self) -> int: ...
 
+    async def estimated_count(self) -> int: ...
+
+    async def aggregate(self, **aggregates: Any) -> Union[Dict[str, Any], List[Dict[str, Any]]]: ...
+
+    async def paginate_after(
+        self,
+        cursor: Optional[str] = None,
+        order_by: Union[Sequence[str], str, None] = None,
+        page_size: int = 100,
+    ) -> Tuple[List[EdgyModel], Optional[str]]: ...
+
     async def get_or_none(self, **kwargs: Any) -> Union[EdgyModel, None]: ...
 
     async def all(self, **kwargs: Any) -> Sequence[Optional[EdgyModel]]: ...
 
     async def get(self, **kwargs: Any) -> EdgyModel: ...
 
+    def iterate(self, chunk_size: int = 100) -> AsyncIterator[EdgyModel]: ...
+
     async def first(self, **kwargs: Any) -> Union[EdgyModel, None]: ...
 
     async def last(self, **kwargs: Any) -> Union[EdgyModel, None]: ...
 
     async def create(self, **kwargs: Any) -> EdgyModel: ...
 
-    async def bulk_create(self, objs: Sequence[List[Dict[Any, Any]]]) -> None: ...
+    async def bulk_create(
+        self, objs: Sequence[List[Dict[Any, Any]]], batch_size: Optional[int] = None, returning: bool = True
+    ) -> Union[List[EdgyModel], None]: ...
+
+    async def bulk_upsert(
+        self,
+        objs: List[Dict[Any, Any]],
+        conflict_fields: Optional[Sequence[str]] = None,
+        update_fields: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None,
+        returning: bool = True,
+    ) -> Union[List[EdgyModel], None]: ...
 
-    async def bulk_update(self, objs: Sequence[List[EdgyModel]], fields: List[str]) -> None: ...
+    async def bulk_update(
+        self, objs: Sequence[List[EdgyModel]], fields: List[str], batch_size: Optional[int] = None
+    ) -> int: ...
 
-    async def delete(self) -> None: ...
+    async def delete(self) -> int: ...
 
-    async def update(self, **kwargs: Any) -> None: ...
+    async def update(self, **kwargs: Any) -> int: ...
 
     async def values(
         self,
@@ -0,0 +1,107 @@
+import pytest
+
+import edgy
+from edgy.exceptions import RelationshipIncompatible
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class Album(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+class Track(edgy.Model):
+    album = edgy.ForeignKey(Album, related_name="tracks", null=True)
+    title = edgy.CharField(max_length=100)
+    position = edgy.IntegerField(default=0)
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def test_save_related_existing_and_new():
+    existing = [await Track.query.create(title=f"Track {index}", position=index) for index in range(3)]
+    new = Track(title="New", position=3)
+
+    album = await Album.query.create(name="Malibu", tracks=[*existing, new])
+
+    assert new.id is not None
+    assert new.album.id == album.id
+    assert all(track.album.id == album.id for track in existing)
+    tracks = await Track.query.filter(album=album).order_by("position")
+    assert [track.title for track in tracks] == ["Track 0", "Track 1", "Track 2", "New"]
+    assert await Track.query.count() == 4
+
+
+async def test_add_many():
+    album = await Album.query.create(name="Malibu")
+    other = await Album.query.create(name="Other")
+    tracks = await Track.query.bulk_create([{"title": f"Track {index}", "album": other} for index in range(50)])
+
+    new = Track(title="New")
+    await album.tracks.add_many([*tracks[:40], new])
+
+    assert await album.tracks.count() == 41
+    assert await other.tracks.count() == 10
+    assert tracks[0].album.id == album.id
+    # the foreign key was written already
+    assert tracks[0].get_changed_fields() == set()
+    assert new.get_changed_fields() == set()
+
+
+async def test_add_many_signals():
+    album = await Album.query.create(name="Malibu")
+    tracks = [await Track.query.create(title=f"Track {index}") for index in range(3)]
+    received = []
+
+    async def pre_save(sender, instance, **kwargs):
+        received.append(("pre_save", instance.title))
+
+    async def post_save(sender, instance, **kwargs):
+        received.append(("post_save", instance.title))
+
+    async def post_update(sender, instance, **kwargs):
+        received.append(("post_update", None))
+
+    Track.signals.pre_save.connect(pre_save)
+    Track.signals.post_save.connect(post_save)
+    Track.signals.post_update.connect(post_update)
+    try:
+        await album.tracks.add_many(tracks)
+    finally:
+        Track.signals.pre_save.disconnect(pre_save)
+        Track.signals.post_save.disconnect(post_save)
+        Track.signals.post_update.disconnect(post_update)
+
+    assert received.count(("post_update", None)) == 1
+    assert [title for name, title in received if name == "pre_save"] == ["Track 0", "Track 1", "Track 2"]
+    assert [title for name, title in received if name == "post_save"] == ["Track 0", "Track 1", "Track 2"]
+
+
+async def test_add_many_incompatible():
+    album = await Album.query.create(name="Malibu")
+
+    with pytest.raises(RelationshipIncompatible):
+        await album.tracks.add_many([album])
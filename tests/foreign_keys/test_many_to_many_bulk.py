@@ -0,0 +1,141 @@
+import pytest
+from sqlalchemy.dialects import mysql
+
+import edgy
+from edgy.core.db.querysets.upsert import build_insert_ignore
+from edgy.exceptions import RelationshipIncompatible
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+pytestmark = pytest.mark.anyio
+
+database = Database(DATABASE_URL)
+models = edgy.Registry(database=database)
+
+
+class Tag(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+class Article(edgy.Model):
+    title = edgy.CharField(max_length=100)
+    tags = edgy.ManyToMany(Tag, related_name="articles")
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def tag_names(article):
+    return sorted(tag.name for tag in await article.tags.all())
+
+
+async def test_add_many():
+    tags = await Tag.query.bulk_create([{"name": f"tag {index:03}"} for index in range(200)])
+    article = await Article.query.create(title="Edgy")
+
+    await article.tags.add_many(tags)
+    assert await article.tags.count() == 200
+
+    # existing relations are skipped
+    await article.tags.add_many(tags[:10])
+    assert await article.tags.count() == 200
+    assert await tags[0].articles.count() == 1
+
+
+async def test_add_many_one_statement(monkeypatch):
+    tags = await Tag.query.bulk_create([{"name": f"tag {index}"} for index in range(20)])
+    article = await Article.query.create(title="Edgy")
+
+    statements = []
+    execute = database.execute
+
+    async def counting_execute(expression, *args):
+        statements.append(expression)
+        return await execute(expression, *args)
+
+    monkeypatch.setattr(database, "execute", counting_execute)
+    await article.tags.add_many(tags)
+    assert len(statements) == 1
+    assert await article.tags.count() == 20
+
+
+async def test_remove_many():
+    tags = await Tag.query.bulk_create([{"name": f"tag {index}"} for index in range(5)])
+    article = await Article.query.create(title="Edgy")
+    await article.tags.add_many(tags)
+
+    assert await article.tags.remove_many(tags[:3]) == 3
+    assert await tag_names(article) == ["tag 3", "tag 4"]
+    # not related children are ignored
+    assert await article.tags.remove_many(tags[:3]) == 0
+
+
+async def test_set():
+    tags = await Tag.query.bulk_create([{"name": f"tag {index}"} for index in range(5)])
+    article = await Article.query.create(title="Edgy")
+    other = await Article.query.create(title="Other")
+    await article.tags.add_many(tags[:3])
+    await other.tags.add_many(tags)
+
+    await article.tags.set([tags[2], tags[3], tags[4]])
+    assert await tag_names(article) == ["tag 2", "tag 3", "tag 4"]
+
+    await article.tags.set([])
+    assert await article.tags.count() == 0
+    assert await other.tags.count() == 5
+
+
+async def test_reverse_side():
+    tag = await Tag.query.create(name="python")
+    articles = [await Article.query.create(title=f"Article {index}") for index in range(3)]
+
+    await tag.articles.add_many(articles)
+    assert await tag.articles.count() == 3
+    assert await articles[0].tags.count() == 1
+
+    await tag.articles.set(articles[1:])
+    assert await articles[0].tags.count() == 0
+    assert await tag.articles.count() == 2
+
+
+async def test_save_related():
+    tags = await Tag.query.bulk_create([{"name": f"tag {index}"} for index in range(3)])
+
+    article = await Article.query.create(title="Edgy", tags=tags)
+    assert await tag_names(article) == ["tag 0", "tag 1", "tag 2"]
+
+
+async def test_add_many_incompatible():
+    article = await Article.query.create(title="Edgy")
+
+    with pytest.raises(RelationshipIncompatible):
+        await article.tags.add_many([article])
+
+    with pytest.raises(RelationshipIncompatible):
+        await article.tags.remove_many([article])
+
+
+def test_add_many_mysql_skips_only_duplicates():
+    table = Article.meta.fields_mapping["tags"].through.table
+    expression = build_insert_ignore("mysql", table, [{"article": 1, "tag": 1}])
+    sql = str(expression.compile(dialect=mysql.dialect()))
+    # INSERT IGNORE would also drop the foreign key violations
+    assert "IGNORE" not in sql
+    assert sql.endswith(f"ON DUPLICATE KEY UPDATE article = {table.name}.article, tag = {table.name}.tag")
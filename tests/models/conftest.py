@@ -0,0 +1,23 @@
+import pytest
+import sqlalchemy
+
+
+@pytest.fixture
+def queries(request, monkeypatch):
+    """
+    Records the selects sent via `fetch_all` and `fetch_one` of the `database` of the test module.
+    """
+    database = request.module.database
+    executed = []
+
+    def count(method):
+        async def wrapper(expression, *args, **kwargs):
+            if isinstance(expression, sqlalchemy.Select):
+                executed.append(expression)
+            return await method(expression, *args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(database, "fetch_all", count(database.fetch_all))
+    monkeypatch.setattr(database, "fetch_one", count(database.fetch_one))
+    return executed
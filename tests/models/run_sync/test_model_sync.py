@@ -1,7 +1,12 @@
+import asyncio
+import contextvars
+from concurrent import futures
+
 import pytest
 
 import edgy
 from edgy import run_sync
+from edgy.core.utils.sync import get_background_loop
 from edgy.testclient import DatabaseTestClient as Database
 from tests.settings import DATABASE_URL
 
@@ -45,3 +50,54 @@ async def test_model_first():
     users = run_sync(User.query.all())
 
     assert len(users) == 2
+
+
+async def test_sync_queryset():
+    User.query.sync.create(name="Test", language="EN")
+    User.query.sync.create(name="Jane", language="DE")
+    User.query.sync.create(name="Lucy", language="EN")
+
+    users = User.query.sync.filter(language="EN").order_by("name").all()
+    assert [user.name for user in users] == ["Lucy", "Test"]
+
+    assert User.query.sync.get(name="Jane").language == "DE"
+    assert User.query.sync.count() == 3
+    assert User.query.sync.exclude(language="EN").exists()
+    assert [user.name for user in User.query.sync.order_by("-name")] == ["Test", "Lucy", "Jane"]
+    assert [user.name for user in User.query.sync.order_by("name").iterate()] == ["Jane", "Lucy", "Test"]
+    assert User.query.sync.filter(name="Test").update(language="FR") == 1
+    assert User.query.sync.values_list(["language"], flat=True) is not None
+
+
+def run_in_thread(function):
+    # a thread without running loop, like a plain sync application
+    with futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(function).result()
+
+
+async def get_loop():
+    return asyncio.get_running_loop()
+
+
+def test_run_sync_reuses_the_loop():
+    loops = run_in_thread(lambda: (run_sync(get_loop()), run_sync(get_loop())))
+    assert loops[0] is loops[1]
+    assert loops[0] is get_background_loop()
+    assert run_in_thread(lambda: run_sync(get_loop())) is loops[0]
+
+
+def test_run_sync_context_and_nesting():
+    variable = contextvars.ContextVar("variable", default=None)
+
+    async def get_variable():
+        return variable.get()
+
+    async def nested():
+        assert asyncio.get_running_loop() is get_background_loop()
+        return run_sync(get_variable())
+
+    def run():
+        variable.set("edgy")
+        return run_sync(get_variable()), run_sync(nested())
+
+    assert run_in_thread(run) == ("edgy", "edgy")
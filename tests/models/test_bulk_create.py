@@ -76,3 +76,58 @@ async def test_bulk_create():
     assert products[1].data == {"foo": 456}
     assert products[1].value == 456.789
     assert products[1].status == StatusEnum.DRAFT
+
+
+async def test_bulk_create_returning():
+    products = await Product.query.bulk_create(
+        [
+            {"id": 1, "data": {"foo": 123}, "value": 123.456, "status": StatusEnum.RELEASED},
+            {"id": 2, "data": {"foo": 456}, "value": 456.789},
+        ]
+    )
+    assert [product.id for product in products] == [1, 2]
+    assert products[0].data == {"foo": 123}
+    assert products[0].status == StatusEnum.RELEASED
+    assert products[1].status == StatusEnum.DRAFT
+    assert products[1].created_date is not None
+
+
+async def test_bulk_create_batches():
+    products = await Product.query.bulk_create(
+        [{"id": index, "value": float(index)} for index in range(1, 101)], batch_size=7
+    )
+    assert [product.id for product in products] == list(range(1, 101))
+    assert await Product.query.count() == 100
+
+
+async def test_bulk_create_without_returning():
+    assert await Product.query.bulk_create([{"id": 1}, {"id": 2}], returning=False) is None
+    assert await Product.query.count() == 2
+    assert await Product.query.bulk_create([]) == []
+
+
+async def test_bulk_create_batch_size_from_parameter_limit(monkeypatch):
+    monkeypatch.setitem(edgy.settings.bind_parameter_limits, database.url.dialect, 40)
+    # 15 columns per row, so only two rows fit into a statement
+    queryset = Product.query.all()
+    assert queryset._get_batch_size(len(Product.table.columns)) == 2
+    assert queryset._get_batch_size(len(Product.table.columns), batch_size=1) == 1
+    assert queryset._get_batch_size(len(Product.table.columns), batch_size=100) == 2
+
+    products = await Product.query.bulk_create([{"id": index} for index in range(1, 6)])
+    assert len(products) == 5
+    assert await Product.query.count() == 5
+
+
+async def test_bulk_create_without_returning_dialect(monkeypatch):
+    monkeypatch.setattr(edgy.settings, "returning_dialects", set())
+    products = await Product.query.bulk_create(
+        [{"id": 1, "data": {"foo": 123}, "status": StatusEnum.RELEASED}, {"id": 2, "value": 1.5}]
+    )
+    assert all(type(product) is Product for product in products)
+    assert [product.id for product in products] == [1, 2]
+    assert products[0].data == {"foo": 123}
+    assert products[0].status == StatusEnum.RELEASED
+    assert products[1].value == 1.5
+    assert products[1].created_date is not None
+    assert await Product.query.count() == 2
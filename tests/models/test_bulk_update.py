@@ -130,3 +130,57 @@ async def test_bulk_update_with_relation():
     tracks = await Track.query.all()
     assert tracks[0].album.pk == album2.pk
     assert tracks[1].album.pk == album2.pk
+
+
+async def test_bulk_update_count_and_batches():
+    await Product.query.bulk_create([{"id": index, "value": float(index)} for index in range(1, 11)])
+    products = await Product.query.order_by("id")
+    created = [product.created for product in products]
+    for product in products:
+        product.value = product.value * 2
+        product.description = f"product {product.id}"
+
+    count = await Product.query.bulk_update(products, fields=["value", "description"], batch_size=3)
+    assert count == 10
+
+    products = await Product.query.order_by("id")
+    assert [product.value for product in products] == [float(index * 2) for index in range(1, 11)]
+    assert products[3].description == "product 4"
+    # fields not given are kept
+    assert [product.created for product in products] == created
+
+
+async def test_bulk_update_case_fallback(monkeypatch):
+    monkeypatch.setattr(edgy.settings, "postgres_dialects", set())
+    await Product.query.bulk_create(
+        [{"id": 1, "status": StatusEnum.DRAFT, "data": {"a": 1}}, {"id": 2, "status": StatusEnum.DRAFT}]
+    )
+    products = await Product.query.order_by("id")
+    products[0].status = StatusEnum.RELEASED
+    products[1].data = {"b": 2}
+
+    assert await Product.query.bulk_update(products, fields=["status", "data"]) == 2
+
+    products = await Product.query.order_by("id")
+    assert products[0].status == StatusEnum.RELEASED
+    assert products[0].data == {"a": 1}
+    assert products[1].status == StatusEnum.DRAFT
+    assert products[1].data == {"b": 2}
+
+
+async def test_bulk_update_empty():
+    assert await Product.query.bulk_update([], fields=["value"]) == 0
+
+
+@pytest.mark.parametrize("postgres_dialects", [None, set()], ids=["values", "case"])
+async def test_bulk_update_counts_updated_rows(monkeypatch, postgres_dialects):
+    if postgres_dialects is not None:
+        monkeypatch.setattr(edgy.settings, "postgres_dialects", postgres_dialects)
+    await Product.query.bulk_create([{"id": index} for index in range(1, 4)])
+    products = await Product.query.order_by("id")
+    await products[1].delete()
+    for product in products:
+        product.value = 1.0
+
+    assert await Product.query.bulk_update(products, fields=["value"]) == 2
+    assert await Product.query.filter(value=1.0).count() == 2
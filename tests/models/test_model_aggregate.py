@@ -0,0 +1,172 @@
+from decimal import Decimal
+
+import pytest
+
+import edgy
+from edgy import Avg, Count, Max, Min, Sum
+from edgy.exceptions import QuerySetError
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class Album(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+class Track(edgy.Model):
+    album = edgy.ForeignKey(Album, related_name="tracks")
+    title = edgy.CharField(max_length=100)
+    position = edgy.IntegerField()
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def create_albums():
+    albums = [
+        await Album.query.create(name="Malibu"),
+        await Album.query.create(name="Sunset"),
+        await Album.query.create(name="Empty"),
+    ]
+    for position in range(1, 4):
+        await Track.query.create(album=albums[0], title=f"Malibu {position}", position=position)
+    for position in range(1, 3):
+        await Track.query.create(album=albums[1], title=f"Sunset {position}", position=position)
+    return albums
+
+
+async def test_aggregate():
+    await create_albums()
+
+    result = await Track.query.aggregate(
+        total=Sum("position"), average=Avg("position"), lowest=Min("position"), highest=Max("position"), n=Count("id")
+    )
+    assert result == {"total": 9, "average": Decimal("1.8"), "lowest": 1, "highest": 3, "n": 5}
+
+
+async def test_aggregate_filtered():
+    albums = await create_albums()
+
+    assert await Track.query.filter(album=albums[1]).aggregate(total=Sum("position")) == {"total": 3}
+    assert await Track.query.filter(album__name="Malibu").aggregate(n=Count("id")) == {"n": 3}
+    assert await Track.query.all(album=albums[1]).aggregate(n=Count("id")) == {"n": 2}
+
+
+async def test_aggregate_empty():
+    await create_albums()
+
+    result = await Track.query.filter(position__gt=10).aggregate(total=Sum("position"), n=Count("id"))
+    assert result == {"total": None, "n": 0}
+
+
+async def test_aggregate_related():
+    await create_albums()
+
+    assert await Album.query.aggregate(n=Count("tracks"), highest=Max("tracks__position")) == {"n": 5, "highest": 3}
+    assert await Track.query.aggregate(n=Count("album", distinct=True)) == {"n": 2}
+    assert await Track.query.aggregate(first=Min("album__name")) == {"first": "Malibu"}
+
+
+async def test_aggregate_limited():
+    await create_albums()
+
+    result = await Track.query.order_by("-position").limit(2).aggregate(total=Sum("position"))
+    assert result == {"total": 5}
+
+
+async def test_aggregate_group_by():
+    albums = await create_albums()
+
+    result = await Track.query.group_by("album").order_by("album").aggregate(n=Count("id"), total=Sum("position"))
+    assert result == [
+        {"album": albums[0].id, "n": 3, "total": 6},
+        {"album": albums[1].id, "n": 2, "total": 3},
+    ]
+
+
+async def test_aggregate_invalid():
+    with pytest.raises(QuerySetError):
+        await Track.query.aggregate()
+
+    with pytest.raises(QuerySetError):
+        await Track.query.aggregate(n="id")
+
+    with pytest.raises(QuerySetError):
+        await Track.query.aggregate(n=Count("unknown"))
+
+
+async def test_annotate():
+    await create_albums()
+
+    albums = await Album.query.annotate(n_tracks=Count("tracks"), last=Max("tracks__position")).order_by("id")
+    assert [(album.name, album.n_tracks, album.last) for album in albums] == [
+        ("Malibu", 3, 3),
+        ("Sunset", 2, 2),
+        ("Empty", 0, None),
+    ]
+
+
+async def test_annotate_order_by_and_filter():
+    await create_albums()
+
+    albums = await Album.query.annotate(n_tracks=Count("tracks")).filter(name__icontains="u").order_by("-n_tracks")
+    assert [album.name for album in albums] == ["Malibu", "Sunset"]
+
+    album = await Album.query.annotate(n_tracks=Count("tracks")).get(name="Sunset")
+    assert album.n_tracks == 2
+    assert await Album.query.annotate(n_tracks=Count("tracks")).count() == 3
+
+
+async def test_annotate_values():
+    await create_albums()
+
+    values = await Album.query.annotate(n_tracks=Count("tracks")).order_by("id").values(["name", "n_tracks"])
+    assert values == [
+        {"name": "Malibu", "n_tracks": 3},
+        {"name": "Sunset", "n_tracks": 2},
+        {"name": "Empty", "n_tracks": 0},
+    ]
+
+
+async def test_annotate_select_related():
+    await create_albums()
+
+    tracks = await Track.query.select_related("album").annotate(album_name=Min("album__name")).order_by("id")
+    assert [track.album_name for track in tracks] == ["Malibu", "Malibu", "Malibu", "Sunset", "Sunset"]
+    assert tracks[0].album.name == "Malibu"
+
+
+def test_annotate_invalid():
+    with pytest.raises(QuerySetError):
+        Album.query.annotate(name=Count("tracks"))
+
+    with pytest.raises(QuerySetError):
+        Album.query.annotate(n_tracks="tracks")
+
+    with pytest.raises(QuerySetError):
+        Track.query.annotate(n_album_tracks=Count("album__tracks"))
+
+    with pytest.raises(QuerySetError):
+        Album.query.annotate(n_tracks=Count("tracks__unknown"))
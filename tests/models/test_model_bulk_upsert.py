@@ -0,0 +1,212 @@
+import uuid
+
+import pytest
+
+import edgy
+from edgy.core.db.querysets import base as base_module
+from edgy.exceptions import QuerySetError
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class Product(edgy.Model):
+    sku = edgy.CharField(max_length=20, unique=True)
+    name = edgy.CharField(max_length=100)
+    stock = edgy.IntegerField(default=0)
+
+    class Meta:
+        registry = models
+
+
+class Price(edgy.Model):
+    product = edgy.CharField(max_length=20)
+    currency = edgy.CharField(max_length=3)
+    amount = edgy.IntegerField()
+
+    class Meta:
+        registry = models
+        unique_together = [("product", "currency")]
+
+
+codes = []
+
+
+def new_code():
+    codes.append(uuid.uuid4())
+    return codes[-1]
+
+
+class Ticket(edgy.Model):
+    name = edgy.CharField(max_length=20, unique=True)
+    code = edgy.UUIDField(default=new_code)
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def test_bulk_upsert():
+    await Product.query.create(sku="A1", name="Old", stock=3)
+
+    products = await Product.query.bulk_upsert(
+        [{"sku": "A1", "name": "Apple", "stock": 5}, {"sku": "B2", "name": "Banana", "stock": 7}],
+        conflict_fields=["sku"],
+    )
+    assert [(product.sku, product.name, product.stock) for product in products] == [
+        ("A1", "Apple", 5),
+        ("B2", "Banana", 7),
+    ]
+    assert all(product.id is not None for product in products)
+    assert await Product.query.count() == 2
+
+
+async def test_bulk_upsert_update_fields():
+    await Product.query.create(sku="A1", name="Old", stock=3)
+
+    products = await Product.query.bulk_upsert(
+        [{"sku": "A1", "name": "Apple", "stock": 5}], conflict_fields=["sku"], update_fields=["stock"]
+    )
+    assert (products[0].name, products[0].stock) == ("Old", 5)
+
+
+async def test_bulk_upsert_no_update_fields_returns_existing():
+    await Product.query.create(sku="A1", name="Old", stock=3)
+
+    products = await Product.query.bulk_upsert(
+        [{"sku": "A1", "name": "Apple"}, {"sku": "B2", "name": "Banana"}], conflict_fields=["sku"], update_fields=[]
+    )
+    assert [(product.sku, product.name) for product in products] == [("A1", "Old"), ("B2", "Banana")]
+
+
+async def test_bulk_upsert_composite_unique_and_batches():
+    await Price.query.create(product="A1", currency="EUR", amount=1)
+
+    objs = [{"product": f"A{index}", "currency": "EUR", "amount": index * 10} for index in range(1, 21)]
+    prices = await Price.query.bulk_upsert(objs, conflict_fields=["product", "currency"], batch_size=6)
+    assert [price.amount for price in prices] == [index * 10 for index in range(1, 21)]
+    assert await Price.query.count() == 20
+
+    assert await Price.query.bulk_upsert(objs[:2], conflict_fields=["product", "currency"], returning=False) is None
+
+
+async def test_bulk_upsert_invalid():
+    with pytest.raises(QuerySetError):
+        await Product.query.bulk_upsert([{"sku": "A1", "name": "Apple"}], conflict_fields=["unknown"])
+
+    assert await Product.query.bulk_upsert([], conflict_fields=["sku"]) == []
+
+
+async def test_get_or_create_unique():
+    product, created = await Product.query.get_or_create(sku="A1", defaults={"name": "Apple"})
+    assert created is True
+    assert product.id is not None
+    assert product.name == "Apple"
+
+    product2, created = await Product.query.get_or_create(sku="A1", defaults={"name": "Other"})
+    assert created is False
+    assert product2.id == product.id
+    assert product2.name == "Apple"
+
+
+async def test_update_or_create_unique():
+    product, created = await Product.query.update_or_create(sku="A1", defaults={"name": "Apple", "stock": 1})
+    assert created is True
+    assert (product.name, product.stock) == ("Apple", 1)
+
+    product2, created = await Product.query.update_or_create(sku="A1", defaults={"stock": 2})
+    assert created is False
+    assert product2.id == product.id
+    assert (product2.name, product2.stock) == ("Apple", 2)
+    assert (await Product.query.get(sku="A1")).stock == 2
+
+
+async def test_update_or_create_composite_unique():
+    price, created = await Price.query.update_or_create(product="A1", currency="EUR", defaults={"amount": 1})
+    assert created is True
+
+    price2, created = await Price.query.update_or_create(product="A1", currency="EUR", defaults={"amount": 2})
+    assert created is False
+    assert price2.id == price.id
+    assert price2.amount == 2
+
+
+async def test_upsert_signals():
+    events = []
+
+    def receiver(name):
+        async def receive(sender, instance, **kwargs):
+            events.append((name, sender, instance.sku, instance.name))
+
+        return receive
+
+    receivers = {name: receiver(name) for name in ("pre_save", "post_save", "pre_update", "post_update")}
+    for name, receive in receivers.items():
+        getattr(Product.signals, name).connect(receive)
+    try:
+        await Product.query.update_or_create(sku="A1", defaults={"name": "Apple"})
+        await Product.query.update_or_create(sku="A1", defaults={"name": "Apple 2"})
+        await Product.query.get_or_create(sku="B2", defaults={"name": "Banana"})
+    finally:
+        for name, receive in receivers.items():
+            getattr(Product.signals, name).disconnect(receive)
+    assert events == [
+        ("pre_save", Product, "A1", "Apple"),
+        ("post_save", Product, "A1", "Apple"),
+        # the attempt of the insert, which updated the record
+        ("pre_save", Product, "A1", "Apple 2"),
+        ("post_update", Product, "A1", "Apple 2"),
+        ("pre_save", Product, "B2", "Banana"),
+        ("post_save", Product, "B2", "Banana"),
+    ]
+
+
+async def test_upsert_defaults_computed_once():
+    codes.clear()
+    ticket, created = await Ticket.query.update_or_create(name="A", defaults={})
+    assert created is True
+    assert codes == [ticket.code]
+
+    ticket2, created = await Ticket.query.update_or_create(name="A", defaults={})
+    assert created is False
+    assert ticket2.code == ticket.code
+
+    ticket3, created = await Ticket.query.get_or_create(name="B", defaults={})
+    assert created is True
+    assert codes[-1] == ticket3.code
+    assert len(codes) == 3
+
+
+async def test_update_or_create_attempts_are_limited(monkeypatch):
+    attempts = []
+
+    async def insert_on_conflict_do_nothing(self, *args):
+        # a conflicting record, which is always deleted before the update
+        attempts.append(args)
+        return None
+
+    # like the databases without a created flag
+    monkeypatch.setattr(base_module, "supports_created_flag", lambda dialect: False)
+    monkeypatch.setattr(edgy.QuerySet, "_insert_on_conflict_do_nothing", insert_on_conflict_do_nothing)
+    product, created = await Product.query.update_or_create(sku="A1", defaults={"name": "Apple"})
+    assert len(attempts) == edgy.QuerySet.UPSERT_ATTEMPTS
+    # falls back to get and create
+    assert created is True
+    assert (product.sku, product.name) == ("A1", "Apple")
@@ -0,0 +1,171 @@
+import time
+import uuid
+
+import pytest
+
+import edgy
+from edgy.exceptions import MultipleObjectsReturned, ObjectNotFound
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class Country(edgy.Model):
+    code = edgy.CharField(max_length=2, unique=True)
+    name = edgy.CharField(max_length=100)
+    region = edgy.CharField(max_length=20)
+
+    class Meta:
+        registry = models
+        cache_full_table = True
+
+
+class Currency(edgy.Model):
+    code = edgy.CharField(max_length=3)
+
+    class Meta:
+        registry = models
+        cache_full_table = 60
+
+
+class Label(edgy.Model):
+    id = edgy.UUIDField(primary_key=True, default=uuid.uuid4)
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+        cache_full_table = True
+
+
+class Address(edgy.Model):
+    country = edgy.ForeignKey(Country, related_name="addresses")
+    street = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def create_countries():
+    await Country.query.bulk_create(
+        [
+            {"code": "PT", "name": "Portugal", "region": "EU"},
+            {"code": "ES", "name": "Spain", "region": "EU"},
+            {"code": "BR", "name": "Brazil", "region": "SA"},
+        ]
+    )
+
+
+async def test_get_and_filter_from_memory(queries):
+    await create_countries()
+
+    portugal = await Country.query.get(code="PT")
+    assert portugal.name == "Portugal"
+    assert len(queries) == 1
+
+    assert (await Country.query.get(pk=portugal.pk)).code == "PT"
+    assert (await Country.query.get_or_none(code="XX")) is None
+    assert sorted(country.code for country in await Country.query.filter(region="EU")) == ["ES", "PT"]
+    assert [country.code for country in await Country.query.filter(code__in=["BR"], region="SA")] == ["BR"]
+    assert len(await Country.query.all()) == 3
+    with pytest.raises(ObjectNotFound):
+        await Country.query.get(code="XX")
+    with pytest.raises(MultipleObjectsReturned):
+        await Country.query.get(region="EU")
+    assert len(queries) == 1
+
+
+async def test_unsupported_lookups_query_the_database(queries):
+    await create_countries()
+    await Country.query.all()
+    assert len(queries) == 1
+
+    assert [country.code for country in await Country.query.filter(name__icontains="port")] == ["PT"]
+    assert [country.code for country in await Country.query.order_by("code").limit(1)] == ["BR"]
+    assert [country.code for country in await Country.query.exclude(region="EU")] == ["BR"]
+    assert (await Country.query.no_cache().get(code="PT")).name == "Portugal"
+    assert len(queries) == 5
+
+
+async def test_foreign_key_stubs_resolved_from_memory(queries):
+    await create_countries()
+    portugal = await Country.query.get(code="PT")
+    await Address.query.create(country=portugal, street="Rua Augusta")
+    del queries[:]
+
+    address = await Address.query.get(street="Rua Augusta")
+    await address.country.load()
+    assert address.country.name == "Portugal"
+
+    addresses = await Address.query.load_related("country")
+    assert addresses[0].country.name == "Portugal"
+    assert len(queries) == 2
+
+
+async def test_writes_refresh_the_table(queries):
+    await create_countries()
+    portugal = await Country.query.get(code="PT")
+
+    await portugal.update(name="Portuguese Republic")
+    assert (await Country.query.get(code="PT")).name == "Portuguese Republic"
+
+    await Country.query.create(code="FR", name="France", region="EU")
+    assert len(await Country.query.filter(region="EU")) == 3
+
+    await Country.query.filter(code="FR").delete()
+    assert len(await Country.query.filter(region="EU")) == 2
+    assert len(queries) == 4
+
+
+async def test_ttl_expires_the_table(queries, monkeypatch):
+    await Currency.query.create(code="EUR")
+    assert (await Currency.query.get(code="EUR")).code == "EUR"
+    assert (await Currency.query.get(code="EUR")).code == "EUR"
+    assert len(queries) == 1
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert (await Currency.query.get(code="EUR")).code == "EUR"
+    assert len(queries) == 2
+
+
+async def test_table_cache_index_and_invalidate():
+    await create_countries()
+    cached_table = models.full_table_cache.get(database, Country.table)
+    assert cached_table is None
+
+    await Country.query.all()
+    cached_table = models.full_table_cache.get(database, Country.table)
+    assert sorted(cached_table.by_pk.keys()) == sorted((country.pk,) for country in await Country.query.all())
+
+    models.full_table_cache.invalidate(Country.table.name)
+    assert models.full_table_cache.get(database, Country.table) is None
+
+
+async def test_values_converted_into_the_column_types(queries):
+    label = await Label.query.create(name="Edgy")
+    await Label.query.create(name="Other")
+
+    assert [item.name for item in await Label.query.filter(id=str(label.id))] == ["Edgy"]
+    assert (await Label.query.get(id=str(label.id))).name == "Edgy"
+    assert [item.name for item in await Label.query.filter(id__in=[str(label.id)])] == ["Edgy"]
+    assert await Label.query.filter(id=str(uuid.uuid4())) == []
+    # the whole table was loaded once
+    assert len(queries) == 1
@@ -0,0 +1,94 @@
+import copy
+
+import pytest
+
+import edgy
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_ALTERNATIVE_URL, DATABASE_URL
+
+pytestmark = pytest.mark.anyio
+
+database = Database(url=DATABASE_URL)
+another_db = Database(url=DATABASE_ALTERNATIVE_URL)
+models = edgy.Registry(database=database, extra={"another": another_db})
+another_registry = copy.copy(models)
+another_registry.database = another_db
+
+
+class Ref(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+        cache = True
+
+
+class Item(edgy.Model):
+    id = edgy.IntegerField(primary_key=True, autoincrement=False)
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+        pk_cache = True
+
+
+class Region(edgy.Model):
+    code = edgy.CharField(max_length=2, unique=True)
+
+    class Meta:
+        registry = models
+        cache_full_table = True
+
+
+@pytest.fixture(autouse=True, scope="module")
+async def create_test_database():
+    await models.create_all()
+    await another_registry.create_all()
+    yield
+    await models.drop_all()
+    await another_registry.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+@pytest.fixture(autouse=True)
+async def rollback_another_db_connections():
+    with another_db.force_rollback():
+        async with another_db:
+            yield
+
+
+async def test_query_cache_per_database():
+    await Ref.query.bulk_create([{"name": "main"}])
+    await Ref.query.using_with_db("another").bulk_create([{"name": "another"}])
+
+    for _ in range(2):
+        assert [ref.name for ref in await Ref.query.all()] == ["main"]
+        assert [ref.name for ref in await Ref.query.using_with_db("another").all()] == ["another"]
+
+
+async def test_pk_cache_per_database():
+    await Item.query.bulk_create([{"id": 1, "name": "main"}])
+    await Item.query.using_with_db("another").bulk_create([{"id": 1, "name": "another"}])
+
+    for _ in range(2):
+        assert (await Item.query.get(pk=1)).name == "main"
+        assert (await Item.query.using_with_db("another").get(pk=1)).name == "another"
+        assert (await Item.query.using_with_db("another").get_or_none(pk=1)).name == "another"
+    assert (models.pk_cache.hits, models.pk_cache.misses) == (4, 2)
+
+
+async def test_full_table_cache_per_database():
+    await Region.query.bulk_create([{"code": "EU"}])
+    await Region.query.using_with_db("another").bulk_create([{"code": "AS"}])
+
+    for _ in range(2):
+        assert [region.code for region in await Region.query.all()] == ["EU"]
+        assert [region.code for region in await Region.query.using_with_db("another").all()] == ["AS"]
+        assert await Region.query.using_with_db("another").get_or_none(code="EU") is None
+        assert (await Region.query.using_with_db("another").get(code="AS")).code == "AS"
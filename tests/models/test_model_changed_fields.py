@@ -0,0 +1,180 @@
+import pytest
+
+import edgy
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class User(edgy.Model):
+    name = edgy.CharField(max_length=100)
+    is_active = edgy.BooleanField(default=True)
+    profile = edgy.JSONField(default=dict)
+
+    class Meta:
+        registry = models
+
+
+class Post(edgy.Model):
+    user = edgy.ForeignKey(User, related_name="posts")
+    title = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+@pytest.fixture
+def updates():
+    collected = []
+
+    async def pre_update(sender, instance, **kwargs):
+        if "kwargs" in kwargs:
+            collected.append(set(kwargs["kwargs"]))
+
+    User.signals.pre_update.connect(pre_update)
+    Post.signals.pre_update.connect(pre_update)
+    yield collected
+    User.signals.pre_update.disconnect(pre_update)
+    Post.signals.pre_update.disconnect(pre_update)
+
+
+async def test_changed_fields_tracking():
+    await User.query.create(name="Edgy", profile={"a": 1})
+
+    user = await User.query.get(name="Edgy")
+    assert user.get_changed_fields() == set()
+
+    user.is_active = False
+    assert user.get_changed_fields() == {"is_active"}
+
+    await user.save()
+    assert user.get_changed_fields() == set()
+
+
+async def test_save_writes_changed_fields(updates):
+    await User.query.create(name="Edgy", profile={"a": 1})
+    user = await User.query.get(name="Edgy")
+
+    user.is_active = False
+    await user.save()
+    assert updates == [{"is_active"}]
+
+    stored = await User.query.get(pk=user.pk)
+    assert (stored.name, stored.is_active, stored.profile) == ("Edgy", False, {"a": 1})
+
+
+async def test_save_without_changes_skips_update(updates, monkeypatch):
+    await User.query.create(name="Edgy")
+    user = await User.query.get(name="Edgy")
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("no statement expected")
+
+    saved = []
+
+    async def post_save(sender, instance, **kwargs):
+        saved.append(instance)
+
+    monkeypatch.setattr(database, "execute", fail)
+    monkeypatch.setattr(database, "fetch_one", fail)
+    User.signals.post_save.connect(post_save)
+    try:
+        await user.save()
+    finally:
+        User.signals.post_save.disconnect(post_save)
+    # no signals, which would invalidate the caches of the table
+    assert updates == []
+    assert saved == []
+
+
+async def test_unsaved_instance_writes_all_fields(updates):
+    user = await User.query.create(name="Edgy")
+
+    other = User(id=user.id, name="Other", is_active=False)
+    assert other.get_changed_fields() >= {"id", "name", "is_active"}
+    await other.save()
+    assert updates == [{"id", "name", "is_active", "profile"}]
+    assert other.get_changed_fields() == set()
+
+
+async def test_save_values_keeps_other_changes():
+    await User.query.create(name="Edgy")
+    user = await User.query.get(name="Edgy")
+
+    user.name = "Changed"
+    user.is_active = False
+    await user.save(values={"is_active": False})
+    assert user.get_changed_fields() == {"name"}
+    assert (await User.query.get(pk=user.pk)).name == "Edgy"
+
+
+async def test_update_clears_changed_fields():
+    await User.query.create(name="Edgy")
+    user = await User.query.get(name="Edgy")
+
+    user.name = "Changed"
+    user.is_active = False
+    await user.update(name="Changed")
+    assert user.get_changed_fields() == {"is_active"}
+
+
+async def test_changed_foreign_key(updates):
+    user = await User.query.create(name="Edgy")
+    other = await User.query.create(name="Other")
+    await Post.query.create(user=user, title="Hello")
+
+    post = await Post.query.get(title="Hello")
+    assert post.get_changed_fields() == set()
+    assert post.user.get_changed_fields() == set()
+
+    post.user = other
+    assert post.get_changed_fields() == {"user"}
+    await post.save()
+    assert updates[-1] == {"user"}
+    assert (await Post.query.get(title="Hello")).user.pk == other.pk
+
+
+async def test_reassigned_json_field():
+    await User.query.create(name="Edgy", profile={"a": 1})
+    user = await User.query.get(name="Edgy")
+
+    user.profile = {**user.profile, "b": 2}
+    await user.save()
+    assert (await User.query.get(pk=user.pk)).profile == {"a": 1, "b": 2}
+
+
+async def test_json_field_changed_in_place(updates):
+    await User.query.create(name="Edgy", profile={"a": 1, "tags": ["x"]})
+    user = await User.query.get(name="Edgy")
+    assert user.get_changed_fields() == set()
+
+    user.profile["b"] = 2
+    user.profile["tags"].append("y")
+    assert user.get_changed_fields() == {"profile"}
+    await user.save()
+    assert updates == [{"profile"}]
+    assert user.get_changed_fields() == set()
+    assert (await User.query.get(pk=user.pk)).profile == {"a": 1, "b": 2, "tags": ["x", "y"]}
+
+    # the copy is taken again after the save
+    user.profile["c"] = 3
+    await user.save()
+    assert (await User.query.get(pk=user.pk)).profile == {"a": 1, "b": 2, "c": 3, "tags": ["x", "y"]}
@@ -1,4 +1,5 @@
 import pytest
+import sqlalchemy
 
 import edgy
 from edgy.testclient import DatabaseTestClient as Database
@@ -10,10 +11,18 @@ models = edgy.Registry(database=database)
 pytestmark = pytest.mark.anyio
 
 
+class Team(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
 class User(edgy.Model):
     id = edgy.IntegerField(primary_key=True)
     name = edgy.CharField(max_length=100)
     language = edgy.CharField(max_length=200, null=True)
+    team = edgy.ForeignKey(Team, null=True)
 
     class Meta:
         registry = models
@@ -40,3 +49,37 @@ async def test_model_count():
 
     assert await User.query.count() == 3
     assert await User.query.filter(name__icontains="T").count() == 1
+
+
+async def test_model_count_plain_select():
+    team = await Team.query.create(name="Edgy")
+    await User.query.create(name="Test", team=team)
+    await User.query.create(name="Jane", language="EN", team=team)
+    await User.query.create(name="Lucy")
+
+    assert await User.query.filter(team__name="Edgy").count() == 2
+    assert "subquery_for_count" not in str(User.raw_query)
+
+    assert await User.query.or_(language="EN", name="Lucy").count() == 2
+    assert await User.query.all(name="Jane").count() == 1
+    assert await User.query.select_related("team").count() == 2
+
+    assert await User.query.order_by("id").limit(2).count() == 2
+    assert "subquery_for_count" in str(User.raw_query)
+    assert await User.query.offset(1).count() == 2
+    assert await User.query.distinct("team").order_by("team").count() == 2
+
+
+async def test_model_estimated_count():
+    for index in range(10):
+        await User.query.create(name=f"User {index}")
+
+    # without statistics the records are counted
+    assert await User.query.estimated_count() == 10
+    assert await User.query.filter(name="User 1").estimated_count() == 1
+
+    await database.execute(sqlalchemy.text(f"ANALYZE {User.table.name}"))
+    await User.query.filter(name="User 1").delete()
+    # the statistics are not updated by the delete
+    assert await User.query.estimated_count() == 10
+    assert await User.query.count() == 9
@@ -1,6 +1,7 @@
 import pytest
 
 import edgy
+from edgy.exceptions import MultipleObjectsReturned, ObjectNotFound
 from edgy.testclient import DatabaseTestClient as Database
 from tests.settings import DATABASE_URL
 
@@ -19,6 +20,15 @@ class User(edgy.Model):
         registry = models
 
 
+class Slot(edgy.Model):
+    day = edgy.IntegerField(primary_key=True, autoincrement=False)
+    hour = edgy.IntegerField(primary_key=True, autoincrement=False)
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
 @pytest.fixture(autouse=True, scope="function")
 async def create_test_database():
     await models.create_all()
@@ -41,3 +51,36 @@ async def test_model_first():
     assert await User.query.first(name="Jane") == jane
     assert await User.query.filter(name="Jane").first() == jane
     assert await User.query.filter(name="Lucy").first() is None
+
+
+async def test_model_first_order_by():
+    await User.query.create(name="Test", language="EN")
+    jane = await User.query.create(name="Jane", language="DE")
+    lucy = await User.query.create(name="Lucy", language="EN")
+
+    assert await User.query.order_by("name").first() == jane
+    assert await User.query.order_by("-language", "-id").first() == lucy
+    assert "LIMIT" in str(User.raw_query)
+
+    with pytest.raises(ObjectNotFound):
+        await User.query.first(name="Unknown")
+    with pytest.raises(MultipleObjectsReturned):
+        await User.query.first(language="EN")
+
+
+async def test_model_first_composite_pk():
+    await Slot.query.create(day=2, hour=1, name="2-1")
+    await Slot.query.create(day=1, hour=9, name="1-9")
+    await Slot.query.create(day=1, hour=3, name="1-3")
+
+    assert (await Slot.query.first()).name == "1-3"
+    assert (await Slot.query.first(day=2)).name == "2-1"
+
+
+async def test_model_first_limit_and_offset():
+    for index in range(5):
+        await User.query.create(name=f"User {index}", language="EN")
+
+    assert (await User.query.order_by("id").offset(2).first()).name == "User 2"
+    assert (await User.query.order_by("id").limit(3).offset(1).first()).name == "User 1"
+    assert await User.query.order_by("id").offset(5).first() is None
@@ -0,0 +1,88 @@
+import pytest
+
+import edgy
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class Company(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+class User(edgy.Model):
+    name = edgy.CharField(max_length=100)
+    company = edgy.ForeignKey(Company, related_name="users")
+
+    class Meta:
+        registry = models
+
+
+class Product(edgy.Model):
+    name = edgy.CharField(max_length=100)
+    user = edgy.ForeignKey(User, related_name="products")
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+def test_hydration_plan_cached():
+    plan = Product.get_hydration_plan(select_related=["user__company"])
+    assert Product.get_hydration_plan(select_related=["user__company"]) is plan
+    assert Product.get_hydration_plan(select_related=["user"]) is not plan
+    assert Product.get_hydration_plan(select_related=["user__company"], exclude_secrets=True) is not plan
+
+    models.invalidate_models()
+    assert Product.get_hydration_plan(select_related=["user__company"]) is not plan
+
+
+async def test_hydration_plan_select_related():
+    company = await Company.query.create(name="Edgy")
+    user = await User.query.create(name="User", company=company)
+    for i in range(3):
+        await Product.query.create(name=f"Product {i}", user=user)
+
+    products = await Product.query.select_related(["user", "user__company"]).order_by("id")
+    assert [product.name for product in products] == ["Product 0", "Product 1", "Product 2"]
+    for product in products:
+        assert product.user.name == "User"
+        assert product.user.company.name == "Edgy"
+
+    product = await Product.query.get(name="Product 1")
+    assert product.user.pk == user.pk
+    assert product.user.company.pk == company.pk
+
+
+async def test_from_sqla_row_without_selected_columns():
+    company = await Company.query.create(name="Edgy")
+    user = await User.query.create(name="User", company=company)
+    await Product.query.create(name="Product", user=user)
+
+    expression = Product.query.select_related("user")._build_select()
+    row = await database.fetch_one(expression)
+
+    by_name = Product.from_sqla_row(row, select_related=["user"])
+    by_position = Product.from_sqla_row(row, select_related=["user"], selected_columns=expression.selected_columns)
+    assert by_name == by_position
+    assert by_name.user.name == by_position.user.name == "User"
@@ -0,0 +1,117 @@
+import pytest
+
+import edgy
+from edgy.exceptions import QuerySetError
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class User(edgy.Model):
+    id = edgy.IntegerField(primary_key=True)
+    name = edgy.CharField(max_length=100)
+    language = edgy.CharField(max_length=200, null=True)
+
+    class Meta:
+        registry = models
+
+
+class Product(edgy.Model):
+    id = edgy.IntegerField(primary_key=True)
+    name = edgy.CharField(max_length=100)
+    user = edgy.ForeignKey(User, related_name="products")
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def test_iterate():
+    for i in range(5):
+        await User.query.create(name=f"User {i}", language="EN")
+
+    names = [user.name async for user in User.query.order_by("id").iterate(chunk_size=2)]
+    assert names == [f"User {i}" for i in range(5)]
+
+    names = [user.name async for user in User.query.filter(name="User 3")]
+    assert names == ["User 3"]
+
+    assert [user async for user in User.query.filter(name="Unknown")] == []
+
+
+async def test_iterate_all_kwargs():
+    await User.query.create(name="Edgy")
+    await User.query.create(name="Other")
+
+    users = [user async for user in User.query.all(name="Edgy")]
+    assert len(users) == 1
+    assert users[0].name == "Edgy"
+
+
+async def test_iterate_select_related():
+    user = await User.query.create(name="Edgy")
+    for i in range(3):
+        await Product.query.create(name=f"Product {i}", user=user)
+
+    products = [product async for product in Product.query.select_related("user").iterate(chunk_size=2)]
+    assert len(products) == 3
+    for product in products:
+        assert product.user.name == "Edgy"
+
+
+async def test_iterate_only_and_defer():
+    await User.query.create(name="Edgy", language="EN")
+
+    users = [user async for user in User.query.only("name").iterate()]
+    assert users[0].name == "Edgy"
+    assert "language" not in users[0].model_dump()
+
+    users = [user async for user in User.query.defer("name").iterate()]
+    assert users[0].language == "EN"
+    assert "name" not in users[0].model_dump()
+
+
+async def test_iterate_invalid_chunk_size():
+    with pytest.raises(QuerySetError):
+        async for _ in User.query.iterate(chunk_size=0):
+            pass
+
+
+async def test_iterate_prefetch_related():
+    user = await User.query.create(name="Edgy")
+    await Product.query.create(name="Product", user=user)
+
+    queryset = User.query.prefetch_related(edgy.Prefetch(related_name="products", to_attr="to_products"))
+    with pytest.raises(QuerySetError):
+        async for _ in queryset.iterate():
+            pass
+
+    users = [user async for user in queryset]
+    assert len(users[0].to_products) == 1
+
+
+async def test_save_inside_async_for():
+    await User.query.bulk_create([{"id": index, "name": f"User {index}"} for index in range(1, 151)])
+
+    async for user in User.query.all():
+        user.language = "PT"
+        await user.save()
+
+    assert await User.query.filter(language="PT").count() == 150
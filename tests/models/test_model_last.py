@@ -1,6 +1,7 @@
 import pytest
 
 import edgy
+from edgy.exceptions import MultipleObjectsReturned, ObjectNotFound
 from edgy.testclient import DatabaseTestClient as Database
 from tests.settings import DATABASE_URL
 
@@ -19,6 +20,15 @@ class User(edgy.Model):
         registry = models
 
 
+class Slot(edgy.Model):
+    day = edgy.IntegerField(primary_key=True, autoincrement=False)
+    hour = edgy.IntegerField(primary_key=True, autoincrement=False)
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
 @pytest.fixture(autouse=True, scope="function")
 async def create_test_database():
     await models.create_all()
@@ -41,3 +51,39 @@ async def test_model_last():
     assert await User.query.last(name="Jane") == jane
     assert await User.query.filter(name="Test").last() == Test
     assert await User.query.filter(name="Lucy").last() is None
+
+
+async def test_model_last_order_by():
+    test = await User.query.create(name="Test", language="EN")
+    jane = await User.query.create(name="Jane", language="DE")
+    await User.query.create(name="Lucy", language="EN")
+
+    assert await User.query.order_by("name").last() == test
+    assert await User.query.order_by("-language", "id").last() == jane
+    assert "LIMIT" in str(User.raw_query)
+
+    with pytest.raises(ObjectNotFound):
+        await User.query.last(name="Unknown")
+    with pytest.raises(MultipleObjectsReturned):
+        await User.query.last(language="EN")
+
+
+async def test_model_last_composite_pk():
+    await Slot.query.create(day=2, hour=1, name="2-1")
+    await Slot.query.create(day=2, hour=4, name="2-4")
+    await Slot.query.create(day=1, hour=9, name="1-9")
+
+    assert (await Slot.query.last()).name == "2-4"
+    assert (await Slot.query.last(day=1)).name == "1-9"
+    assert (await Slot.query.filter(day=2).last()).name == "2-4"
+
+
+async def test_model_last_limit_and_offset():
+    for index in range(5):
+        await User.query.create(name=f"User {index}", language="EN")
+
+    assert (await User.query.order_by("id").limit(2).last()).name == "User 1"
+    assert (await User.query.order_by("id").limit(2).offset(1).last()).name == "User 2"
+    assert (await User.query.order_by("id").offset(2).last()).name == "User 4"
+    assert await User.query.order_by("id").offset(5).last() is None
+    assert await User.query.order_by("id").limit(2).offset(5).last() is None
@@ -0,0 +1,134 @@
+import pytest
+
+import edgy
+from edgy.exceptions import QuerySetError
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class Publisher(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+class Author(edgy.Model):
+    name = edgy.CharField(max_length=100)
+    publisher = edgy.ForeignKey(Publisher, null=True, related_name="authors")
+
+    class Meta:
+        registry = models
+
+
+class Book(edgy.Model):
+    title = edgy.CharField(max_length=100)
+    author = edgy.ForeignKey(Author, related_name="books")
+    editor = edgy.ForeignKey(Author, null=True, related_name="edited_books")
+    publisher = edgy.ForeignKey(Publisher, null=True, related_name="books")
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def create_books():
+    publisher = await Publisher.query.create(name="Penguin")
+    authors = [
+        await Author.query.create(name=f"Author {index}", publisher=publisher) for index in range(3)
+    ]
+    for index in range(9):
+        await Book.query.create(
+            title=f"Book {index}",
+            author=authors[index % 3],
+            editor=authors[(index + 1) % 3] if index % 2 else None,
+            publisher=publisher,
+        )
+    return authors
+
+
+async def test_load_related(queries):
+    await create_books()
+
+    books = await Book.query.load_related("author", "editor", "publisher").order_by("id")
+    # the main query, one for the authors and editors, one for the publishers
+    assert len(queries) == 3
+
+    for index, book in enumerate(books):
+        assert book.author.name == f"Author {index % 3}"
+        assert book.publisher.name == "Penguin"
+        if index % 2:
+            assert book.editor.name == f"Author {(index + 1) % 3}"
+        else:
+            assert not book.editor.can_load
+    assert len(queries) == 3
+
+
+async def test_load_related_nested(queries):
+    await create_books()
+
+    books = await Book.query.load_related("author__publisher").order_by("id")
+    assert len(queries) == 3
+    assert all(book.author.publisher.name == "Penguin" for book in books)
+    assert len(queries) == 3
+
+
+async def test_load_related_chained_and_get():
+    authors = await create_books()
+
+    book = await Book.query.load_related("author").load_related("publisher").get(title="Book 1")
+    assert "name" in book.author.__dict__
+    assert "name" in book.publisher.__dict__
+    assert book.author.name == authors[1].name
+
+
+async def test_load_related_skips_loaded(queries):
+    await create_books()
+
+    books = await Book.query.select_related("author").load_related("author")
+    assert len(queries) == 1
+    assert len(books) == 9
+
+
+async def test_load_all():
+    await create_books()
+
+    books = await Book.query.all()
+    assert all("name" not in book.author.__dict__ for book in books)
+
+    await edgy.load_all(books, "author")
+    assert all("name" in book.author.__dict__ for book in books)
+    assert {book.author.name for book in books} == {"Author 0", "Author 1", "Author 2"}
+
+
+async def test_load_all_empty():
+    await edgy.load_all([], "author")
+
+
+async def test_load_related_invalid_field():
+    await create_books()
+
+    with pytest.raises(QuerySetError):
+        await Book.query.load_related("title")
+
+    with pytest.raises(QuerySetError):
+        async for _ in Book.query.load_related("author").iterate():
+            pass
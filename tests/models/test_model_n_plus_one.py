@@ -0,0 +1,108 @@
+import pytest
+
+import edgy
+from edgy.core.db.n_plus_one import get_n_plus_one_detector
+from edgy.exceptions import NPlusOneError
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class User(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+class Post(edgy.Model):
+    user = edgy.ForeignKey(User, related_name="posts")
+    title = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def create_posts(count=3):
+    users = [await User.query.create(name=f"User {index}") for index in range(count)]
+    await Post.query.bulk_create([{"user": user, "title": f"Post {index}"} for index, user in enumerate(users)])
+    return users
+
+
+async def test_foreign_key_loads_warn():
+    await create_posts()
+
+    with pytest.warns(edgy.NPlusOneWarning) as record:
+        async with edgy.detect_n_plus_one() as detector:
+            for post in await Post.query.all():
+                await post.user.load()
+
+    assert len(record) == 1
+    message = str(record[0].message)
+    assert "User via Post.user was loaded lazily 3 times from" in message
+    assert "test_model_n_plus_one.py" in message
+    assert "select_related('user')" in message
+    assert list(detector.loads.values()) == [3]
+
+
+async def test_relation_queries_raise():
+    users = await create_posts()
+
+    with pytest.raises(NPlusOneError) as raised:
+        async with edgy.detect_n_plus_one(threshold=2, raise_error=True):
+            for user in users:
+                await user.posts.all()
+
+    assert "User.posts was loaded lazily 2 times" in str(raised.value)
+    assert "prefetch_related(Prefetch('posts'" in str(raised.value)
+
+
+async def test_below_threshold_and_other_call_sites(recwarn):
+    users = await create_posts()
+
+    async with edgy.detect_n_plus_one(threshold=3) as detector:
+        for user in users[:2]:
+            await user.posts.all()
+        # different call sites are counted separately
+        await users[0].posts.filter(title="Post 0")
+        await users[1].posts.filter(title="Post 1")
+        # writes of the relation managers are not loads
+        for user in users:
+            await user.posts.create(title="New")
+        # eager loading doesn't load lazily
+        for post in await Post.query.select_related("user"):
+            assert post.user.name.startswith("User")
+
+    assert not [warning for warning in recwarn if warning.category is edgy.NPlusOneWarning]
+    assert sorted(detector.loads.values()) == [1, 1, 2]
+
+
+async def test_inactive_outside_of_the_block():
+    users = await create_posts()
+
+    assert get_n_plus_one_detector() is None
+    with edgy.detect_n_plus_one(threshold=1) as detector:
+        assert get_n_plus_one_detector() is detector
+    assert get_n_plus_one_detector() is None
+
+    for user in users:
+        await user.posts.all()
+    assert detector.loads == {}
@@ -0,0 +1,150 @@
+import datetime
+
+import pytest
+
+import edgy
+from edgy.exceptions import QuerySetError
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class Post(edgy.Model):
+    title = edgy.CharField(max_length=100)
+    created = edgy.DateTimeField()
+    score = edgy.IntegerField()
+
+    class Meta:
+        registry = models
+
+
+class Event(edgy.Model):
+    day = edgy.DateField(primary_key=True)
+    slot = edgy.IntegerField(primary_key=True)
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def create_posts():
+    start = datetime.datetime(2024, 1, 1, 12, 0)
+    for index in range(10):
+        await Post.query.create(
+            title=f"Post {index}", created=start + datetime.timedelta(days=index // 2), score=index % 3
+        )
+
+
+async def collect_pages(queryset, **kwargs):
+    pages = []
+    cursor = None
+    while True:
+        page, cursor = await queryset.paginate_after(cursor, **kwargs)
+        pages.append([post.title for post in page])
+        if cursor is None:
+            return pages
+
+
+async def test_paginate_after_pk():
+    await create_posts()
+
+    pages = await collect_pages(Post.query, page_size=4)
+    assert pages == [
+        ["Post 0", "Post 1", "Post 2", "Post 3"],
+        ["Post 4", "Post 5", "Post 6", "Post 7"],
+        ["Post 8", "Post 9"],
+    ]
+
+
+async def test_paginate_after_order_by_with_ties():
+    await create_posts()
+
+    pages = await collect_pages(Post.query, order_by=["-created"], page_size=3)
+    assert pages == [
+        ["Post 9", "Post 8", "Post 7"],
+        ["Post 6", "Post 5", "Post 4"],
+        ["Post 3", "Post 2", "Post 1"],
+        ["Post 0"],
+    ]
+
+
+async def test_paginate_after_mixed_directions():
+    await create_posts()
+
+    pages = await collect_pages(Post.query, order_by=["score", "-created"], page_size=4)
+    expected = [post.title for post in sorted(await Post.query.all(), key=lambda post: (post.score, -post.id))]
+    assert [title for page in pages for title in page] == expected
+    assert [len(page) for page in pages] == [4, 4, 2]
+
+
+async def test_paginate_after_filtered():
+    await create_posts()
+
+    pages = await collect_pages(Post.query.filter(score=0), order_by="-id", page_size=2)
+    assert pages == [["Post 9", "Post 6"], ["Post 3", "Post 0"]]
+
+
+async def test_paginate_after_exact_page_size():
+    await create_posts()
+
+    page, cursor = await Post.query.paginate_after(page_size=10)
+    assert len(page) == 10
+    assert cursor is None
+
+    page, cursor = await Post.query.filter(score=5).paginate_after()
+    assert page == []
+    assert cursor is None
+
+
+async def test_paginate_after_composite_pk():
+    for day in range(1, 4):
+        for slot in range(3):
+            await Event.query.create(day=datetime.date(2024, 2, day), slot=slot, name=f"{day}-{slot}")
+
+    events = []
+    cursor = None
+    while True:
+        page, cursor = await Event.query.paginate_after(cursor, page_size=4)
+        events.extend(event.name for event in page)
+        if cursor is None:
+            break
+    assert events == [f"{day}-{slot}" for day in range(1, 4) for slot in range(3)]
+
+
+async def test_paginate_after_invalid():
+    await create_posts()
+
+    _, cursor = await Post.query.paginate_after(page_size=2)
+
+    with pytest.raises(QuerySetError):
+        await Post.query.paginate_after(cursor, order_by="-created", page_size=2)
+
+    with pytest.raises(QuerySetError):
+        await Post.query.paginate_after("not a cursor")
+
+    with pytest.raises(QuerySetError):
+        await Post.query.paginate_after(order_by="unknown")
+
+    with pytest.raises(QuerySetError):
+        await Post.query.limit(2).paginate_after()
+
+    with pytest.raises(QuerySetError):
+        await Post.query.paginate_after(page_size=0)
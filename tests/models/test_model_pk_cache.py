@@ -0,0 +1,170 @@
+import uuid
+
+import pytest
+
+import edgy
+from edgy.exceptions import ObjectNotFound
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class User(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+        pk_cache = True
+
+
+class Token(edgy.Model):
+    id = edgy.UUIDField(primary_key=True, default=uuid.uuid4)
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+        pk_cache = True
+
+
+class Post(edgy.Model):
+    user = edgy.ForeignKey(User, related_name="posts")
+    title = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def test_get_by_pk(queries):
+    user = await User.query.create(name="Edgy")
+    pk_cache = models.pk_cache
+    hits, misses = pk_cache.hits, pk_cache.misses
+
+    first = await User.query.get(pk=user.pk)
+    second = await User.query.get(id=user.pk)
+    assert (first.pk, first.name) == (user.pk, "Edgy")
+    assert (second.pk, second.name) == (user.pk, "Edgy")
+    assert first is not second
+    assert len(queries) == 1
+    assert (pk_cache.hits - hits, pk_cache.misses - misses) == (1, 1)
+
+    assert (await User.query.get_or_none(pk=user.pk)).name == "Edgy"
+    assert len(queries) == 1
+
+
+async def test_missing_rows_not_cached(queries):
+    with pytest.raises(ObjectNotFound):
+        await User.query.get(pk=1000)
+    assert await User.query.get_or_none(pk=1000) is None
+    assert len(queries) == 2
+
+
+async def test_other_lookups_bypass_the_cache(queries):
+    user = await User.query.create(name="Edgy")
+
+    await User.query.get(name="Edgy")
+    await User.query.filter(name="Edgy").get(pk=user.pk)
+    await User.query.only("name").get(pk=user.pk)
+    await Post.query.get_or_none(pk=1)
+    assert len(queries) == 4
+    assert len(models.pk_cache) == 0
+
+
+async def test_invalidated_by_model_writes():
+    user = await User.query.create(name="Edgy")
+    await User.query.get(pk=user.pk)
+
+    user.name = "Saved"
+    await user.save()
+    assert (await User.query.get(pk=user.pk)).name == "Saved"
+
+    await user.update(name="Updated")
+    assert (await User.query.get(pk=user.pk)).name == "Updated"
+
+    await user.delete()
+    assert await User.query.get_or_none(pk=user.pk) is None
+
+
+async def test_invalidated_by_queryset_writes():
+    user = await User.query.create(name="Edgy")
+    await User.query.get(pk=user.pk)
+
+    await User.query.filter(name="Edgy").update(name="Updated")
+    assert (await User.query.get(pk=user.pk)).name == "Updated"
+
+    await User.query.bulk_update([User(id=user.pk, name="Bulk")], fields=["name"])
+    assert (await User.query.get(pk=user.pk)).name == "Bulk"
+
+    await User.query.filter(name="Bulk").delete()
+    assert await User.query.get_or_none(pk=user.pk) is None
+
+
+async def test_foreign_key_loads(queries):
+    user = await User.query.create(name="Edgy")
+    for index in range(3):
+        await Post.query.create(user=user, title=f"Post {index}")
+
+    posts = await Post.query.order_by("id")
+    await posts[0].user.load()
+    assert posts[0].user.name == "Edgy"
+    assert len(queries) == 2
+
+    await posts[1].user.load()
+    await edgy.load_all(posts, "user")
+    assert [post.user.name for post in posts] == ["Edgy"] * 3
+    assert len(queries) == 2
+
+
+async def test_load_all_fills_the_cache(queries):
+    users = [await User.query.create(name=f"User {index}") for index in range(3)]
+    for user in users:
+        await Post.query.create(user=user, title=user.name)
+
+    posts = await Post.query.order_by("id")
+    await edgy.load_all(posts, "user")
+    assert [post.user.name for post in posts] == ["User 0", "User 1", "User 2"]
+    assert len(queries) == 2
+
+    assert (await User.query.get(pk=users[2].pk)).name == "User 2"
+    assert len(queries) == 2
+
+
+async def test_bounded_size(monkeypatch):
+    monkeypatch.setattr(models.pk_cache, "max_size", 2)
+    users = [await User.query.create(name=f"User {index}") for index in range(3)]
+    for user in users:
+        await User.query.get(pk=user.pk)
+    assert len(models.pk_cache) == 2
+    assert models.pk_cache.get(database, User.table, (users[0].pk,)) is None
+    assert models.pk_cache.get(database, User.table, (users[2].pk,)) is not None
+
+
+async def test_uuid_pk_as_str(queries):
+    token = await Token.query.create(name="Edgy")
+
+    assert (await Token.query.get(id=str(token.id))).name == "Edgy"
+    assert (await Token.query.get(id=token.id)).name == "Edgy"
+    assert len(queries) == 1
+
+    # invalidated for the str key as well
+    await token.update(name="Changed")
+    assert (await Token.query.get(id=str(token.id))).name == "Changed"
+    assert (await Token.query.get(id=token.id)).name == "Changed"
+    assert len(queries) == 2
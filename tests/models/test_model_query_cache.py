@@ -0,0 +1,323 @@
+import fnmatch
+import pickle
+
+import pytest
+
+import edgy
+from edgy.core import cache as cache_module
+from edgy.core.cache import CachedRow, LRUCache, RedisCache
+from edgy.core.signals import Signal
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_ALTERNATIVE_URL, DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class Author(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+class Book(edgy.Model):
+    author = edgy.ForeignKey(Author, related_name="books")
+    title = edgy.CharField(max_length=100)
+    data = edgy.JSONField(default=dict)
+
+    class Meta:
+        registry = models
+
+
+class Country(edgy.Model):
+    code = edgy.CharField(max_length=2)
+
+    class Meta:
+        registry = models
+        cache = 60
+
+
+class Tag(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+        cache = True
+        signals = {"post_save": Signal(), "post_update": Signal(), "post_delete": Signal()}
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def test_cache_hits(queries):
+    author = await Author.query.create(name="Ursula")
+    await Book.query.create(author=author, title="Earthsea", data={"a": [1]})
+
+    first = await Book.query.cache().filter(title="Earthsea")
+    second = await Book.query.cache().filter(title="Earthsea").all()
+    assert len(queries) == 1
+    assert [(book.title, book.data, book.author.pk) for book in second] == [("Earthsea", {"a": [1]}, author.pk)]
+    assert first[0] is not second[0]
+
+    assert (await Book.query.cache().get(title="Earthsea")).pk == first[0].pk
+    await Book.query.cache().get(title="Earthsea")
+    assert len(queries) == 2
+
+    await Book.query.cache().filter(title="Other")
+    await Book.query.filter(title="Earthsea")
+    assert len(queries) == 4
+
+
+async def test_cache_invalidated_by_writes(queries):
+    author = await Author.query.create(name="Ursula")
+    book = await Book.query.create(author=author, title="Earthsea")
+
+    async def titles():
+        return [book.title for book in await Book.query.cache().order_by("id")]
+
+    assert await titles() == ["Earthsea"]
+
+    book.title = "A Wizard of Earthsea"
+    await book.save()
+    assert await titles() == ["A Wizard of Earthsea"]
+
+    await Book.query.filter(pk=book.pk).update(title="The Tombs of Atuan")
+    assert await titles() == ["The Tombs of Atuan"]
+
+    await Book.query.bulk_create([{"author": author, "title": "Tehanu"}])
+    assert await titles() == ["The Tombs of Atuan", "Tehanu"]
+
+    await book.delete()
+    assert await titles() == ["Tehanu"]
+    assert len(queries) == 5
+
+
+async def test_cache_invalidated_by_model_signals():
+    tag = await Tag.query.create(name="fantasy")
+    assert [tag.name for tag in await Tag.query.all()] == ["fantasy"]
+
+    tag.name = "sci-fi"
+    await tag.save()
+    assert [tag.name for tag in await Tag.query.all()] == ["sci-fi"]
+
+    await tag.delete()
+    assert await Tag.query.all() == []
+
+
+async def test_cache_get_or_none_and_values(queries):
+    author = await Author.query.create(name="Ursula")
+
+    assert (await Author.query.cache().get_or_none(name="Ursula")).pk == author.pk
+    assert (await Author.query.cache().get_or_none(name="Ursula")).pk == author.pk
+    assert len(queries) == 1
+
+    assert await Author.query.cache().values(["name"]) == [{"name": "Ursula"}]
+    # the same select as values()
+    assert await Author.query.cache().values_list(["name"], flat=True) == ["Ursula"]
+    assert len(queries) == 2
+
+    await Author.query.create(name="Tolkien")
+    assert await Author.query.cache().get_or_none(name="Tolkien") is not None
+
+
+async def test_cache_invalidated_by_joined_tables():
+    author = await Author.query.create(name="Ursula")
+    await Book.query.create(author=author, title="Earthsea")
+
+    books = await Book.query.cache().select_related("author")
+    assert books[0].author.name == "Ursula"
+
+    author.name = "Ursula K. Le Guin"
+    await author.save()
+
+    books = await Book.query.cache().select_related("author")
+    assert books[0].author.name == "Ursula K. Le Guin"
+
+
+async def test_cache_ttl(queries, monkeypatch):
+    await Author.query.create(name="Ursula")
+    now = 1000.0
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now)
+
+    await Author.query.cache(ttl=10)
+    await Author.query.cache(ttl=10)
+    assert len(queries) == 1
+
+    now += 11
+    await Author.query.cache(ttl=10)
+    assert len(queries) == 2
+
+
+async def test_meta_cache(queries):
+    await Country.query.create(code="PT")
+
+    assert [country.code for country in await Country.query.all()] == ["PT"]
+    await Country.query.all()
+    assert len(queries) == 1
+
+    await Country.query.no_cache()
+    assert len(queries) == 2
+
+    await Country.query.create(code="DE")
+    assert {country.code for country in await Country.query.all()} == {"PT", "DE"}
+
+
+async def test_cache_schema_in_key():
+    author = await Author.query.create(name="Ursula")
+    queryset = Author.query.filter(pk=author.pk)
+
+    expression = queryset._build_select()
+    assert cache_module.build_cache_key(expression) == cache_module.build_cache_key(expression)
+    assert cache_module.build_cache_key(expression) != cache_module.build_cache_key(expression, "tenant")
+    assert cache_module.build_cache_key(expression, database=database) != cache_module.build_cache_key(
+        expression, database=Database(url=DATABASE_ALTERNATIVE_URL)
+    )
+    assert cache_module.build_cache_key(expression) != cache_module.build_cache_key(
+        Author.query.filter(pk=author.pk + 1)._build_select()
+    )
+
+
+def test_cached_row():
+    row = CachedRow(("id", "name"), (1, "Ursula"))
+    row = pickle.loads(pickle.dumps(row))
+
+    assert row[0] == 1
+    assert row["name"] == "Ursula"
+    assert row.__getitem__(Author.table.columns["name"]) == "Ursula"
+    assert "name" in row
+    assert row._mapping == {"id": 1, "name": "Ursula"}
+    assert len(row) == 2
+
+
+async def test_lru_cache():
+    cache = LRUCache(max_size=2)
+    await cache.set("a", 1, tables=["authors"])
+    await cache.set("b", 2, tables=["books"])
+    assert await cache.get("a") == 1
+
+    await cache.set("c", 3, tables=["authors", "books"])
+    assert await cache.get("b") is None
+    assert len(cache) == 2
+
+    await cache.invalidate(["books"])
+    assert await cache.get("c") is None
+    assert await cache.get("a") == 1
+
+    await cache.clear()
+    assert await cache.get("a") is None
+
+
+class StandInRedis:
+    """
+    In-memory stand-in speaking the used subset of the redis.asyncio API.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.expiries = {}
+
+    async def get(self, name):
+        return self.data.get(name)
+
+    async def set(self, name, value, px=None):
+        self.data[name] = value
+        self.px = px
+
+    async def sadd(self, name, *values):
+        self.data.setdefault(name, set()).update(value.encode() for value in values)
+
+    async def pttl(self, name):
+        if name not in self.data:
+            return -2
+        return self.expiries.get(name, -1)
+
+    async def pexpire(self, name, time):
+        self.expiries[name] = time
+
+    async def smembers(self, name):
+        return set(self.data.get(name, ()))
+
+    async def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+            self.expiries.pop(name, None)
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        # runs the invalidation script of the RedisCache
+        self.script = script
+        table_key, prefix = keys_and_args
+        for key in await self.smembers(table_key):
+            await self.delete(prefix + key.decode())
+        await self.delete(table_key)
+
+    async def scan_iter(self, match):
+        for name in list(self.data):
+            if fnmatch.fnmatch(name, match):
+                yield name
+
+
+async def test_redis_cache():
+    client = StandInRedis()
+    cache = RedisCache(client, prefix="test:")
+
+    await cache.set("a", [CachedRow(("id",), (1,))], ttl=1.5, tables=["authors"])
+    assert client.px == 1500
+    assert (await cache.get("a"))[0]["id"] == 1
+    assert await cache.get("b") is None
+
+    await cache.set("c", 1, tables=["books"])
+    await cache.invalidate(["authors"])
+    assert "SMEMBERS" in client.script
+    assert list(client.data) == ["test:c", "test:table:books"]
+    await cache.invalidate(["books"])
+    assert client.data == {}
+
+    await cache.set("a", 1)
+    await cache.clear()
+    assert client.data == {}
+
+
+async def test_redis_cache_expiry():
+    client = StandInRedis()
+    cache = RedisCache(client, prefix="test:", max_ttl=60)
+
+    await cache.set("a", 1, ttl=1.5, tables=["authors"])
+    assert client.expiries == {"test:table:authors": 1500}
+    await cache.set("b", 1, ttl=10, tables=["authors", "books"])
+    assert client.expiries == {"test:table:authors": 10000, "test:table:books": 10000}
+    # the sets expire with the longest living entry
+    await cache.set("c", 1, ttl=2, tables=["authors"])
+    assert client.expiries["test:table:authors"] == 10000
+
+    # entries without ttl expire after max_ttl
+    await cache.set("d", 1, tables=["books"])
+    assert client.px == 60000
+    assert client.expiries["test:table:books"] == 60000
+    await cache.set("e", 1, ttl=120)
+    assert client.px == 60000
+
+
+async def test_registry_redis_cache(queries, monkeypatch):
+    monkeypatch.setattr(models, "cache", RedisCache(StandInRedis()))
+    await Author.query.create(name="Ursula")
+
+    assert [author.name for author in await Author.query.cache()] == ["Ursula"]
+    assert [author.name for author in await Author.query.cache()] == ["Ursula"]
+    assert len(queries) == 1
+
+    await Author.query.create(name="Tolkien")
+    assert len(await Author.query.cache()) == 2
@@ -0,0 +1,110 @@
+import pytest
+
+import edgy
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class Shop(edgy.Model):
+    name = edgy.CharField(max_length=100)
+    closed = edgy.BooleanField(default=False)
+
+    class Meta:
+        registry = models
+
+
+class Product(edgy.Model):
+    shop = edgy.ForeignKey(Shop, related_name="products")
+    name = edgy.CharField(max_length=100)
+    stock = edgy.IntegerField(default=0)
+
+    class Meta:
+        registry = models
+
+
+class Variant(edgy.Model):
+    product = edgy.ForeignKey(Product, related_name="variants")
+    size = edgy.CharField(max_length=10)
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def create_products():
+    open_shop = await Shop.query.create(name="Open")
+    closed_shop = await Shop.query.create(name="Closed", closed=True)
+    for index in range(3):
+        await Product.query.create(shop=open_shop, name=f"Open {index}", stock=index)
+        product = await Product.query.create(shop=closed_shop, name=f"Closed {index}", stock=index)
+        await Variant.query.create(product=product, size="M")
+    return open_shop, closed_shop
+
+
+async def test_delete_count():
+    await create_products()
+
+    assert await Variant.query.delete() == 3
+    assert await Product.query.filter(stock=0).delete() == 2
+    assert await Product.query.filter(stock=10).delete() == 0
+    assert await Product.query.count() == 4
+
+
+async def test_delete_related_filter():
+    await create_products()
+
+    assert await Variant.query.filter(product__shop__closed=True).delete() == 3
+    assert await Product.query.filter(shop__closed=True).delete() == 3
+    assert sorted(product.name for product in await Product.query.all()) == ["Open 0", "Open 1", "Open 2"]
+
+
+async def test_delete_or_clauses():
+    await create_products()
+    await Variant.query.delete()
+
+    assert await Product.query.or_(name="Open 0", stock=2).delete() == 3
+    assert sorted(product.name for product in await Product.query.all()) == ["Closed 0", "Closed 1", "Open 1"]
+
+
+async def test_delete_all_kwargs_and_limit():
+    await create_products()
+    await Variant.query.delete()
+
+    assert await Product.query.all(stock=1).delete() == 2
+    assert await Product.query.order_by("-id").limit(2).delete() == 2
+    assert sorted(product.name for product in await Product.query.all()) == ["Closed 0", "Open 0"]
+
+
+async def test_update_related_filter():
+    await create_products()
+
+    assert await Product.query.filter(shop__name="Closed").update(stock=0) == 3
+    assert await Product.query.filter(stock=0).count() == 4
+
+    assert await Product.query.or_(shop__closed=False, name="Closed 1").update(stock=5) == 4
+    assert await Product.query.filter(stock=5).count() == 4
+
+
+async def test_update_count():
+    await create_products()
+
+    assert await Product.query.update(stock=7) == 6
+    assert await Product.query.filter(name="Unknown").update(stock=1) == 0
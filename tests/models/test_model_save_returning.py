@@ -0,0 +1,94 @@
+import datetime
+
+import pytest
+import sqlalchemy
+
+import edgy
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class Article(edgy.Model):
+    title = edgy.CharField(max_length=100)
+    status = edgy.CharField(max_length=20, server_default="draft")
+    views = edgy.IntegerField(server_default=sqlalchemy.text("0"))
+    created = edgy.DateTimeField(auto_now_add=True)
+    modified = edgy.DateTimeField(auto_now=True)
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+@pytest.fixture
+def no_load(monkeypatch):
+    async def load(self):
+        raise AssertionError("load() should not be called")
+
+    monkeypatch.setattr(Article, "load", load)
+
+
+async def test_create_returns_server_defaults(no_load):
+    article = await Article.query.create(title="Edgy")
+
+    assert article.id is not None
+    assert article.status == "draft"
+    assert article.views == 0
+    assert isinstance(article.created, datetime.datetime)
+    assert isinstance(article.modified, datetime.datetime)
+
+
+async def test_save_returns_server_defaults(no_load):
+    article = Article(title="Edgy")
+    await article.save()
+
+    stored = await Article.query.get(pk=article.pk)
+    assert (article.id, article.status, article.views) == (stored.id, "draft", 0)
+
+
+async def test_update_returns_auto_now(no_load):
+    article = await Article.query.create(title="Edgy", status="published")
+    modified = article.modified
+
+    article.title = "Edgy ORM"
+    await article.save()
+
+    stored = await Article.query.get(pk=article.pk)
+    assert stored.title == "Edgy ORM"
+    assert article.modified >= modified
+    assert article.modified == stored.modified
+    assert article.status == "published"
+
+
+def test_returning_columns():
+    article = Article(title="Edgy")
+
+    columns = article._get_returning_columns({"title": "Edgy", "views": 1})
+    assert {column.key for column in columns} == {"id", "status", "created", "modified"}
+
+    columns = article._get_returning_columns({"title": "Edgy"}, is_update=True)
+    assert {column.key for column in columns} == {"status", "views", "modified"}
+
+
+def test_returning_columns_unsupported_dialect(monkeypatch):
+    monkeypatch.setattr(edgy.settings, "returning_dialects", set())
+
+    assert Article(title="Edgy")._get_returning_columns({"title": "Edgy"}) == []
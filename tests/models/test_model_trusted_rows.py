@@ -0,0 +1,128 @@
+import pytest
+from pydantic import field_validator
+
+import edgy
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+trusted_models = edgy.Registry(database=database, trusted_rows=True)
+
+pytestmark = pytest.mark.anyio
+
+validations = []
+
+
+class User(edgy.Model):
+    id = edgy.IntegerField(primary_key=True)
+    name = edgy.CharField(max_length=100)
+    language = edgy.CharField(max_length=200, null=True)
+
+    class Meta:
+        registry = models
+
+    @field_validator("language")
+    @classmethod
+    def count_validation(cls, value):
+        validations.append(value)
+        return value
+
+
+class Product(edgy.Model):
+    id = edgy.IntegerField(primary_key=True)
+    name = edgy.CharField(max_length=100)
+    user = edgy.ForeignKey(User, related_name="products")
+
+    class Meta:
+        registry = models
+
+
+class Tag(edgy.Model):
+    id = edgy.IntegerField(primary_key=True)
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = trusted_models
+
+    @field_validator("name")
+    @classmethod
+    def count_validation(cls, value):
+        validations.append(value)
+        return value
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    await trusted_models.create_all()
+    yield
+    await trusted_models.drop_all()
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def test_trusted_rows_skip_validation():
+    await User.query.create(name="Edgy", language="EN")
+
+    validations.clear()
+    user = await User.query.get(name="Edgy")
+    assert validations == ["EN"]
+    assert user.language == "EN"
+
+    validations.clear()
+    user = await User.query.trusted_rows().get(name="Edgy")
+    assert validations == []
+    assert user.language == "EN"
+    assert user.name == "Edgy"
+
+    users = await User.query.trusted_rows().filter(name="Edgy")
+    assert validations == []
+    assert users[0] == user
+
+
+async def test_trusted_rows_foreign_keys():
+    user = await User.query.create(name="Edgy", language="EN")
+    await Product.query.create(name="Product", user=user)
+
+    validations.clear()
+    product = await Product.query.trusted_rows().select_related("user").get()
+    assert validations == []
+    assert product.user.pk == user.pk
+    assert product.user.name == "Edgy"
+    assert product.user.language == "EN"
+
+    product = await Product.query.trusted_rows().get()
+    assert product.user.pk == user.pk
+    assert product.user.name == "Edgy"
+
+
+async def test_trusted_rows_only_and_defer():
+    await User.query.create(name="Edgy", language="EN")
+
+    user = await User.query.trusted_rows().only("name").get()
+    assert user.name == "Edgy"
+    assert "language" not in user.model_dump()
+
+    user = await User.query.trusted_rows().defer("name").get()
+    assert user.language == "EN"
+    assert "name" not in user.model_dump()
+
+
+async def test_trusted_rows_registry():
+    await Tag.query.create(name="edgy")
+
+    validations.clear()
+    tag = await Tag.query.get()
+    assert validations == []
+    assert tag.name == "edgy"
+
+    tag = await Tag.query.trusted_rows(False).get()
+    assert validations == ["edgy"]
+    assert tag.name == "edgy"
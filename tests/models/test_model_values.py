@@ -21,6 +21,16 @@ class User(edgy.Model):
         registry = models
 
 
+class Post(edgy.Model):
+    id = edgy.IntegerField(primary_key=True)
+    title = edgy.CharField(max_length=100)
+    author = edgy.ForeignKey(User, related_name="posts")
+    editor = edgy.ForeignKey(User, related_name="edited_posts", null=True)
+
+    class Meta:
+        registry = models
+
+
 @pytest.fixture(autouse=True, scope="function")
 async def create_test_database():
     await models.create_all()
@@ -130,3 +140,72 @@ async def test_model_only_with_filter():
     assert len(users) == 0
 
     assert users == []
+
+
+async def test_model_values_related_fields():
+    john = await User.query.create(name="John", language="PT")
+    jane = await User.query.create(name="Jane", language="EN")
+    await Post.query.create(title="Edgy", author=john)
+    await Post.query.create(title="Values", author=jane)
+
+    posts = await Post.query.order_by("id").values(["title", "author__name"])
+    assert posts == [
+        {"title": "Edgy", "author__name": "John"},
+        {"title": "Values", "author__name": "Jane"},
+    ]
+
+    posts = await Post.query.filter(author__language="EN").values(["author__name", "title"])
+    assert posts == [{"author__name": "Jane", "title": "Values"}]
+
+    posts = await Post.query.order_by("id").values_list(["author__name"], flat=True)
+    assert posts == ["John", "Jane"]
+
+
+async def test_model_values_reverse_related_fields():
+    john = await User.query.create(name="John", language="PT")
+    await Post.query.create(title="Edgy", author=john)
+
+    users = await User.query.values(["name", "posts__title"])
+    assert users == [{"name": "John", "posts__title": "Edgy"}]
+
+
+async def test_model_values_related_fields_exclude_none():
+    john = await User.query.create(name="John")
+    await Post.query.create(title="Edgy", author=john)
+
+    posts = await Post.query.values(["title", "author__language"], exclude_none=True)
+    assert posts == [{"title": "Edgy"}]
+
+
+async def test_model_values_foreign_key():
+    john = await User.query.create(name="John")
+    await Post.query.create(title="Edgy", author=john)
+
+    posts = await Post.query.values(["title", "author"])
+    assert posts == [{"title": "Edgy", "author": {"id": john.id}}]
+
+
+async def test_model_values_related_fields_without_related_object():
+    john = await User.query.create(name="John")
+    await User.query.create(name="Jane")
+    await Post.query.create(title="Edgy", author=john)
+
+    users = await User.query.order_by("id").values(["name", "posts__title"])
+    assert users == [{"name": "John", "posts__title": "Edgy"}, {"name": "Jane", "posts__title": None}]
+
+    posts = await Post.query.values(["title", "editor__name"])
+    assert posts == [{"title": "Edgy", "editor__name": None}]
+
+    # filters on the related fields still exclude the rows
+    users = await User.query.filter(posts__title="Edgy").values(["name", "posts__title"])
+    assert users == [{"name": "John", "posts__title": "Edgy"}]
+
+
+async def test_model_values_keep_the_inner_joins_of_select_related():
+    john = await User.query.create(name="John")
+    await Post.query.create(title="Edgy", author=john, editor=john)
+    await Post.query.create(title="Saffier", author=john)
+
+    posts = await Post.query.select_related("editor").values(["title", "editor__name"])
+    assert posts == [{"title": "Edgy", "editor__name": "John"}]
+    assert len(posts) == len(await Post.query.select_related("editor").all())
@@ -0,0 +1,110 @@
+import pytest
+
+import edgy
+from edgy.core.db.querysets import Prefetch, QuerySet
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+pytestmark = pytest.mark.anyio
+
+database = Database(DATABASE_URL)
+models = edgy.Registry(database=database)
+
+
+class Album(edgy.Model):
+    id = edgy.IntegerField(primary_key=True)
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+class Track(edgy.Model):
+    id = edgy.IntegerField(primary_key=True)
+    album = edgy.ForeignKey("Album", on_delete=edgy.CASCADE, related_name="tracks")
+    title = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+class Studio(edgy.Model):
+    album = edgy.ForeignKey("Album", related_name="studios")
+    name = edgy.CharField(max_length=255)
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+async def create_albums(count: int):
+    albums = []
+    for i in range(count):
+        album = await Album.query.create(name=f"Album {i}")
+        for position in range(i % 3):
+            await Track.query.create(album=album, title=f"Track {i}-{position}")
+        albums.append(album)
+    return albums
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+async def test_prefetch_related_batched(monkeypatch, chunk_size):
+    monkeypatch.setattr(QuerySet, "PREFETCH_CHUNK_SIZE", chunk_size)
+    await create_albums(5)
+
+    albums = await Album.query.prefetch_related(Prefetch(related_name="tracks", to_attr="to_tracks")).order_by("id")
+
+    assert len(albums) == 5
+    for i, album in enumerate(albums):
+        assert sorted(track.title for track in album.to_tracks) == [f"Track {i}-{position}" for position in range(i % 3)]
+        for track in album.to_tracks:
+            assert track.album.pk == album.pk
+
+
+async def test_prefetch_related_batched_nested_with_queryset():
+    albums = await create_albums(4)
+    for album in albums:
+        await Studio.query.create(album=album, name=f"Studio {album.name}")
+
+    studios = await Studio.query.prefetch_related(
+        Prefetch(related_name="album__tracks", to_attr="to_tracks", queryset=Track.query.filter(title__icontains="-1")),
+    ).order_by("id")
+
+    assert [len(studio.to_tracks) for studio in studios] == [0, 0, 1, 0]
+    assert studios[2].to_tracks[0].title == "Track 2-1"
+
+
+async def test_prefetch_related_does_not_mutate_queryset():
+    await create_albums(3)
+    queryset = Track.query.filter(title__icontains="Track")
+
+    albums = await Album.query.prefetch_related(
+        Prefetch(related_name="tracks", to_attr="to_tracks", queryset=queryset)
+    ).order_by("id")
+
+    assert [len(album.to_tracks) for album in albums] == [0, 1, 2]
+    assert queryset.extra == {}
+    assert len(await queryset) == 3
+
+
+async def test_from_sqla_row_prefetch_related_deprecated():
+    await create_albums(3)
+    row = await database.fetch_one(Album.table.select().where(Album.table.c.name == "Album 2"))
+
+    with pytest.warns(DeprecationWarning):
+        album = Album.from_sqla_row(row, prefetch_related=[Prefetch(related_name="tracks", to_attr="to_tracks")])
+
+    assert sorted(track.title for track in album.to_tracks) == ["Track 2-0", "Track 2-1"]
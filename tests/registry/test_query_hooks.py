@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+import edgy
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database)
+
+pytestmark = pytest.mark.anyio
+
+
+class User(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+class Post(edgy.Model):
+    user = edgy.ForeignKey(User, related_name="posts")
+    title = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+@pytest.fixture(autouse=True, scope="function")
+async def create_test_database():
+    await models.create_all()
+    yield
+    await models.drop_all()
+
+
+@pytest.fixture(autouse=True)
+async def rollback_connections():
+    with database.force_rollback():
+        async with database:
+            yield
+
+
+@pytest.fixture
+def hooks():
+    events = []
+
+    def before(event):
+        events.append(("before", event.operation, event.duration))
+
+    async def after(event):
+        events.append(("after", event.operation, event.rows))
+
+    models.before_execute(before)
+    models.after_execute(after)
+    yield events
+    models.before_execute_hooks.remove(before)
+    models.after_execute_hooks.remove(after)
+
+
+async def test_hooks_receive_the_events(hooks):
+    user = await User.query.create(name="Edgy")
+    await User.query.filter(name="Edgy").all()
+    await User.query.count()
+    await user.update(name="Edgy 2")
+    await User.query.filter(name="Unknown").delete()
+
+    assert hooks == [
+        ("before", "save", None),
+        ("after", "save", 1),
+        ("before", "all", None),
+        ("after", "all", 1),
+        ("before", "count", None),
+        ("after", "count", 1),
+        ("before", "update", None),
+        ("after", "update", None),
+        ("before", "delete", None),
+        ("after", "delete", 0),
+    ]
+
+
+async def test_modifications_record_the_affected_rows():
+    await User.query.bulk_create([{"name": f"User {index}"} for index in range(3)])
+
+    async with edgy.track_queries() as tracker:
+        await User.query.filter(name__in=["User 0", "User 1"]).update(name="Updated")
+        await User.query.filter(name="Updated").delete()
+        await User.query.filter(name="Unknown").delete()
+
+    assert [(query.operation, query.rows) for query in tracker.queries] == [
+        ("update", 2),
+        ("delete", 2),
+        ("delete", 0),
+    ]
+
+
+async def test_track_queries():
+    user = await User.query.create(name="Edgy")
+    await Post.query.bulk_create([{"user": user, "title": f"Post {index}"} for index in range(3)])
+
+    async with edgy.track_queries() as tracker:
+        posts = await Post.query.filter(title__in=["Post 1", "Post 2"]).order_by("id")
+        for post in posts:
+            await post.user.load()
+
+    assert tracker.count == len(tracker) == 3
+    assert [(query.model.__name__, query.operation) for query in tracker.queries] == [
+        ("Post", "all"),
+        ("User", "load"),
+        ("User", "load"),
+    ]
+    first = tracker.queries[0]
+    assert first.rows == 2
+    assert first.duration is not None and tracker.duration >= first.duration
+    assert "FROM posts" in first.sql
+    assert sorted(first.params.values()) == ["Post 1", "Post 2"]
+
+    # not tracked anymore
+    await User.query.all()
+    assert tracker.count == 3
+
+
+async def test_track_queries_nested_and_per_task():
+    await User.query.create(name="Edgy")
+
+    async def other_task():
+        await User.query.all()
+
+    async with edgy.track_queries() as outer:
+        with edgy.track_queries() as inner:
+            await User.query.get(name="Edgy")
+        await User.query.exists()
+        await asyncio.get_running_loop().create_task(other_task())
+
+    assert [query.operation for query in inner.queries] == ["get"]
+    # the started task inherits the context
+    assert [query.operation for query in outer.queries] == ["get", "exists", "all"]
+
+
+async def test_iterate_is_tracked():
+    await User.query.bulk_create([{"name": f"User {index}"} for index in range(3)])
+
+    async with edgy.track_queries() as tracker:
+        names = [user.name async for user in User.query.iterate(chunk_size=2)]
+
+    assert len(names) == 3
+    assert [(query.operation, query.rows) for query in tracker.queries] == [("iterate", 3)]
@@ -0,0 +1,54 @@
+import edgy
+from edgy.testclient import DatabaseTestClient as Database
+from tests.settings import DATABASE_URL
+
+database = Database(url=DATABASE_URL)
+models = edgy.Registry(database=database, table_cache_size=2)
+
+
+class User(edgy.Model):
+    name = edgy.CharField(max_length=100)
+
+    class Meta:
+        registry = models
+
+
+def test_table_schema_is_cached():
+    table = User.table_schema("tenant_a")
+    assert table.schema == "tenant_a"
+    assert User.table_schema("tenant_a") is table
+    assert User.table_schema("tenant_b") is not table
+    assert User.table_schema("tenant_b").schema == "tenant_b"
+
+
+def test_table_cache_lru_eviction():
+    models.invalidate_models()
+    User.table_schema("tenant_a")
+    User.table_schema("tenant_b")
+    # refresh tenant_a, so tenant_b is the least recently used
+    User.table_schema("tenant_a")
+    User.table_schema("tenant_c")
+
+    assert (User, "tenant_a") in models._schema_tables
+    assert (User, "tenant_b") not in models._schema_tables
+    assert (User, "tenant_c") in models._schema_tables
+    assert len(models._schema_tables) == 2
+
+
+def test_invalidate_models_clears_table_cache():
+    User.table_schema("tenant_a")
+    assert models._schema_tables
+
+    models.invalidate_models()
+    assert not models._schema_tables
+
+
+def test_invalidate_meta_drops_cached_tables():
+    User.table_schema("tenant_a")
+    User.table_schema("tenant_b")
+
+    User.meta.invalidate()
+    assert (User, "tenant_a") not in models._schema_tables
+    assert (User, "tenant_b") not in models._schema_tables
+    assert User.table_schema("tenant_a").schema == "tenant_a"
+    assert (User, "tenant_a") in models._schema_tables